@@ -0,0 +1,53 @@
+from typing import Any, List
+
+from fastapi import HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas import schemas
+
+
+def _split(values: List[str]) -> List[str]:
+    """Accept both repeated (``?ids=1&ids=2``) and comma-separated (``?ids=1,2``) keys."""
+    keys = [part.strip() for value in values for part in value.split(",")]
+    keys = [key for key in keys if key]
+    if len(keys) > settings.BATCH_MAX_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_KEYS} keys can be requested at once.",
+        )
+    return keys
+
+
+def batch_ids(ids: List[str] = Query(default=[])) -> List[int]:
+    try:
+        return [int(key) for key in _split(ids)]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be integers")
+
+
+def batch_slugs(slugs: List[str] = Query(default=[])) -> List[str]:
+    return _split(slugs)
+
+
+def bulk_delete(db: Session, crud_obj: Any, request: schemas.BulkDelete) -> dict:
+    """Shared body of the ``POST /<entity>/bulk-delete`` endpoints."""
+    if not request.ids and not request.filters:
+        raise HTTPException(status_code=400, detail="Provide ids or filters to delete.")
+    if request.ids and len(request.ids) > settings.BATCH_MAX_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_KEYS} keys can be requested at once.",
+        )
+    try:
+        deleted = crud_obj.remove_multi(db, ids=request.ids or None, **request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
+        )
+    return {"deleted": len(deleted), "ids": deleted}
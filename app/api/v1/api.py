@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import cases, jurisdictions, dockets, documents, secondary_sources, taxonomies
+from app.api.v1.endpoints import cases, jurisdictions, dockets, documents, secondary_sources, taxonomies, imports, analytics, changes, snapshots
 
 api_router = APIRouter()
 api_router.include_router(cases.router, prefix="/cases", tags=["cases"])
@@ -9,3 +9,7 @@ api_router.include_router(dockets.router, prefix="/dockets", tags=["dockets"])
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
 api_router.include_router(secondary_sources.router, prefix="/secondary-sources", tags=["secondary-sources"])
 api_router.include_router(taxonomies.router, prefix="/taxonomies", tags=["taxonomies"])
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(snapshots.router, prefix="/snapshots", tags=["snapshots"])
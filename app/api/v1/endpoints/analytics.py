@@ -0,0 +1,36 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.schemas import schemas
+from app.core.database import get_db
+from app.services import analytics
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Dict[str, str]])
+def read_dimensions() -> Any:
+    """
+    Available dimensions and the date each one is bucketed by.
+    """
+    return [
+        {"dimension": name, "year_basis": analytics.YEAR_BASIS[year_column]}
+        for name, (year_column, _, _) in analytics.DIMENSIONS.items()
+    ]
+
+
+@router.get("/{dimension}", response_model=schemas.Rollup)
+def read_rollup(
+    *,
+    db: Session = Depends(get_db),
+    dimension: schemas.AnalyticsDimension,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    top: Optional[int] = Query(None, ge=1),
+) -> Any:
+    """
+    Cases per year and key for one dimension, as columns: `counts[k][y]` is the
+    number of cases with `keys[k]` in `years[y]`. `top` keeps the largest keys.
+    """
+    return analytics.rollup(db, dimension.value, year_from=year_from, year_to=year_to, top=top)
@@ -1,34 +1,51 @@
 from datetime import date
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.api import deps
 from app.crud import crud
+from app.models import models
 from app.schemas import schemas
 from app.core.database import get_db
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.serialization import JSONBytesResponse, dump_json, render
+from app.services import case_tree, search_index, similarity
 
 router = APIRouter()
 
+# Extra semantic-search hits fetched beyond `limit`, at most.
+SEARCH_OVERFETCH = 50
 
-@router.get("/", response_model=List[schemas.Case])
+
+@router.get("/", response_model=Union[List[schemas.Case], schemas.Page[schemas.Case]])
 def read_cases(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
 ) -> Any:
     """
     Retrieve cases.
+
+    Pass `count` (`exact`, `estimated` or `auto`) to get a paginated
+    envelope with a `total` instead of a bare list.
     """
+    if count is not None:
+        return render(schemas.Page[schemas.Case], crud.case.get_page(db, skip=skip, limit=limit, count=count))
     cases = crud.case.get_multi(db, skip=skip, limit=limit)
-    return cases
+    return render(List[schemas.Case], cases)
 
 
-@router.get("/search/", response_model=List[schemas.Case])
+@router.get("/search/", response_model=Union[List[schemas.Case], schemas.Page[schemas.Case]])
 def search_cases(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     case_id: Optional[int] = None,
     slug: Optional[str] = None,
     record_number: Optional[int] = None,
@@ -40,9 +57,17 @@ def search_cases(
     researcher: Optional[str] = None,
     jurisdiction_id: Optional[int] = None,
     most_recent_activity_date: Optional[date] = None,
+    filed_after: Optional[date] = None,
+    filed_before: Optional[date] = None,
+    activity_since: Optional[date] = None,
+    sort: Optional[schemas.CaseSort] = None,
 ) -> Any:
     """
-    Search cases with filters.
+    Search cases with filters. `count` works as in `read_cases`.
+
+    `filed_after`/`filed_before` bound `filing_date` and `activity_since`
+    bounds `most_recent_activity_date`, all inclusive. `sort` orders by a
+    field, descending with a leading `-`; undated cases come last.
     """
     filters = {
         "case_id": case_id,
@@ -57,7 +82,95 @@ def search_cases(
         "jurisdiction_id": jurisdiction_id,
         "most_recent_activity_date": most_recent_activity_date,
     }
-    return crud.case.get_multi_filtered(db, skip=skip, limit=limit, **filters)
+    ranges = {"filing_date": (filed_after, filed_before), "most_recent_activity_date": (activity_since, None)}
+    order = sort.value if sort is not None else None
+    if count is not None:
+        return render(
+            schemas.Page[schemas.Case],
+            crud.case.get_page(db, skip=skip, limit=limit, count=count, ranges=ranges, sort=order, **filters),
+        )
+    return render(
+        List[schemas.Case], crud.case.get_multi_filtered(db, skip=skip, limit=limit, ranges=ranges, sort=order, **filters)
+    )
+
+
+@router.get("/semantic-search", response_model=List[schemas.CaseHit])
+def semantic_search_cases(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=2000),
+    limit: int = Query(10, ge=1, le=100),
+    jurisdiction_id: Optional[int] = None,
+    area_id: Optional[int] = None,
+    issue_id: Optional[int] = None,
+    cause_id: Optional[int] = None,
+    algorithm_id: Optional[int] = None,
+    organization_id: Optional[int] = None,
+) -> Any:
+    """
+    Rank cases by TF-IDF similarity between `q` and their caption, description
+    and summaries. Served from the offline index built by
+    `python -m app.cli build-search-index`; taxonomy filters require every given term.
+    """
+    case_ids = search_index.filter_case_ids(
+        db, area_id=area_id, issue_id=issue_id, cause_id=cause_id,
+        algorithm_id=algorithm_id, organization_id=organization_id,
+    )
+    # Over-fetch so cases deleted since the build still leave `limit` hits.
+    fetch = min(limit * 2, limit + SEARCH_OVERFETCH)
+    try:
+        hits = search_index.index.search(q, fetch, jurisdiction_id=jurisdiction_id, case_ids=case_ids)
+    except search_index.IndexNotBuilt as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    # Titles come from the database, which also drops cases deleted since the build.
+    titles = {
+        row.case_id: row
+        for row in db.execute(
+            select(models.Case.case_id, models.Case.slug, models.Case.caption)
+            .where(models.Case.case_id.in_([hit["case_id"] for hit in hits]))
+        )
+    }
+    return [
+        {**hit, "slug": titles[hit["case_id"]].slug, "caption": titles[hit["case_id"]].caption}
+        for hit in hits
+        if hit["case_id"] in titles
+    ][:limit]
+
+
+@router.get("/batch", response_model=List[schemas.BatchItem[schemas.Case]])
+def read_cases_batch(
+    db: Session = Depends(get_db),
+    ids: List[int] = Depends(deps.batch_ids),
+    slugs: List[str] = Depends(deps.batch_slugs),
+) -> Any:
+    """
+    Get many cases by ID and/or slug in one request.
+
+    Results follow the request order, IDs first and then slugs. Keys with
+    no matching case are returned with `found: false`.
+    """
+    if not ids and not slugs:
+        raise HTTPException(status_code=400, detail="Provide ids and/or slugs.")
+    return render(
+        List[schemas.BatchItem[schemas.Case]],
+        crud.as_batch(ids, crud.case.get_by_ids(db, ids))
+        + crud.as_batch(slugs, crud.case.get_by_slugs(db, slugs)),
+    )
+
+
+@router.get("/tree", response_model=List[schemas.BatchItem[schemas.Case]])
+def read_case_trees(
+    db: Session = Depends(get_db),
+    ids: List[int] = Depends(deps.batch_ids),
+) -> Any:
+    """
+    Get many cases by ID, built as JSON by the database in one query.
+
+    Same response as `/batch` with ids. Results follow the request order;
+    IDs with no matching case are returned with `found: false`.
+    """
+    if not ids:
+        raise HTTPException(status_code=400, detail="Provide ids.")
+    return JSONBytesResponse(case_tree.trees(db, ids))
 
 
 @router.post("/", response_model=schemas.Case)
@@ -69,20 +182,36 @@ def create_case(
     """
     Create new case.
     """
-    case = crud.case.get_by_slug(db, slug=case_in.slug)
-    if case:
+    try:
+        case = crud.case.create(db, obj_in=case_in)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
+        )
+    if not case:
         raise HTTPException(
             status_code=400,
             detail="The case with this slug already exists in the system.",
         )
+    return case
+
+
+def _update_case(db: Session, id: int, case_in: schemas.CaseUpdate) -> models.Case:
     try:
-        case = crud.case.create(db, obj_in=case_in)
+        case = crud.case.update_by_id(db, id=id, obj_in=case_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    if not case:
+        raise HTTPException(
+            status_code=404,
+            detail="Case not found",
+        )
     return case
 
 
@@ -94,23 +223,25 @@ def update_case(
     case_in: schemas.CaseUpdate,
 ) -> Any:
     """
-    Update a case.
+    Update a case. Only the fields present in the body are changed.
     """
-    case = crud.case.get(db, id=id)
-    if not case:
-        raise HTTPException(
-            status_code=404,
-            detail="Case not found",
-        )
-    try:
-        case = crud.case.update(db, db_obj=case, obj_in=case_in)
-    except IntegrityError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=400,
-            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
-        )
-    return case
+    return _update_case(db, id, case_in)
+
+
+@router.patch("/{id}", response_model=schemas.Case)
+def patch_case(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    case_in: schemas.CaseUpdate,
+) -> Any:
+    """
+    Partially update a case without reading it first.
+
+    Fields absent from the body are left untouched. Taxonomy id lists
+    replace the current links; only the links that differ are written.
+    """
+    return _update_case(db, id, case_in)
 
 
 @router.get("/{id}", response_model=schemas.Case)
@@ -120,15 +251,67 @@ def read_case(
     id: int,
 ) -> Any:
     """
-    Get case by ID.
+    Get case by ID. The encoded response is cached; writes through the API invalidate it.
     """
-    case = crud.case.get(db, id=id)
-    if not case:
-        raise HTTPException(
-            status_code=404,
-            detail="Case not found",
-        )
-    return case
+    key = crud.case_key(id)
+    body = cache.get(key)
+    if body is None:
+        # Read before the case, so an invalidation during the read keeps the body out.
+        generation = cache.generation(key)
+        case = crud.case.get(db, id=id)
+        if not case:
+            raise HTTPException(
+                status_code=404,
+                detail="Case not found",
+            )
+        body = dump_json(schemas.Case, case)
+        cache.set_if(key, body, settings.CASE_CACHE_TTL, generation)
+    return JSONBytesResponse(body)
+
+
+@router.get("/{id}/tree", response_model=schemas.Case)
+def read_case_tree(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Get case by ID with the whole JSON document built by the database in one
+    query. Same response as `GET /cases/{id}`, never cached.
+    """
+    body = case_tree.tree(db, id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return JSONBytesResponse(body)
+
+
+@router.get("/{id}/similar", response_model=List[schemas.CaseHit])
+def read_similar_cases(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    limit: int = Query(10, ge=1, le=settings.SIMILARITY_TOP_K),
+) -> Any:
+    """
+    Cases sharing the most areas, issues, causes, algorithms and organizations
+    with this one, weighted towards rare terms. Served from a precomputed index.
+    """
+    similar = similarity.index.similar(db, id, limit=limit)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+    return similar
+
+
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_cases(
+    *,
+    db: Session = Depends(get_db),
+    request: schemas.BulkDelete,
+) -> Any:
+    """
+    Delete cases by id and/or exact-match filters in a single statement.
+    """
+    return deps.bulk_delete(db, crud.case, request)
 
 
 @router.delete("/{id}")
@@ -138,20 +321,20 @@ def delete_case(
     id: int,
 ) -> Any:
     """
-    Delete a case.
+    Delete a case. Dockets, documents, secondary sources and taxonomy links
+    are removed by the database's ON DELETE CASCADE.
     """
-    case = crud.case.get(db, id=id)
-    if not case:
-        raise HTTPException(
-            status_code=404,
-            detail="Case not found",
-        )
     try:
-        crud.case.remove(db, id=id)
+        deleted = crud.case.remove(db, id=id)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    if deleted is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Case not found",
+        )
     return {"message": "Case deleted successfully", "id": id}
@@ -0,0 +1,31 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.schemas import schemas
+from app.core.config import settings
+from app.core.database import get_db
+from app.services import changes
+
+router = APIRouter()
+
+
+@router.get("/", response_model=schemas.ChangeFeed)
+def read_changes(
+    db: Session = Depends(get_db),
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=settings.CHANGE_FEED_MAX_LIMIT),
+    tables: Optional[List[str]] = Query(None),
+) -> Any:
+    """
+    Inserts, updates and deletes after the `since` token, oldest first.
+    Omit `since` to start from the beginning; pass the returned `next`
+    to continue. Upserts carry the full row, cases also their taxonomy id lists.
+    """
+    unknown = set(tables or ()) - set(changes.TABLES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown tables: {', '.join(sorted(unknown))}")
+    try:
+        return changes.feed(db, since, limit, tables)
+    except changes.InvalidToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,29 +1,36 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.api import deps
 from app.crud import crud
 from app.schemas import schemas
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.serialization import render
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Docket])
+@router.get("/", response_model=Union[List[schemas.Docket], schemas.Page[schemas.Docket]])
 def read_dockets(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
 ) -> Any:
-    return crud.docket.get_multi(db, skip=skip, limit=limit)
+    if count is not None:
+        return render(schemas.Page[schemas.Docket], crud.docket.get_page(db, skip=skip, limit=limit, count=count))
+    return render(List[schemas.Docket], crud.docket.get_multi(db, skip=skip, limit=limit))
 
 
-@router.get("/search/", response_model=List[schemas.Docket])
+@router.get("/search/", response_model=Union[List[schemas.Docket], schemas.Page[schemas.Docket]])
 def search_dockets(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     docket_id: Optional[int] = None,
     case_id: Optional[int] = None,
     court: Optional[str] = None,
@@ -38,7 +45,35 @@ def search_dockets(
         "court": court,
         "docket_number": docket_number,
     }
-    return crud.docket.get_multi_filtered(db, skip=skip, limit=limit, **filters)
+    if count is not None:
+        return render(schemas.Page[schemas.Docket], crud.docket.get_page(db, skip=skip, limit=limit, count=count, **filters))
+    return render(List[schemas.Docket], crud.docket.get_multi_filtered(db, skip=skip, limit=limit, **filters))
+
+
+@router.get("/by-number/", response_model=List[schemas.Docket])
+def read_dockets_by_number(
+    db: Session = Depends(get_db),
+    number: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=settings.BATCH_MAX_KEYS),
+) -> Any:
+    """
+    Dockets with this docket number, however it is formatted: "1:23-cv-00456",
+    "23 CV 456" and "Case No. 23-cv-456-ABC" all match the same dockets.
+    """
+    return render(List[schemas.Docket], crud.docket.get_by_identifier(db, "docket_number", number, limit=limit))
+
+
+@router.get("/batch", response_model=List[schemas.BatchItem[schemas.Docket]])
+def read_dockets_batch(
+    db: Session = Depends(get_db),
+    ids: List[int] = Depends(deps.batch_ids),
+) -> Any:
+    """
+    Get many dockets by ID in one request, in request order.
+    """
+    if not ids:
+        raise HTTPException(status_code=400, detail="Provide ids.")
+    return render(List[schemas.BatchItem[schemas.Docket]], crud.as_batch(ids, crud.docket.get_by_ids(db, ids)))
 
 
 @router.post("/", response_model=schemas.Docket)
@@ -64,6 +99,20 @@ def read_docket(
     id: int,
 ) -> Any:
     docket = crud.docket.get(db, id=id)
+    if not docket:
+        raise HTTPException(status_code=404, detail="Docket not found")
+    return render(schemas.Docket, docket)
+
+
+def _update_docket(db: Session, id: int, docket_in: schemas.DocketUpdate) -> Any:
+    try:
+        docket = crud.docket.update_by_id(db, id=id, obj_in=docket_in)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
+        )
     if not docket:
         raise HTTPException(status_code=404, detail="Docket not found")
     return docket
@@ -76,25 +125,51 @@ def update_docket(
     id: int,
     docket_in: schemas.DocketUpdate,
 ) -> Any:
-    docket = crud.docket.get(db, id=id)
-    if not docket:
-        raise HTTPException(status_code=404, detail="Docket not found")
-    try:
-        return crud.docket.update(db, db_obj=docket, obj_in=docket_in)
-    except IntegrityError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=400,
-            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
-        )
+    return _update_docket(db, id, docket_in)
+
+
+@router.patch("/{id}", response_model=schemas.Docket)
+def patch_docket(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    docket_in: schemas.DocketUpdate,
+) -> Any:
+    """
+    Partially update without reading the row first; absent fields are left untouched.
+    """
+    return _update_docket(db, id, docket_in)
 
 
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_dockets(
+    *,
+    db: Session = Depends(get_db),
+    request: schemas.BulkDelete,
+) -> Any:
+    """
+    Delete dockets by id and/or exact-match filters in a single statement.
+    """
+    return deps.bulk_delete(db, crud.docket, request)
+
+
+@router.delete("/{id}")
+def delete_docket(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Delete a docket. Its documents are removed by the database's ON DELETE CASCADE.
+    """
     try:
-        crud.docket.remove(db, id=id)
+        deleted = crud.docket.remove(db, id=id)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Docket not found")
     return {"message": "Docket deleted successfully", "id": id}
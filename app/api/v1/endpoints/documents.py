@@ -1,38 +1,49 @@
 from datetime import date
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.api import deps
 from app.crud import crud
 from app.schemas import schemas
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.serialization import render
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Document])
+@router.get("/", response_model=Union[List[schemas.Document], schemas.Page[schemas.Document]])
 def read_documents(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
 ) -> Any:
-    return crud.document.get_multi(db, skip=skip, limit=limit)
+    if count is not None:
+        return render(schemas.Page[schemas.Document], crud.document.get_page(db, skip=skip, limit=limit, count=count))
+    return render(List[schemas.Document], crud.document.get_multi(db, skip=skip, limit=limit))
 
 
-@router.get("/search/", response_model=List[schemas.Document])
+@router.get("/search/", response_model=Union[List[schemas.Document], schemas.Page[schemas.Document]])
 def search_documents(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     document_id: Optional[int] = None,
     docket_id: Optional[int] = None,
     document_type: Optional[str] = None,
     filing_date: Optional[date] = None,
     citation: Optional[str] = None,
+    filed_after: Optional[date] = None,
+    filed_before: Optional[date] = None,
+    sort: Optional[schemas.DocumentSort] = None,
 ) -> Any:
     """
-    Search documents with filters.
+    Search documents with filters. `filed_after`/`filed_before` bound
+    `filing_date` (inclusive); `sort` works as in `search_cases`.
     """
     filters = {
         "document_id": document_id,
@@ -41,7 +52,44 @@ def search_documents(
         "filing_date": filing_date,
         "citation": citation,
     }
-    return crud.document.get_multi_filtered(db, skip=skip, limit=limit, **filters)
+    ranges = {"filing_date": (filed_after, filed_before)}
+    order = sort.value if sort is not None else None
+    if count is not None:
+        return render(
+            schemas.Page[schemas.Document],
+            crud.document.get_page(db, skip=skip, limit=limit, count=count, ranges=ranges, sort=order, **filters),
+        )
+    return render(
+        List[schemas.Document],
+        crud.document.get_multi_filtered(db, skip=skip, limit=limit, ranges=ranges, sort=order, **filters),
+    )
+
+
+@router.get("/by-citation/", response_model=List[schemas.Document])
+def read_documents_by_citation(
+    db: Session = Depends(get_db),
+    citation: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=settings.BATCH_MAX_KEYS),
+) -> Any:
+    """
+    Documents with this reporter citation, however it is formatted:
+    "484 F.Supp.3d 561" and "484 F. Supp. 3d 561 (N.D. Ill. 2019)" match the
+    same documents. A document is keyed by the first citation in its field.
+    """
+    return render(List[schemas.Document], crud.document.get_by_identifier(db, "citation", citation, limit=limit))
+
+
+@router.get("/batch", response_model=List[schemas.BatchItem[schemas.Document]])
+def read_documents_batch(
+    db: Session = Depends(get_db),
+    ids: List[int] = Depends(deps.batch_ids),
+) -> Any:
+    """
+    Get many documents by ID in one request, in request order.
+    """
+    if not ids:
+        raise HTTPException(status_code=400, detail="Provide ids.")
+    return render(List[schemas.BatchItem[schemas.Document]], crud.as_batch(ids, crud.document.get_by_ids(db, ids)))
 
 
 @router.post("/", response_model=schemas.Document)
@@ -67,6 +115,20 @@ def read_document(
     id: int,
 ) -> Any:
     document = crud.document.get(db, id=id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return render(schemas.Document, document)
+
+
+def _update_document(db: Session, id: int, document_in: schemas.DocumentUpdate) -> Any:
+    try:
+        document = crud.document.update_by_id(db, id=id, obj_in=document_in)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
+        )
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     return document
@@ -79,25 +141,51 @@ def update_document(
     id: int,
     document_in: schemas.DocumentUpdate,
 ) -> Any:
-    document = crud.document.get(db, id=id)
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    try:
-        return crud.document.update(db, db_obj=document, obj_in=document_in)
-    except IntegrityError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=400,
-            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
-        )
+    return _update_document(db, id, document_in)
+
+
+@router.patch("/{id}", response_model=schemas.Document)
+def patch_document(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    document_in: schemas.DocumentUpdate,
+) -> Any:
+    """
+    Partially update without reading the row first; absent fields are left untouched.
+    """
+    return _update_document(db, id, document_in)
 
 
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_documents(
+    *,
+    db: Session = Depends(get_db),
+    request: schemas.BulkDelete,
+) -> Any:
+    """
+    Delete documents by id and/or exact-match filters in a single statement.
+    """
+    return deps.bulk_delete(db, crud.document, request)
+
+
+@router.delete("/{id}")
+def delete_document(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Delete a document.
+    """
     try:
-        crud.document.remove(db, id=id)
+        deleted = crud.document.remove(db, id=id)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Document not found")
     return {"message": "Document deleted successfully", "id": id}
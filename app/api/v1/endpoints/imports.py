@@ -0,0 +1,50 @@
+import os
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app.models import models
+from app.schemas import schemas
+from app.core.database import get_db
+from app.services import imports
+
+router = APIRouter()
+
+
+@router.post("/", response_model=schemas.ImportJob, status_code=202)
+def create_import(
+    *,
+    db: Session = Depends(get_db),
+    kind: schemas.ImportKind = Form(...),
+    sheet_name: Optional[str] = Form(None),
+    file: UploadFile = File(...),
+) -> Any:
+    """
+    Upload an .xlsx or .csv file and queue it for loading. Poll GET /imports/{id} for progress.
+    """
+    filename = file.filename or ""
+    if os.path.splitext(filename)[1].lower() not in imports.EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type; expected one of {', '.join(imports.EXTENSIONS)}",
+        )
+    try:
+        path = imports.save_upload(file.file, filename)
+    except imports.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return imports.enqueue(db, kind, filename, sheet_name, path)
+
+
+@router.get("/{id}", response_model=schemas.ImportJob)
+def read_import(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Get the status, row counts, rejected rows and timings of an import.
+    """
+    job = db.get(models.ImportJob, id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -10,20 +10,25 @@ from app.core.database import get_db
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Jurisdiction])
+@router.get("/", response_model=Union[List[schemas.Jurisdiction], schemas.Page[schemas.Jurisdiction]])
 def read_jurisdictions(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
 ) -> Any:
-    return crud.jurisdiction.get_multi(db, skip=skip, limit=limit)
+    jurisdictions = crud.reference_data.get("jurisdictions", db)
+    if count is not None:
+        return crud.page_of(jurisdictions, skip, limit)
+    return jurisdictions[skip:skip + limit]
 
 
-@router.get("/search/", response_model=List[schemas.Jurisdiction])
+@router.get("/search/", response_model=Union[List[schemas.Jurisdiction], schemas.Page[schemas.Jurisdiction]])
 def search_jurisdictions(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     jurisdiction_id: Optional[int] = None,
     court_name: Optional[str] = None,
     jurisdiction_type: Optional[str] = None,
@@ -38,6 +43,8 @@ def search_jurisdictions(
         "jurisdiction_type": jurisdiction_type,
         "jurisdiction_name": jurisdiction_name,
     }
+    if count is not None:
+        return crud.jurisdiction.get_page(db, skip=skip, limit=limit, count=count, **filters)
     return crud.jurisdiction.get_multi_filtered(db, skip=skip, limit=limit, **filters)
 
 
@@ -48,13 +55,14 @@ def create_jurisdiction(
     jurisdiction_in: schemas.JurisdictionCreate,
 ) -> Any:
     try:
-        return crud.jurisdiction.create(db, obj_in=jurisdiction_in)
+        jurisdiction = crud.jurisdiction.create(db, obj_in=jurisdiction_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return jurisdiction
 
 
 @router.get("/{id}", response_model=schemas.Jurisdiction)
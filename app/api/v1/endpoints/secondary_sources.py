@@ -1,29 +1,35 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.api import deps
 from app.crud import crud
 from app.schemas import schemas
 from app.core.database import get_db
+from app.core.serialization import render
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.SecondarySource])
+@router.get("/", response_model=Union[List[schemas.SecondarySource], schemas.Page[schemas.SecondarySource]])
 def read_secondary_sources(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
 ) -> Any:
-    return crud.secondary_source.get_multi(db, skip=skip, limit=limit)
+    if count is not None:
+        return render(schemas.Page[schemas.SecondarySource], crud.secondary_source.get_page(db, skip=skip, limit=limit, count=count))
+    return render(List[schemas.SecondarySource], crud.secondary_source.get_multi(db, skip=skip, limit=limit))
 
 
-@router.get("/search/", response_model=List[schemas.SecondarySource])
+@router.get("/search/", response_model=Union[List[schemas.SecondarySource], schemas.Page[schemas.SecondarySource]])
 def search_secondary_sources(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     source_id: Optional[int] = None,
     case_id: Optional[int] = None,
     title: Optional[str] = None,
@@ -36,7 +42,22 @@ def search_secondary_sources(
         "case_id": case_id,
         "title": title,
     }
-    return crud.secondary_source.get_multi_filtered(db, skip=skip, limit=limit, **filters)
+    if count is not None:
+        return render(schemas.Page[schemas.SecondarySource], crud.secondary_source.get_page(db, skip=skip, limit=limit, count=count, **filters))
+    return render(List[schemas.SecondarySource], crud.secondary_source.get_multi_filtered(db, skip=skip, limit=limit, **filters))
+
+
+@router.get("/batch", response_model=List[schemas.BatchItem[schemas.SecondarySource]])
+def read_secondary_sources_batch(
+    db: Session = Depends(get_db),
+    ids: List[int] = Depends(deps.batch_ids),
+) -> Any:
+    """
+    Get many secondary sources by ID in one request, in request order.
+    """
+    if not ids:
+        raise HTTPException(status_code=400, detail="Provide ids.")
+    return render(List[schemas.BatchItem[schemas.SecondarySource]], crud.as_batch(ids, crud.secondary_source.get_by_ids(db, ids)))
 
 
 @router.post("/", response_model=schemas.SecondarySource)
@@ -62,6 +83,20 @@ def read_secondary_source(
     id: int,
 ) -> Any:
     source = crud.secondary_source.get(db, id=id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Secondary source not found")
+    return render(schemas.SecondarySource, source)
+
+
+def _update_secondary_source(db: Session, id: int, source_in: schemas.SecondarySourceUpdate) -> Any:
+    try:
+        source = crud.secondary_source.update_by_id(db, id=id, obj_in=source_in)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
+        )
     if not source:
         raise HTTPException(status_code=404, detail="Secondary source not found")
     return source
@@ -74,25 +109,51 @@ def update_secondary_source(
     id: int,
     source_in: schemas.SecondarySourceUpdate,
 ) -> Any:
-    source = crud.secondary_source.get(db, id=id)
-    if not source:
-        raise HTTPException(status_code=404, detail="Secondary source not found")
-    try:
-        return crud.secondary_source.update(db, db_obj=source, obj_in=source_in)
-    except IntegrityError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=400,
-            detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
-        )
+    return _update_secondary_source(db, id, source_in)
 
 
+@router.patch("/{id}", response_model=schemas.SecondarySource)
+def patch_secondary_source(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    source_in: schemas.SecondarySourceUpdate,
+) -> Any:
+    """
+    Partially update without reading the row first; absent fields are left untouched.
+    """
+    return _update_secondary_source(db, id, source_in)
+
+
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_secondary_sources(
+    *,
+    db: Session = Depends(get_db),
+    request: schemas.BulkDelete,
+) -> Any:
+    """
+    Delete secondary sources by id and/or exact-match filters in a single statement.
+    """
+    return deps.bulk_delete(db, crud.secondary_source, request)
+
+
+@router.delete("/{id}")
+def delete_secondary_source(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+) -> Any:
+    """
+    Delete a secondary source.
+    """
     try:
-        crud.secondary_source.remove(db, id=id)
+        deleted = crud.secondary_source.remove(db, id=id)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Secondary source not found")
     return {"message": "Secondary source deleted successfully", "id": id}
@@ -0,0 +1,47 @@
+import os
+from typing import Any
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.schemas import schemas
+from app.services import snapshots
+
+router = APIRouter()
+
+
+def _latest() -> Any:
+    manifest = snapshots.read_manifest()
+    if manifest is None:
+        raise HTTPException(
+            status_code=503, detail="No snapshot has been built; run `python -m app.cli build-snapshots`."
+        )
+    return manifest
+
+
+@router.get("/latest", response_model=schemas.SnapshotManifest)
+def read_latest_snapshot() -> Any:
+    """
+    The published snapshot: its version, the tables it holds and their row counts and sizes.
+    """
+    return _latest()
+
+
+@router.get("/latest/{table}", response_class=FileResponse)
+def download_snapshot_table(table: str) -> Any:
+    """
+    One table of the published snapshot as a Parquet file. Supports `Range`
+    and `If-Range`, so interrupted downloads can resume.
+    """
+    manifest = _latest()
+    if table not in manifest["tables"]:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot table {table!r}")
+    path = snapshots.path(manifest, table)
+    if not os.path.exists(path):
+        # Pruned by two newer builds since the manifest was read.
+        raise HTTPException(status_code=503, detail="Snapshot is being replaced; retry")
+    return FileResponse(
+        path,
+        media_type=snapshots.MEDIA_TYPE,
+        filename=f"{table}-{manifest['version']}.parquet",
+        headers={"X-Snapshot-Version": manifest["version"]},
+    )
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -11,140 +11,200 @@ router = APIRouter()
 
 # --- Areas of Application ---
 
-@router.get("/areas/", response_model=List[schemas.AreaOfApplication], tags=["taxonomies"])
-def read_areas(db: Session = Depends(get_db), skip: int = 0, limit: int = 100) -> Any:
-    return crud.area.get_multi(db, skip=skip, limit=limit)
+@router.get("/areas/", response_model=Union[List[schemas.AreaOfApplication], schemas.Page[schemas.AreaOfApplication]], tags=["taxonomies"])
+def read_areas(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    count: Optional[schemas.CountMode] = None,
+) -> Any:
+    items = crud.reference_data.get("areas", db)
+    if count is not None:
+        return crud.page_of(items, skip, limit)
+    return items[skip:skip + limit]
 
 
-@router.get("/areas/search/", response_model=List[schemas.AreaOfApplication], tags=["taxonomies"])
+@router.get("/areas/search/", response_model=Union[List[schemas.AreaOfApplication], schemas.Page[schemas.AreaOfApplication]], tags=["taxonomies"])
 def search_areas(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     area_id: Optional[int] = None,
     name: Optional[str] = None,
 ) -> Any:
+    if count is not None:
+        return crud.area.get_page(db, skip=skip, limit=limit, count=count, area_id=area_id, name=name)
     return crud.area.get_multi_filtered(db, skip=skip, limit=limit, area_id=area_id, name=name)
 
 @router.post("/areas/", response_model=schemas.AreaOfApplication, tags=["taxonomies"])
 def create_area(*, db: Session = Depends(get_db), area_in: schemas.TaxonomyCreate) -> Any:
     try:
-        return crud.area.create(db, obj_in=area_in)
+        item = crud.area.create(db, obj_in=area_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return item
 
 # --- Issues ---
 
-@router.get("/issues/", response_model=List[schemas.Issue], tags=["taxonomies"])
-def read_issues(db: Session = Depends(get_db), skip: int = 0, limit: int = 100) -> Any:
-    return crud.issue.get_multi(db, skip=skip, limit=limit)
+@router.get("/issues/", response_model=Union[List[schemas.Issue], schemas.Page[schemas.Issue]], tags=["taxonomies"])
+def read_issues(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    count: Optional[schemas.CountMode] = None,
+) -> Any:
+    items = crud.reference_data.get("issues", db)
+    if count is not None:
+        return crud.page_of(items, skip, limit)
+    return items[skip:skip + limit]
 
 
-@router.get("/issues/search/", response_model=List[schemas.Issue], tags=["taxonomies"])
+@router.get("/issues/search/", response_model=Union[List[schemas.Issue], schemas.Page[schemas.Issue]], tags=["taxonomies"])
 def search_issues(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     issue_id: Optional[int] = None,
     name: Optional[str] = None,
 ) -> Any:
+    if count is not None:
+        return crud.issue.get_page(db, skip=skip, limit=limit, count=count, issue_id=issue_id, name=name)
     return crud.issue.get_multi_filtered(db, skip=skip, limit=limit, issue_id=issue_id, name=name)
 
 @router.post("/issues/", response_model=schemas.Issue, tags=["taxonomies"])
 def create_issue(*, db: Session = Depends(get_db), issue_in: schemas.TaxonomyCreate) -> Any:
     try:
-        return crud.issue.create(db, obj_in=issue_in)
+        item = crud.issue.create(db, obj_in=issue_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return item
 
 # --- Causes of Action ---
 
-@router.get("/causes/", response_model=List[schemas.CauseOfAction], tags=["taxonomies"])
-def read_causes(db: Session = Depends(get_db), skip: int = 0, limit: int = 100) -> Any:
-    return crud.cause.get_multi(db, skip=skip, limit=limit)
+@router.get("/causes/", response_model=Union[List[schemas.CauseOfAction], schemas.Page[schemas.CauseOfAction]], tags=["taxonomies"])
+def read_causes(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    count: Optional[schemas.CountMode] = None,
+) -> Any:
+    items = crud.reference_data.get("causes", db)
+    if count is not None:
+        return crud.page_of(items, skip, limit)
+    return items[skip:skip + limit]
 
 
-@router.get("/causes/search/", response_model=List[schemas.CauseOfAction], tags=["taxonomies"])
+@router.get("/causes/search/", response_model=Union[List[schemas.CauseOfAction], schemas.Page[schemas.CauseOfAction]], tags=["taxonomies"])
 def search_causes(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     cause_id: Optional[int] = None,
     name: Optional[str] = None,
 ) -> Any:
+    if count is not None:
+        return crud.cause.get_page(db, skip=skip, limit=limit, count=count, cause_id=cause_id, name=name)
     return crud.cause.get_multi_filtered(db, skip=skip, limit=limit, cause_id=cause_id, name=name)
 
 @router.post("/causes/", response_model=schemas.CauseOfAction, tags=["taxonomies"])
 def create_cause(*, db: Session = Depends(get_db), cause_in: schemas.TaxonomyCreate) -> Any:
     try:
-        return crud.cause.create(db, obj_in=cause_in)
+        item = crud.cause.create(db, obj_in=cause_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return item
 
 # --- Algorithms ---
 
-@router.get("/algorithms/", response_model=List[schemas.Algorithm], tags=["taxonomies"])
-def read_algorithms(db: Session = Depends(get_db), skip: int = 0, limit: int = 100) -> Any:
-    return crud.algorithm.get_multi(db, skip=skip, limit=limit)
+@router.get("/algorithms/", response_model=Union[List[schemas.Algorithm], schemas.Page[schemas.Algorithm]], tags=["taxonomies"])
+def read_algorithms(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    count: Optional[schemas.CountMode] = None,
+) -> Any:
+    items = crud.reference_data.get("algorithms", db)
+    if count is not None:
+        return crud.page_of(items, skip, limit)
+    return items[skip:skip + limit]
 
 
-@router.get("/algorithms/search/", response_model=List[schemas.Algorithm], tags=["taxonomies"])
+@router.get("/algorithms/search/", response_model=Union[List[schemas.Algorithm], schemas.Page[schemas.Algorithm]], tags=["taxonomies"])
 def search_algorithms(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     algorithm_id: Optional[int] = None,
     name: Optional[str] = None,
 ) -> Any:
+    if count is not None:
+        return crud.algorithm.get_page(db, skip=skip, limit=limit, count=count, algorithm_id=algorithm_id, name=name)
     return crud.algorithm.get_multi_filtered(db, skip=skip, limit=limit, algorithm_id=algorithm_id, name=name)
 
 @router.post("/algorithms/", response_model=schemas.Algorithm, tags=["taxonomies"])
 def create_algorithm(*, db: Session = Depends(get_db), algorithm_in: schemas.TaxonomyCreate) -> Any:
     try:
-        return crud.algorithm.create(db, obj_in=algorithm_in)
+        item = crud.algorithm.create(db, obj_in=algorithm_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return item
 
 # --- Organizations ---
 
-@router.get("/organizations/", response_model=List[schemas.Organization], tags=["taxonomies"])
-def read_organizations(db: Session = Depends(get_db), skip: int = 0, limit: int = 100) -> Any:
-    return crud.organization.get_multi(db, skip=skip, limit=limit)
+@router.get("/organizations/", response_model=Union[List[schemas.Organization], schemas.Page[schemas.Organization]], tags=["taxonomies"])
+def read_organizations(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    count: Optional[schemas.CountMode] = None,
+) -> Any:
+    items = crud.reference_data.get("organizations", db)
+    if count is not None:
+        return crud.page_of(items, skip, limit)
+    return items[skip:skip + limit]
 
 
-@router.get("/organizations/search/", response_model=List[schemas.Organization], tags=["taxonomies"])
+@router.get("/organizations/search/", response_model=Union[List[schemas.Organization], schemas.Page[schemas.Organization]], tags=["taxonomies"])
 def search_organizations(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 3,
+    count: Optional[schemas.CountMode] = None,
     organization_id: Optional[int] = None,
     name: Optional[str] = None,
 ) -> Any:
+    if count is not None:
+        return crud.organization.get_page(db, skip=skip, limit=limit, count=count, organization_id=organization_id, name=name)
     return crud.organization.get_multi_filtered(db, skip=skip, limit=limit, organization_id=organization_id, name=name)
 
 @router.post("/organizations/", response_model=schemas.Organization, tags=["taxonomies"])
 def create_organization(*, db: Session = Depends(get_db), org_in: schemas.TaxonomyCreate) -> Any:
     try:
-        return crud.organization.create(db, obj_in=org_in)
+        item = crud.organization.create(db, obj_in=org_in)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Integrity Error: {str(e.orig) if hasattr(e, 'orig') else str(e)}"
         )
+    return item
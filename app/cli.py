@@ -0,0 +1,207 @@
+"""
+Command-line entry points for database administration.
+
+Run from the project root:
+
+    python -m app.cli create-schema
+    python -m app.cli migrate
+    python -m app.cli check-indexes
+    python -m app.cli check-identifier-keys
+    python -m app.cli build-search-index
+    python -m app.cli refresh-analytics
+    python -m app.cli build-snapshots
+    python -m app.cli create-document-partitions
+    python -m app.cli archive-documents --before 2015
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def create_schema(args: argparse.Namespace) -> int:
+    from app.core import migrations
+    from app.core.database import engine, Base
+    from app.models import models  # noqa: F401  (registers tables on Base.metadata)
+
+    Base.metadata.create_all(bind=engine)
+    print("Tables created.")
+    # Migrations are idempotent, so they also bring a fresh schema up to date.
+    for migration in migrations.migrate(engine):
+        print(f"Applied {migration.version}_{migration.name}")
+    return 0
+
+
+def migrate(args: argparse.Namespace) -> int:
+    from app.core import migrations
+    from app.core.database import engine
+
+    applied = migrations.migrate(engine, target=args.target, dry_run=args.dry_run)
+    verb = "Would apply" if args.dry_run else "Applied"
+    for migration in applied:
+        print(f"{verb} {migration.version}_{migration.name}")
+    if not applied:
+        print("Database is up to date.")
+    return 0
+
+
+def check_indexes(args: argparse.Namespace) -> int:
+    from app.core import migrations
+    from app.core.database import engine, Base
+    from app.models import models  # noqa: F401  (registers tables on Base.metadata)
+
+    missing = migrations.missing_indexes(engine, Base.metadata)
+    for index in missing:
+        print(f"Missing index {index.name} on {index.table} ({', '.join(index.columns)})")
+    pending = migrations.pending(engine)
+    for migration in pending:
+        print(f"Pending migration {migration.version}_{migration.name}")
+    if not missing and not pending:
+        print("All model indexes are present.")
+    return 1 if missing else 0
+
+
+def check_identifier_keys(args: argparse.Namespace) -> int:
+    from app.core.database import SessionLocal
+    from app.services import identifiers
+
+    db = SessionLocal()
+    try:
+        mismatches = identifiers.check(db)
+    finally:
+        db.close()
+    for m in mismatches:
+        print(f"{m.function}({m.value!r}) = {m.actual!r}, expected {m.expected!r}")
+    if not mismatches:
+        print(f"All {len(identifiers.EXAMPLES)} documented identifier examples match.")
+    return 1 if mismatches else 0
+
+
+def build_search_index(args: argparse.Namespace) -> int:
+    from app.core.database import SessionLocal
+    from app.services import search_index
+
+    db = SessionLocal()
+    try:
+        meta = search_index.build(db, args.output)
+    finally:
+        db.close()
+    print(f"Indexed {meta['cases']} cases ({meta['postings']} postings) as version {meta['version']}.")
+    return 0
+
+
+def refresh_analytics(args: argparse.Namespace) -> int:
+    from app.core.database import SessionLocal
+    from app.services import analytics
+
+    db = SessionLocal()
+    try:
+        refreshed = analytics.refresh(db, full=args.full)
+    finally:
+        db.close()
+    print(f"Refreshed analytics for {refreshed} cases.")
+    return 0
+
+
+def build_snapshots(args: argparse.Namespace) -> int:
+    from app.core.database import SessionLocal
+    from app.services import snapshots
+
+    db = SessionLocal()
+    try:
+        manifest = snapshots.build(db, args.output, full=args.full)
+    finally:
+        db.close()
+    for name, table in manifest["tables"].items():
+        print(f"{name}: {table['rows']} rows, {table['bytes']} bytes ({table['build']})")
+    print(f"Published snapshot {manifest['version']}.")
+    return 0
+
+
+def create_document_partitions(args: argparse.Namespace) -> int:
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.services import partitions
+
+    ahead = settings.DOCUMENT_PARTITIONS_AHEAD if args.ahead is None else args.ahead
+    db = SessionLocal()
+    try:
+        created = partitions.create(db, ahead)
+    finally:
+        db.close()
+    for name in created:
+        print(f"Created {name}")
+    if not created:
+        print("All document partitions exist.")
+    return 0
+
+
+def archive_documents(args: argparse.Namespace) -> int:
+    from app.core.database import SessionLocal
+    from app.services import partitions
+
+    db = SessionLocal()
+    try:
+        archived = partitions.archive(db, args.before)
+    finally:
+        db.close()
+    for name in archived:
+        print(f"Detached {name}")
+    if not archived:
+        print(f"No document partitions before {args.before}.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="SchemaForge database administration")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("create-schema", help="Create missing tables from the models, then apply migrations")
+    cmd.set_defaults(func=create_schema)
+
+    cmd = commands.add_parser("migrate", help="Apply pending SQL migrations from sql/migrations")
+    cmd.add_argument("--target", help="Stop after this migration version (e.g. 0001)")
+    cmd.add_argument("--dry-run", action="store_true", help="List pending migrations without applying them")
+    cmd.set_defaults(func=migrate)
+
+    cmd = commands.add_parser("check-indexes", help="Report model indexes missing from the database")
+    cmd.set_defaults(func=check_indexes)
+
+    cmd = commands.add_parser(
+        "check-identifier-keys", help="Check the documented docket number and citation normalization examples"
+    )
+    cmd.set_defaults(func=check_identifier_keys)
+
+    cmd = commands.add_parser("build-search-index", help="Rebuild the semantic search index from case text")
+    cmd.add_argument("--output", help="Index directory (default: SEARCH_INDEX_DIR)")
+    cmd.set_defaults(func=build_search_index)
+
+    cmd = commands.add_parser("refresh-analytics", help="Apply queued case changes to the analytics rollups")
+    cmd.add_argument("--full", action="store_true", help="Recount every case instead of only changed ones")
+    cmd.set_defaults(func=refresh_analytics)
+
+    cmd = commands.add_parser("build-snapshots", help="Write Parquet snapshots of every table")
+    cmd.add_argument("--output", help="Snapshot directory (default: SNAPSHOT_DIR)")
+    cmd.add_argument("--full", action="store_true", help="Rewrite every table instead of only changed rows")
+    cmd.set_defaults(func=build_snapshots)
+
+    cmd = commands.add_parser(
+        "create-document-partitions", help="Create yearly documents partitions ahead of time and for stranded rows"
+    )
+    cmd.add_argument("--ahead", type=int, help="Years after this one to create (default: DOCUMENT_PARTITIONS_AHEAD)")
+    cmd.set_defaults(func=create_document_partitions)
+
+    cmd = commands.add_parser("archive-documents", help="Detach the documents partitions of old years")
+    cmd.add_argument("--before", type=int, required=True, help="Archive every year before this one")
+    cmd.set_defaults(func=archive_documents)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
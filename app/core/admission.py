@@ -0,0 +1,223 @@
+"""
+Admission control for API requests.
+
+Every request under ``API_V1_STR`` is assigned a class and a weight before
+it reaches a route. Each class admits requests until the weights in
+flight reach its limit, queues up to ``queue_limit`` more in FIFO order,
+and sheds the rest with ``503`` and ``Retry-After``. A queued request that
+is not admitted within ``timeout`` seconds is shed too. Waiting happens on
+the event loop, so queued requests hold neither a worker thread nor a
+database connection.
+
+Expensive reads (filtered search, semantic search, batch reads and case
+trees, analytics, the change feed, bulk deletes and any page past
+``deep_offset``) go to the ``heavy`` class. Everything else is
+``default``. The limits are sized so that both classes together fit the
+connection pool (``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW``), which means a
+storm of heavy queries queues behind its own limit instead of taking every
+connection from cheap lookups.
+
+Limits apply per worker process.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import serialization
+
+# (method, path pattern below API_V1_STR, class, weight)
+ROUTES: List[Tuple[str, str, str, int]] = [
+    ("GET", r"/cases/search/?", "heavy", 2),
+    ("GET", r"/cases/semantic-search/?", "heavy", 1),
+    ("GET", r"/[\w-]+/batch/?", "heavy", 1),
+    ("GET", r"/cases/tree/?", "heavy", 1),
+    ("GET", r"/analytics/.*", "heavy", 1),
+    ("GET", r"/changes/?", "heavy", 2),
+    ("POST", r"/[\w-]+/bulk-delete/?", "heavy", 2),
+]
+# Served from files without a database connection.
+EXEMPT = [r"/snapshots/.*"]
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Weighted concurrency limit with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_limit: int, timeout: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._stats = {"admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_timeout": 0, "max_queue_depth": 0}
+        self._wait_seconds = 0.0
+
+    async def acquire(self, weight: int) -> None:
+        # A request heavier than the whole limit runs alone rather than never.
+        weight = min(weight, self.limit)
+        if not self._waiters and self.in_flight + weight <= self.limit:
+            self.in_flight += weight
+            self._stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.queue_limit:
+            self._stats["shed_queue_full"] += 1
+            raise Shed("queue full", self._retry_after())
+
+        waiter = (weight, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._stats["queued"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiters))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter[1], self.timeout)
+        except BaseException as e:
+            # Timed out or cancelled (client went away) just as the slot was granted: hand it on.
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release(weight)
+            if isinstance(e, asyncio.TimeoutError):
+                self._stats["shed_timeout"] += 1
+                raise Shed("queue timeout", self._retry_after())
+            raise
+        finally:
+            self._wait_seconds += time.perf_counter() - started
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._wake()
+        self._stats["admitted"] += 1
+
+    def release(self, weight: int) -> None:
+        self.in_flight -= min(weight, self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        # Strict FIFO: a heavy waiter at the head is not overtaken by lighter ones.
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self.in_flight + weight > self.limit:
+                return
+            self._waiters.popleft()
+            self.in_flight += weight
+            future.set_result(None)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.timeout))
+
+    def stats(self) -> Dict[str, Any]:
+        queued = self._stats["queued"]
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "queue_limit": self.queue_limit,
+            **self._stats,
+            "mean_wait_ms": round(self._wait_seconds / queued * 1000, 2) if queued else 0.0,
+        }
+
+
+class Controller:
+    def __init__(self, prefix: str, limiters: Dict[str, Limiter], deep_offset: int):
+        self.prefix = prefix
+        self.limiters = limiters
+        self.deep_offset = deep_offset
+        self._routes = [(method, re.compile(pattern), name, weight) for method, pattern, name, weight in ROUTES]
+        self._exempt = [re.compile(pattern) for pattern in EXEMPT]
+
+    def classify(self, method: str, path: str, query_string: bytes) -> Optional[Tuple[Limiter, int]]:
+        """The limiter and weight for a request, or None if it is not admission-controlled."""
+        if not path.startswith(self.prefix + "/"):
+            return None
+        path = path[len(self.prefix):]
+        if any(pattern.fullmatch(path) for pattern in self._exempt):
+            return None
+        name, weight = "default", 1
+        for route_method, pattern, route_name, route_weight in self._routes:
+            if method == route_method and pattern.fullmatch(path):
+                name, weight = route_name, route_weight
+                break
+        if method == "GET" and b"skip=" in query_string and self._skip(query_string) >= self.deep_offset:
+            # OFFSET reads and discards every skipped row.
+            name, weight = "heavy", weight + 1
+        return self.limiters[name], weight
+
+    @staticmethod
+    def _skip(query_string: bytes) -> int:
+        try:
+            return int(parse_qs(query_string.decode("latin-1")).get("skip", ["0"])[0])
+        except ValueError:
+            return 0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+def from_settings(settings: Any) -> Controller:
+    limiters = {
+        "default": Limiter(
+            "default", settings.ADMISSION_DEFAULT_LIMIT, settings.ADMISSION_DEFAULT_QUEUE,
+            settings.ADMISSION_DEFAULT_TIMEOUT,
+        ),
+        "heavy": Limiter(
+            "heavy", settings.ADMISSION_HEAVY_LIMIT, settings.ADMISSION_HEAVY_QUEUE,
+            settings.ADMISSION_HEAVY_TIMEOUT,
+        ),
+    }
+    return Controller(settings.API_V1_STR, limiters, settings.ADMISSION_DEEP_OFFSET)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: Controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = self.controller.classify(scope["method"], scope["path"], scope.get("query_string", b""))
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter, weight = route
+        try:
+            await limiter.acquire(weight)
+        except Shed as e:
+            await _shed(send, limiter, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(weight)
+
+
+async def _shed(send: Send, limiter: Limiter, shed: Shed) -> None:
+    body = serialization.dump_json(
+        Dict[str, str], {"detail": f"Server busy ({limiter.name} {shed.reason}); retry later"}
+    )
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(shed.retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
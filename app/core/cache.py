@@ -0,0 +1,491 @@
+"""
+Response and reference-data caching.
+
+``TieredCache`` stores encoded JSON bytes in an ordered list of backends:
+
+* ``MemoryLRU`` - per-process, bounded by entry count. In front of a shared
+  tier its entries live at most ``CACHE_LOCAL_TTL`` seconds, which bounds how
+  long another worker's invalidation can go unnoticed (longer while
+  ``app.services.invalidation`` is receiving change notifications).
+* ``SQLiteBackend`` - a WAL-mode SQLite file shared by every worker on the
+  host; no outside service needed.
+* ``RedisBackend`` - any client with the redis-py interface (including
+  ``transaction``), so a real server or an in-memory fake will do.
+
+Reads go down the tiers and copy hits back up; writes and deletes go to
+every tier. Every delete also bumps a per-key generation (``delete_prefix``
+one per prefix). A value loaded from the database is stored with
+``set_if`` and the generation read before loading it. The last tier
+compares and sets atomically, so a reader that raced a write and an
+invalidation cannot put the old value back. Backend errors are logged and
+counted, never raised, so a broken shared tier degrades to a miss.
+Per-tier hits, misses and errors are reported by ``stats()`` and exposed
+at ``/metrics``.
+
+``ReferenceCache`` keeps jurisdictions and taxonomy lists in a
+``TieredCache`` and holds a decoded copy per process, re-decoding only when
+the cached bytes change.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import adapter, dump_json
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[Session], List[Any]]
+
+
+class CacheBackend(ABC):
+    name = "backend"
+    # Upper bound on entry lifetime in this tier, if any.
+    max_ttl: Optional[float] = None
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, keys: Sequence[str]) -> None:
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        ...
+
+    @abstractmethod
+    def generation(self, key: str) -> int:
+        """Changes whenever ``key`` is deleted, directly or by prefix."""
+
+    @abstractmethod
+    def set_if(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        """Set ``key`` unless its generation is no longer ``generation``; returns whether it was set."""
+
+
+class MemoryLRU(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024, max_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Bounded like the entries. Keys pushed out read as the highest
+        # generation pushed out so far, which never equals an older token.
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._prefix_generations: Dict[str, int] = {}
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, self._floor) + 1
+                self._generations.move_to_end(key)
+                self._entries.pop(key, None)
+            while len(self._generations) > self.max_entries:
+                self._floor = max(self._floor, self._generations.popitem(last=False)[1])
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            self._prefix_generations[prefix] = self._prefix_generations.get(prefix, 0) + 1
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def _generation(self, key: str) -> int:
+        prefixes = sum(count for prefix, count in self._prefix_generations.items() if key.startswith(prefix))
+        return self._generations.get(key, self._floor) + prefixes
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generation(key)
+
+    def set_if(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        with self._lock:
+            if self._generation(key) != generation:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Host-wide tier in a SQLite file. Each thread opens its own connection
+    lazily, so the backend is safe to create before uvicorn forks workers.
+    """
+
+    name = "sqlite"
+    PRUNE_EVERY = 256
+    # Generations are kept far longer than any request takes to load a value.
+    GENERATION_TTL = 24 * 60 * 60
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations (name TEXT NOT NULL, prefix INTEGER NOT NULL, "
+                "generation INTEGER NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (prefix, name))"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._store(self._conn(), key, value, ttl)
+
+    def _store(self, conn: sqlite3.Connection, key: str, value: bytes, ttl: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        conn.execute("DELETE FROM generations WHERE prefix = 0 AND expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN "
+            "(SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def _bump(self, conn: sqlite3.Connection, names: Sequence[str], prefix: bool) -> None:
+        conn.executemany(
+            "INSERT INTO generations (name, prefix, generation, expires_at) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT (prefix, name) DO UPDATE SET generation = generation + 1, expires_at = excluded.expires_at",
+            [(name, int(prefix), time.time() + self.GENERATION_TTL) for name in names],
+        )
+
+    def delete(self, keys: Sequence[str]) -> None:
+        conn = self._conn()
+        self._bump(conn, keys, prefix=False)
+        conn.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in keys])
+
+    def delete_prefix(self, prefix: str) -> None:
+        conn = self._conn()
+        self._bump(conn, [prefix], prefix=True)
+        if not prefix:
+            conn.execute("DELETE FROM cache")
+            return
+        # Range scan on the primary key instead of LIKE, which cannot use it.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        conn.execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, upper))
+
+    def _generation(self, conn: sqlite3.Connection, key: str) -> int:
+        return conn.execute(
+            "SELECT COALESCE(SUM(generation), 0) FROM generations "
+            "WHERE (prefix = 0 AND name = ?) OR (prefix = 1 AND substr(?, 1, length(name)) = name)",
+            (key, key),
+        ).fetchone()[0]
+
+    def generation(self, key: str) -> int:
+        return self._generation(self._conn(), key)
+
+    def set_if(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        conn = self._conn()
+        # Takes the write lock before reading, so no delete can land in between.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self._generation(conn, key) == generation
+            if current:
+                self._store(conn, key, value, ttl)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return current
+
+
+class RedisBackend(CacheBackend):
+    name = "redis"
+
+    GENERATION_TTL = 24 * 60 * 60
+
+    def __init__(self, client: Any, namespace: str = "schemaforge:"):
+        self.client = client
+        self.namespace = namespace
+        # Outside the namespace, so delete_prefix("") does not reset them.
+        self.generations = namespace.rstrip(":") + "-generations:"
+        self.prefix_generations = self.generations + "prefixes"
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.namespace + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(self.namespace + key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.incr(self.generations + key)
+            pipe.expire(self.generations + key, self.GENERATION_TTL)
+        pipe.delete(*[self.namespace + key for key in keys])
+        pipe.execute()
+
+    def delete_prefix(self, prefix: str) -> None:
+        self.client.hincrby(self.prefix_generations, prefix, 1)
+        batch = []
+        for key in self.client.scan_iter(match=f"{self.namespace}{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+    def _generation(self, client: Any, key: str) -> int:
+        prefixes = client.hgetall(self.prefix_generations)
+        own = client.get(self.generations + key)
+        return int(own or 0) + sum(
+            int(count) for prefix, count in prefixes.items()
+            if key.startswith(prefix.decode() if isinstance(prefix, bytes) else prefix)
+        )
+
+    def generation(self, key: str) -> int:
+        return self._generation(self.client, key)
+
+    def set_if(self, key: str, value: bytes, ttl: float, generation: int) -> bool:
+        def attempt(pipe: Any) -> bool:
+            # WATCH makes the SET fail (and the attempt rerun) if a delete bumps either generation.
+            if self._generation(pipe, key) != generation:
+                return False
+            pipe.multi()
+            pipe.set(self.namespace + key, value, px=max(int(ttl * 1000), 1))
+            return True
+
+        return self.client.transaction(
+            attempt, self.generations + key, self.prefix_generations, value_from_callable=True
+        )
+
+
+class TierStats:
+    __slots__ = ("hits", "misses", "errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class TieredCache:
+    def __init__(self, tiers: Sequence[CacheBackend]):
+        self.tiers = list(tiers)
+        self._stats = [TierStats() for _ in self.tiers]
+
+    def _ttl(self, tier: CacheBackend, ttl: float) -> float:
+        return min(ttl, tier.max_ttl) if tier.max_ttl is not None else ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        for depth, tier in enumerate(self.tiers):
+            stats = self._stats[depth]
+            try:
+                value = tier.get(key)
+            except Exception:
+                stats.errors += 1
+                logger.warning("Cache tier %s failed on get", tier.name, exc_info=True)
+                continue
+            if value is None:
+                stats.misses += 1
+                continue
+            stats.hits += 1
+            for upper in self.tiers[:depth]:
+                # The remaining lifetime is unknown, so only tiers with a bound are refilled.
+                if upper.max_ttl is not None:
+                    self._call(upper, "set", key, value, upper.max_ttl)
+            return value
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        for tier in self.tiers:
+            self._call(tier, "set", key, value, self._ttl(tier, ttl))
+
+    def generation(self, key: str) -> Optional[int]:
+        """The key's generation in the last tier, to pass to ``set_if``; None if that tier failed."""
+        return self._call(self.tiers[-1], "generation", key)
+
+    def set_if(self, key: str, value: bytes, ttl: float, generation: Optional[int]) -> bool:
+        """
+        Store a value loaded after reading ``generation``, unless the key was
+        deleted since. The last tier decides atomically; the tiers above are
+        filled afterwards and emptied again if a delete got in meanwhile.
+        """
+        if generation is None:
+            return False
+        last = self.tiers[-1]
+        if not self._call(last, "set_if", key, value, self._ttl(last, ttl), generation):
+            return False
+        upper = self.tiers[:-1]
+        for tier in upper:
+            self._call(tier, "set", key, value, self._ttl(tier, ttl))
+        if upper and self.generation(key) != generation:
+            for tier in upper:
+                self._call(tier, "delete", [key])
+            return False
+        return True
+
+    def delete(self, *keys: str) -> None:
+        # Shared tiers first, so a concurrent read cannot refill the local tier from them.
+        for tier in reversed(self.tiers):
+            self._call(tier, "delete", list(keys))
+
+    def delete_prefix(self, prefix: str) -> None:
+        for tier in reversed(self.tiers):
+            self._call(tier, "delete_prefix", prefix)
+
+    def clear(self) -> None:
+        self.delete_prefix("")
+
+    def _call(self, tier: CacheBackend, method: str, *args: Any) -> Any:
+        try:
+            return getattr(tier, method)(*args)
+        except Exception:
+            self._stats[self.tiers.index(tier)].errors += 1
+            logger.warning("Cache tier %s failed on %s", tier.name, method, exc_info=True)
+            return None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {tier.name: stats.as_dict() for tier, stats in zip(self.tiers, self._stats)}
+
+
+def build_cache(backend: str) -> TieredCache:
+    """Local LRU in front of the configured shared tier (``memory`` means none)."""
+    shared: Optional[CacheBackend] = None
+    if backend == "sqlite":
+        shared = SQLiteBackend(settings.CACHE_SQLITE_PATH)
+    elif backend == "redis":
+        shared = RedisBackend.from_url(settings.CACHE_REDIS_URL)
+    elif backend != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND {backend!r}; expected memory, sqlite or redis")
+    local = MemoryLRU(
+        max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+        max_ttl=settings.CACHE_LOCAL_TTL if shared is not None else None,
+    )
+    return TieredCache([local, shared] if shared is not None else [local])
+
+
+class ReferenceCache:
+    def __init__(self, cache: TieredCache, ttl: float):
+        self.cache = cache
+        self.ttl = ttl
+        self._loaders: Dict[str, Tuple[Loader, Any]] = {}
+        self._decoded: Dict[str, Tuple[bytes, List[Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name: str) -> str:
+        return f"reference:{name}"
+
+    def register(self, name: str, loader: Loader, schema: Any) -> None:
+        self._loaders[name] = (loader, List[schema])
+
+    def get(self, name: str, db: Session) -> List[Any]:
+        raw = self.cache.get(self.key(name))
+        if raw is None:
+            raw = self._load(name, db)
+        return self._decode(name, raw)
+
+    def _load(self, name: str, db: Session) -> bytes:
+        with self._lock:
+            raw = self.cache.get(self.key(name))
+            if raw is None:
+                generation = self.cache.generation(self.key(name))
+                loader, schema = self._loaders[name]
+                raw = dump_json(schema, loader(db))
+                self.cache.set_if(self.key(name), raw, self.ttl, generation)
+            return raw
+
+    def _decode(self, name: str, raw: bytes) -> List[Any]:
+        decoded = self._decoded.get(name)
+        if decoded is not None and decoded[0] == raw:
+            return decoded[1]
+        items = adapter(self._loaders[name][1]).validate_json(raw)
+        self._decoded[name] = (raw, items)
+        return items
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        names: Iterable[str] = [name] if name is not None else list(self._loaders)
+        self.cache.delete(*[self.key(n) for n in names])
+
+    def warm(self, db: Session) -> None:
+        for name in self._loaders:
+            self.get(name, db)
+
+
+cache = build_cache(settings.CACHE_BACKEND)
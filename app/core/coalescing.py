@@ -0,0 +1,138 @@
+"""
+Single-flight coalescing of identical concurrent GET requests.
+
+The first GET for a key (path, query parameters sorted by name,
+``Accept-Encoding`` and ``Origin``) runs normally and records the response messages it
+sends. Identical requests that arrive while it is still running wait for
+it on the event loop and replay the recorded status, headers and body
+instead of running the route themselves. A burst of requests for one
+case or search therefore costs one query and one serialization. Nothing
+is kept once the first request finishes; this is not a cache.
+
+Memory is bounded: at most ``max_keys`` requests are recorded at once,
+and a response larger than ``max_bytes`` stops being recorded, so waiting
+requests then run on their own. Error responses are replayed like any
+other. If the first request raises, the waiting requests raise the same
+error. If it is cancelled before its response completes, they run on their own.
+Requests with a ``Range`` header and routes in ``exempt`` pass through,
+as do requests carrying ``Cookie`` or ``Authorization``: their responses
+may depend on who is asking, so they are never shared.
+"""
+
+import asyncio
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class Flight:
+    def __init__(self) -> None:
+        self.done = asyncio.Event()
+        self.messages: Optional[List[Message]] = []
+        self.size = 0
+        self.complete = False
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """In-flight GET requests of one worker process, keyed by normalised request."""
+
+    def __init__(self, prefix: str, max_bytes: int = 1024 * 1024, max_keys: int = 1024, exempt: Sequence[str] = ()):
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_keys = max_keys
+        self._exempt = [re.compile(pattern) for pattern in exempt]
+        self._flights: Dict[Tuple[str, str, bytes, bytes], Flight] = {}
+        self._stats = {"leaders": 0, "coalesced": 0, "reran": 0, "oversized": 0}
+
+    def _key(self, scope: Scope) -> Optional[Tuple[str, str, bytes, bytes]]:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        if not path.startswith(self.prefix + "/"):
+            return None
+        if any(pattern.fullmatch(path[len(self.prefix):]) for pattern in self._exempt):
+            return None
+        encoding = origin = b""
+        for name, value in scope["headers"]:
+            if name in (b"range", b"cookie", b"authorization"):
+                return None
+            if name == b"accept-encoding":
+                encoding = value
+            elif name == b"origin":
+                origin = value
+        # Sort by name only: the order of repeated parameters (ids=3&ids=1) is significant.
+        params = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True),
+                        key=lambda pair: pair[0])
+        return path, urlencode(params), encoding, origin
+
+    async def __call__(self, app: ASGIApp, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self._key(scope)
+        if key is None:
+            await app(scope, receive, send)
+            return
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            await flight.done.wait()
+            if flight.complete:
+                self._stats["coalesced"] += 1
+                for message in flight.messages:
+                    await send(message)
+                return
+            if flight.error is not None:
+                self._stats["coalesced"] += 1
+                raise flight.error
+            self._stats["reran"] += 1
+            await app(scope, receive, send)
+            return
+
+        if len(self._flights) >= self.max_keys:
+            await app(scope, receive, send)
+            return
+        flight = self._flights[key] = Flight()
+        self._stats["leaders"] += 1
+        sent = [True]
+
+        async def record(message: Message) -> None:
+            if flight.messages is not None:
+                if message["type"] == "http.response.body":
+                    flight.size += len(message.get("body", b""))
+                    if not message.get("more_body", False):
+                        flight.complete = True
+                if flight.size > self.max_bytes:
+                    self._stats["oversized"] += 1
+                    flight.messages, flight.complete = None, False
+                else:
+                    flight.messages.append(message)
+            try:
+                await send(message)
+            except Exception:
+                sent[0] = False
+                raise
+
+        try:
+            await app(scope, receive, record)
+        except Exception as e:
+            # Only the route's own errors are shared; a client that went away
+            # mid-send leaves the others to run on their own.
+            if not flight.complete and sent[0]:
+                flight.error = e
+            raise
+        finally:
+            del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "in_flight": len(self._flights)}
+
+
+class SingleFlightMiddleware:
+    def __init__(self, app: ASGIApp, flights: SingleFlight):
+        self.app = app
+        self.flights = flights
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.flights(self.app, scope, receive, send)
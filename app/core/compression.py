@@ -0,0 +1,217 @@
+"""
+Response compression negotiated through ``Accept-Encoding``.
+
+gzip is always available; brotli (``br``) and zstd are used when the
+optional ``brotli`` / ``zstandard`` packages are installed. Complete
+responses smaller than ``minimum_size`` are sent as-is. Streaming
+responses are compressed chunk by chunk and flushed after every chunk,
+so they are never buffered in memory.
+
+Responses that are already encoded, partial (``206``/``Content-Range``)
+or of a non-compressible content type pass through untouched.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+class Encoder(ABC):
+    """Streaming compressor: ``compress`` flushes so each chunk is decodable on arrival."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        ...
+
+
+class GzipEncoder(Encoder):
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder(Encoder):
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ZstdEncoder(Encoder):
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encodings() -> List[str]:
+    """Supported encodings in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """
+    Pick the encoding with the highest q-value the client accepts.
+    Ties are broken by the order of ``supported``.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best: Optional[Tuple[float, int, str]] = None
+    for rank, encoding in enumerate(supported):
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0 and (best is None or (q, -rank) > (best[0], -best[1])):
+            best = (q, rank, encoding)
+    return best[2] if best else None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        encodings: Optional[Sequence[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+        supported = available_encodings()
+        self.encodings = [e for e in (encodings or supported) if e in supported]
+
+    def make_encoder(self, encoding: str) -> Encoder:
+        if encoding == "zstd":
+            return ZstdEncoder(self.levels["zstd"])
+        if encoding == "br":
+            return BrotliEncoder(self.levels["br"])
+        return GzipEncoder(self.levels["gzip"])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] in (204, 206, 304) or "content-range" in headers:
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if not self._eligible(headers):
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            self.encoder = self.middleware.make_encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            if not more_body:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            # Streaming: length is unknown until the end, so drop it.
+            del headers["Content-Length"]
+            await self._send(self.start)
+
+        chunk = self.encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
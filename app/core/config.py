@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import PostgresDsn, field_validator
 from typing import Any, Optional
@@ -15,6 +18,77 @@ class Settings(BaseSettings):
     PG_PORT: int = 5432
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
 
+    # Startup
+    DB_POOL_WARM: int = 2
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    STARTUP_BUDGET_SECONDS: float = 2.0
+
+    # Pagination: "auto" counts exactly only below this estimated row count
+    EXACT_COUNT_THRESHOLD: int = 10000
+
+    # Batch reads
+    BATCH_MAX_KEYS: int = 500
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    ZSTD_LEVEL: int = 3
+
+    # Admission control: weighted in-flight limits per request class, per worker.
+    # Keep DEFAULT_LIMIT + HEAVY_LIMIT within DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_DEFAULT_LIMIT: int = 10
+    ADMISSION_DEFAULT_QUEUE: int = 100
+    ADMISSION_DEFAULT_TIMEOUT: float = 2.0
+    ADMISSION_HEAVY_LIMIT: int = 5
+    ADMISSION_HEAVY_QUEUE: int = 20
+    ADMISSION_HEAVY_TIMEOUT: float = 5.0
+    ADMISSION_DEEP_OFFSET: int = 1000
+
+    # Coalesce identical concurrent GETs into one request, per worker
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_MAX_BYTES: int = 1024 * 1024
+    SINGLE_FLIGHT_MAX_KEYS: int = 1024
+
+    # Caching: a per-process LRU in front of a shared tier ("memory", "sqlite" or "redis")
+    CACHE_BACKEND: str = "sqlite"
+    CACHE_SQLITE_PATH: str = os.path.join(tempfile.gettempdir(), "schemaforge-cache.sqlite3")
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    CACHE_LOCAL_TTL: float = 5.0
+    REFERENCE_CACHE_TTL: float = 300.0
+    CASE_CACHE_TTL: float = 300.0
+    # Evict on Postgres change notifications; the local tier keeps entries longer while listening
+    CACHE_NOTIFY_ENABLED: bool = True
+    CACHE_NOTIFY_LOCAL_TTL: float = 300.0
+
+    # Similar cases: neighbours kept per case in the taxonomy-overlap index
+    SIMILARITY_TOP_K: int = 50
+
+    # Offline semantic search index (python -m app.cli build-search-index)
+    SEARCH_INDEX_DIR: str = os.path.join("data", "search-index")
+
+    # Change feed (GET /changes)
+    CHANGE_FEED_MAX_LIMIT: int = 5000
+
+    # Parquet snapshots (python -m app.cli build-snapshots; GET /snapshots)
+    SNAPSHOT_DIR: str = os.path.join("data", "snapshots")
+    SNAPSHOT_BATCH_ROWS: int = 10000
+
+    # Yearly documents partitions kept ahead of today (python -m app.cli create-document-partitions)
+    DOCUMENT_PARTITIONS_AHEAD: int = 2
+
+    # Spreadsheet imports (POST /imports)
+    IMPORT_DIR: str = os.path.join(tempfile.gettempdir(), "schemaforge-imports")
+    IMPORT_WORKERS: int = 2
+    IMPORT_MAX_BYTES: int = 50 * 1024 * 1024
+    IMPORT_MAX_REJECTED: int = 1000
+    IMPORT_CHUNK_SIZE: int = 1000
+
     @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
     @classmethod
     def assemble_db_connection(cls, v: Optional[str], info: Any) -> Any:
@@ -1,11 +1,30 @@
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _pool_options(uri: str) -> Dict[str, Any]:
+    url = make_url(uri)
+    # In-memory SQLite uses a single-connection pool that takes no sizing options.
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True, **_pool_options(settings.SQLALCHEMY_DATABASE_URI)
+)
+# Objects stay loaded after commit so write endpoints can return them without a refresh query.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -16,3 +35,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def warm_pool(connections: int) -> None:
+    """Open ``connections`` pooled connections up front so the first requests skip the connect handshake."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in opened:
+            conn.close()
@@ -0,0 +1,185 @@
+"""
+Versioned SQL migrations.
+
+Migrations are plain SQL files in ``sql/migrations`` named
+``NNNN_description.sql`` and are applied in version order. Applied
+versions are recorded in the ``schema_migrations`` table so that every
+migration runs exactly once per database.
+
+A file whose first line is ``-- migrate:no-transaction`` is executed
+statement by statement in autocommit mode. This is required for
+``CREATE INDEX CONCURRENTLY``, which cannot run inside a transaction.
+All other files run in a single transaction.
+"""
+
+import re
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "sql" / "migrations"
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+
+# Arbitrary key for pg_advisory_lock so concurrent deploys apply migrations one at a time.
+MIGRATION_LOCK_KEY = 727_001
+
+_FILENAME_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+_CONCURRENT_INDEX_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+class Migration(NamedTuple):
+    version: str
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+
+class MissingIndex(NamedTuple):
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Return all migrations on disk, ordered by version."""
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if match:
+            migrations.append(Migration(match.group(1), match.group(2), path))
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a no-transaction migration into individual statements."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version TEXT PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+
+
+def applied_versions(conn: Connection) -> set:
+    _ensure_version_table(conn)
+    return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def pending(engine: Engine) -> List[Migration]:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        done = applied_versions(conn)
+    return [m for m in discover() if m.version not in done]
+
+
+def _drop_invalid_indexes(conn: Connection, names: Iterable[str]) -> None:
+    """
+    Drop indexes left INVALID by an interrupted CREATE INDEX CONCURRENTLY,
+    otherwise ``IF NOT EXISTS`` would silently keep the broken index.
+    """
+    names = list(names)
+    if not names:
+        return
+    invalid = conn.execute(text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": names}).scalars().all()
+    for name in invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def _apply(engine: Engine, migration: Migration) -> None:
+    record = text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)")
+    params = {"version": migration.version, "name": migration.name}
+    if migration.transactional:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(migration.sql)
+            conn.execute(record, params)
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        _drop_invalid_indexes(conn, _CONCURRENT_INDEX_RE.findall(migration.sql))
+        for statement in split_statements(migration.sql):
+            conn.exec_driver_sql(statement)
+        conn.execute(record, params)
+
+
+def migrate(engine: Engine, *, target: Optional[str] = None, dry_run: bool = False) -> List[Migration]:
+    """
+    Apply pending migrations up to and including ``target``.
+
+    Returns the migrations that were (or, with ``dry_run``, would be) applied.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            done = applied_versions(lock)
+            todo = [
+                m for m in discover()
+                if m.version not in done and (target is None or m.version <= target)
+            ]
+            if not dry_run:
+                for migration in todo:
+                    _apply(engine, migration)
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return todo
+
+
+def missing_indexes(engine: Engine, metadata: MetaData) -> List[MissingIndex]:
+    """
+    Report indexes declared on the model metadata that the database lacks.
+
+    An index is considered present when the database has a valid index,
+    primary key or unique constraint whose leading columns match it, so
+    equivalent indexes under a different name are not flagged.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    invalid = set()
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            invalid = set(conn.execute(text(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE NOT i.indisvalid"
+            )).scalars())
+
+    missing = []
+    for table in metadata.sorted_tables:
+        declared = [
+            (index.name, tuple(col.name for col in index.columns))
+            for index in table.indexes
+        ]
+        if not declared:
+            continue
+        if table.name not in existing_tables:
+            missing.extend(MissingIndex(table.name, name, cols) for name, cols in declared)
+            continue
+
+        available = [
+            tuple(ix["column_names"]) for ix in inspector.get_indexes(table.name)
+            if ix["name"] not in invalid
+        ]
+        available.append(tuple(inspector.get_pk_constraint(table.name)["constrained_columns"]))
+        available.extend(
+            tuple(uc["column_names"]) for uc in inspector.get_unique_constraints(table.name)
+        )
+        for name, cols in declared:
+            if not any(have[:len(cols)] == cols for have in available):
+                missing.append(MissingIndex(table.name, name, cols))
+    return missing
@@ -0,0 +1,38 @@
+"""
+Fast JSON rendering for ORM results.
+
+When an endpoint returns ORM objects, FastAPI validates them against the
+``response_model`` in a second threadpool hop, converts the validated
+models to Python primitives and encodes those with the standard JSON
+encoder. ``render`` does the work once, in the endpoint's own thread: a
+cached ``TypeAdapter`` reads the ORM attributes and ``dump_json`` writes
+JSON bytes directly from pydantic-core.
+
+Endpoints keep their ``response_model`` for the OpenAPI schema; returning
+a ``Response`` makes FastAPI skip its own serialization.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, content: Any) -> bytes:
+    """Validate ``content`` (ORM objects or dicts) against ``schema`` and encode it as JSON."""
+    type_adapter = adapter(schema)
+    return type_adapter.dump_json(type_adapter.validate_python(content, from_attributes=True))
+
+
+def render(schema: Any, content: Any, status_code: int = 200) -> JSONBytesResponse:
+    return JSONBytesResponse(dump_json(schema, content), status_code=status_code)
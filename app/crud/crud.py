@@ -1,8 +1,14 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import List, Optional, Generic, TypeVar, Type, Any
+import json
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Query, Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import Integer, bindparam, delete, func, insert, inspect, literal, literal_column, select, text, update
+from typing import Callable, Dict, List, Optional, Generic, Sequence, Tuple, TypeVar, Type, Any
 from pydantic import BaseModel
 
+from app.core.cache import ReferenceCache, cache
+from app.core.config import settings
 from app.models import models
 from app.schemas import schemas
 
@@ -13,18 +19,74 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType]):
+    def __init__(
+        self,
+        model: Type[ModelType],
+        *,
+        load_options: Sequence[Any] = (),
+        on_write: Optional[Callable[[List[Any]], None]] = None,
+        owner: Optional[Any] = None,
+    ):
         self.model = model
+        self.primary_key = getattr(model, inspect(model).primary_key[0].key)
+        # Hot read statements are built once and executed with parameters,
+        # so each call skips statement construction.
+        self._select_from = select(model).offset(bindparam("skip"))
+        self._select_page = self._select_from.limit(bindparam("limit"))
+        # Loader options applied to batch reads so relationships load in one query each
+        self.load_options = tuple(load_options)
+        # Called with the affected primary keys after a committed write, to invalidate caches
+        self.on_write = on_write
+        # SQL expression for the id of the case a row belongs to. Writes return
+        # it with the row, and on_write gets those case ids instead.
+        self.owner = owner
+
+    def _written(self, ids: List[Any]) -> None:
+        if self.on_write is not None and ids:
+            self.on_write(ids)
+
+    def _owner_columns(self) -> List[Any]:
+        return [self.owner] if self.owner is not None else []
+
+    @staticmethod
+    def _owners(rows: Sequence[Any]) -> List[Any]:
+        """Distinct owning case ids in the columns after the first of each returned row."""
+        return sorted({owner for row in rows for owner in row[1:] if owner is not None})
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(getattr(self.model, f"{self.model.__tablename__[:-1]}_id") == id).first()
+        # Session.get answers from the identity map when the row is already loaded.
+        return db.get(self.model, id)
 
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 3) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+    def get_by_ids(self, db: Session, ids: Sequence[Any]) -> Dict[Any, ModelType]:
+        """Fetch many rows with one IN query, keyed by primary key."""
+        if not ids:
+            return {}
+        stmt = select(self.model).where(self.primary_key.in_(set(ids))).options(*self.load_options)
+        return {getattr(obj, self.primary_key.key): obj for obj in db.scalars(stmt)}
 
-    def get_multi_filtered(
-        self, db: Session, *, skip: int = 0, limit: int = 3, **filters: Any
-    ) -> List[ModelType]:
+    def get_by_identifier(self, db: Session, field: str, value: str, *, limit: int = 100) -> List[ModelType]:
+        """
+        Rows whose ``<field>_key`` column equals ``value`` run through the same
+        database normalization function that generates the column (migration
+        0008), so any spelling of the identifier matches with one index probe.
+        """
+        key = getattr(self.model, f"{field}_key")
+        normalized = getattr(func, key.info["normalize"])(value)
+        stmt = select(self.model).where(key == normalized).order_by(self.primary_key).limit(limit)
+        return list(db.scalars(stmt))
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: Optional[int] = 3) -> List[ModelType]:
+        if limit is None:
+            return list(db.scalars(self._select_from, {"skip": skip}))
+        return list(db.scalars(self._select_page, {"skip": skip, "limit": limit}))
+
+    def _filtered_query(
+        self,
+        db: Session,
+        filters: Dict[str, Any],
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        sort: Optional[str] = None,
+    ) -> Query:
         query = db.query(self.model)
         for field, value in filters.items():
             if value is not None:
@@ -32,106 +94,384 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                     query = query.filter(getattr(self.model, field).ilike(f"%{value}%"))
                 else:
                     query = query.filter(getattr(self.model, field) == value)
-        return query.offset(skip).limit(limit).all()
+        # Inclusive bounds; either end may be None.
+        for field, (low, high) in (ranges or {}).items():
+            column = getattr(self.model, field)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        if sort is not None:
+            query = query.order_by(*self._order_by(sort))
+        return query
+
+    def _order_by(self, sort: str) -> List[Any]:
+        """
+        ``field`` or ``-field`` for descending. Rows without a value sort last
+        either way and the primary key breaks ties, so pages are stable and
+        the order matches the composite indexes in migration 0006.
+        """
+        descending = sort.startswith("-")
+        column = getattr(self.model, sort.lstrip("-"))
+        order = [column.desc().nulls_last() if descending else column.asc().nulls_last()]
+        if column is not self.primary_key:
+            order.append(self.primary_key.desc() if descending else self.primary_key.asc())
+        return order
+
+    def get_multi_filtered(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 3,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        sort: Optional[str] = None,
+        **filters: Any,
+    ) -> List[ModelType]:
+        return self._filtered_query(db, filters, ranges, sort).offset(skip).limit(limit).all()
+
+    def get_page(
+        self, db: Session, *, skip: int = 0, limit: int = 3,
+        count: schemas.CountMode = schemas.CountMode.auto,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        sort: Optional[str] = None,
+        **filters: Any
+    ) -> Dict[str, Any]:
+        """
+        Return one page of (optionally filtered) rows together with a total.
+
+        ``exact`` counts with ``count(*) OVER ()`` in the page query itself.
+        ``estimated`` uses planner statistics: ``pg_class.reltuples`` for the
+        whole table, or the row estimate from ``EXPLAIN`` when filtered.
+        ``auto`` estimates first and only counts exactly when the estimate is
+        below ``EXACT_COUNT_THRESHOLD``.
+        """
+        query = self._filtered_query(db, filters, ranges, sort)
+        filtered = any(value is not None for value in filters.values()) or any(
+            bound is not None for bounds in (ranges or {}).values() for bound in bounds
+        )
+
+        estimate = None
+        if count != schemas.CountMode.exact:
+            estimate = explain_rows(db, query) if filtered else table_rows(db, self.model.__tablename__)
+            if estimate is None or (
+                count == schemas.CountMode.auto and estimate < settings.EXACT_COUNT_THRESHOLD
+            ):
+                count = schemas.CountMode.exact
+
+        if count == schemas.CountMode.exact:
+            rows = query.add_columns(func.count().over()).offset(skip).limit(limit).all()
+            items = [row[0] for row in rows]
+            if rows:
+                total = rows[0][1]
+            else:
+                # Past the last page the window has no rows to report on.
+                total = query.order_by(None).count() if skip else 0
+            return page(items, total, skip, limit)
+
+        items = query.offset(skip).limit(limit).all()
+        return page(items, max(estimate, skip + len(items)), skip, limit, estimated=True)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = obj_in.model_dump()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        db_obj, owners = self._insert(db, insert(self.model).values(**obj_in.model_dump()))
         db.commit()
-        db.refresh(db_obj)
+        self._written(owners if self.owner is not None else [getattr(db_obj, self.primary_key.key)])
         return db_obj
 
-    def update(self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
-        obj_data = db_obj.__dict__
-        update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+    def _insert(self, db: Session, stmt: Any) -> Tuple[Optional[ModelType], List[Any]]:
+        """
+        Run an INSERT ... RETURNING and return the new row as an ORM object,
+        with its owning case ids. A new row has no children yet, so
+        collections are marked as loaded and empty instead of being
+        lazy-loaded by the response.
+        """
+        row = db.execute(stmt.returning(self.model, *self._owner_columns())).first()
+        if row is None:
+            return None, []
+        for rel in inspect(self.model).relationships:
+            if rel.uselist:
+                set_committed_value(row[0], rel.key, [])
+        return row[0], self._owners([row])
+
+    def _update_returning(self, db: Session, id: Any, values: Dict[str, Any]) -> Tuple[Optional[ModelType], List[Any]]:
+        """
+        The updated row and its owning case ids. Update schemas cannot move a
+        row to another case, so only its current case is affected.
+        """
+        if not values:
+            stmt = select(self.model, *self._owner_columns()).where(self.primary_key == id)
+        else:
+            stmt = (
+                update(self.model).where(self.primary_key == id).values(**values)
+                .returning(self.model, *self._owner_columns())
+            )
+        row = db.execute(stmt).first()
+        return (row[0], self._owners([row])) if row is not None else (None, [])
+
+    def update_by_id(self, db: Session, *, id: Any, obj_in: UpdateSchemaType) -> Optional[ModelType]:
+        """
+        Apply the fields set on ``obj_in`` with a single UPDATE ... RETURNING.
+        Returns None when no row has this id.
+        """
+        db_obj, owners = self._update_returning(db, id, obj_in.model_dump(exclude_unset=True))
+        if db_obj is not None:
+            db.commit()
+            self._written(owners if self.owner is not None else [id])
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
+    def update(self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
+        return self.update_by_id(db, id=getattr(db_obj, self.primary_key.key), obj_in=obj_in)
+
+    def remove(self, db: Session, *, id: int) -> Optional[Any]:
+        """
+        Delete one row with DELETE ... RETURNING and let the database's
+        ON DELETE CASCADE remove children. Returns the id, or None if absent.
+        """
+        deleted = self.remove_multi(db, ids=[id])
+        return deleted[0] if deleted else None
+
+    def remove_multi(self, db: Session, *, ids: Optional[Sequence[Any]] = None, **filters: Any) -> List[Any]:
+        """
+        Delete every row matching ``ids`` and/or exact-match ``filters`` in one
+        statement. Children are removed by ON DELETE CASCADE without being loaded.
+        """
+        columns = inspect(self.model).columns
+        unknown = set(filters) - set(columns.keys())
+        if unknown:
+            raise ValueError(f"Unknown filter fields: {', '.join(sorted(unknown))}")
+        stmt = delete(self.model)
+        if ids is not None:
+            stmt = stmt.where(self.primary_key.in_(set(ids)))
+        for field, value in filters.items():
+            stmt = stmt.where(columns[field] == value)
+        stmt = stmt.returning(self.primary_key, *self._owner_columns()).execution_options(synchronize_session=False)
+        rows = db.execute(stmt).all()
         db.commit()
-        return obj
+        deleted = [row[0] for row in rows]
+        self._written(self._owners(rows) if self.owner is not None else deleted)
+        return deleted
 
 
 # --- Specialized CRUD for Case (to handle relationships) ---
 
 class CRUDCase(CRUDBase[models.Case, schemas.CaseCreate, schemas.CaseUpdate]):
-    def create(self, db: Session, *, obj_in: schemas.CaseCreate) -> models.Case:
-        obj_in_data = obj_in.model_dump(exclude={
-            "area_ids", "issue_ids", "cause_ids", "algorithm_ids", "organization_ids"
-        })
-        db_obj = models.Case(**obj_in_data)
-        
-        # Add relationships
-        if obj_in.area_ids:
-            db_obj.areas = db.query(models.AreaOfApplication).filter(models.AreaOfApplication.area_id.in_(obj_in.area_ids)).all()
-        if obj_in.issue_ids:
-            db_obj.issues = db.query(models.Issue).filter(models.Issue.issue_id.in_(obj_in.issue_ids)).all()
-        if obj_in.cause_ids:
-            db_obj.causes = db.query(models.CauseOfAction).filter(models.CauseOfAction.cause_id.in_(obj_in.cause_ids)).all()
-        if obj_in.algorithm_ids:
-            db_obj.algorithms = db.query(models.Algorithm).filter(models.Algorithm.algorithm_id.in_(obj_in.algorithm_ids)).all()
-        if obj_in.organization_ids:
-            db_obj.organizations = db.query(models.Organization).filter(models.Organization.organization_id.in_(obj_in.organization_ids)).all()
-
-        db.add(db_obj)
+    # schema field -> (relationship, junction table, taxonomy model)
+    taxonomies = {
+        "area_ids": ("areas", models.case_areas, models.AreaOfApplication),
+        "issue_ids": ("issues", models.case_issues, models.Issue),
+        "cause_ids": ("causes", models.case_causes, models.CauseOfAction),
+        "algorithm_ids": ("algorithms", models.case_algorithms, models.Algorithm),
+        "organization_ids": ("organizations", models.case_organizations, models.Organization),
+    }
+    _select_by_slug = select(models.Case).where(models.Case.slug == bindparam("slug"))
+
+    def create(self, db: Session, *, obj_in: schemas.CaseCreate) -> Optional[models.Case]:
+        """
+        Insert a case and its taxonomy links. Returns None when the slug is
+        already taken, detected by ON CONFLICT rather than a prior lookup.
+        """
+        data = obj_in.model_dump()
+        links = {field: data.pop(field) for field in self.taxonomies}
+        stmt = pg_insert(models.Case).values(**data).on_conflict_do_nothing(index_elements=["slug"])
+        db_obj, _ = self._insert(db, stmt)
+        if db_obj is None:
+            db.rollback()
+            return None
+        self._set_taxonomies(db, db_obj, {field: ids for field, ids in links.items() if ids}, new=True)
+        db.commit()
+        self._written([db_obj.case_id])
+        return db_obj
+
+    def update_by_id(self, db: Session, *, id: Any, obj_in: schemas.CaseUpdate) -> Optional[models.Case]:
+        data = obj_in.model_dump(exclude_unset=True)
+        links = {field: data.pop(field) for field in self.taxonomies if field in data}
+        db_obj, _ = self._update_returning(db, id, data)
+        if db_obj is None:
+            return None
+        # An explicit null leaves the links unchanged; an empty list clears them.
+        self._set_taxonomies(db, db_obj, {field: ids for field, ids in links.items() if ids is not None})
         db.commit()
-        db.refresh(db_obj)
+        self._written([id])
         return db_obj
 
-    def update(self, db: Session, *, db_obj: models.Case, obj_in: schemas.CaseUpdate) -> models.Case:
-        update_data = obj_in.model_dump(exclude_unset=True)
-        
-        # Handle taxonomy relationships separately
-        if "area_ids" in update_data:
-            area_ids = update_data.pop("area_ids")
-            if area_ids is not None:
-                db_obj.areas = db.query(models.AreaOfApplication).filter(models.AreaOfApplication.area_id.in_(area_ids)).all()
-        
-        if "issue_ids" in update_data:
-            issue_ids = update_data.pop("issue_ids")
-            if issue_ids is not None:
-                db_obj.issues = db.query(models.Issue).filter(models.Issue.issue_id.in_(issue_ids)).all()
-
-        if "cause_ids" in update_data:
-            cause_ids = update_data.pop("cause_ids")
-            if cause_ids is not None:
-                db_obj.causes = db.query(models.CauseOfAction).filter(models.CauseOfAction.cause_id.in_(cause_ids)).all()
-
-        if "algorithm_ids" in update_data:
-            algorithm_ids = update_data.pop("algorithm_ids")
-            if algorithm_ids is not None:
-                db_obj.algorithms = db.query(models.Algorithm).filter(models.Algorithm.algorithm_id.in_(algorithm_ids)).all()
-
-        if "organization_ids" in update_data:
-            organization_ids = update_data.pop("organization_ids")
-            if organization_ids is not None:
-                db_obj.organizations = db.query(models.Organization).filter(models.Organization.organization_id.in_(organization_ids)).all()
-
-        return super().update(db, db_obj=db_obj, obj_in=schemas.CaseUpdate(**update_data))
+    def _set_taxonomies(
+        self, db: Session, db_obj: models.Case, links: Dict[str, List[int]], *, new: bool = False
+    ) -> None:
+        """
+        Make each junction table match the given ids by deleting and inserting
+        only the rows that differ, in one statement per taxonomy that also
+        returns the resulting taxonomy rows. Unknown ids are ignored.
+        """
+        for field, ids in links.items():
+            rel, junction, target = self.taxonomies[field]
+            target_pk = getattr(target, inspect(target).primary_key[0].key)
+            link_col = junction.c[target_pk.key]
+
+            stmt = select(target).where(target_pk.in_(ids))
+            if not new:
+                removed = delete(junction).where(
+                    junction.c.case_id == db_obj.case_id, link_col.not_in(ids)
+                )
+                stmt = stmt.add_cte(removed.cte(f"removed_{target_pk.key}"))
+            if ids:
+                added = pg_insert(junction).from_select(
+                    ["case_id", target_pk.key],
+                    select(literal(db_obj.case_id, Integer), target_pk).where(target_pk.in_(ids)),
+                ).on_conflict_do_nothing()
+                stmt = stmt.add_cte(added.cte(f"added_{target_pk.key}"))
+            set_committed_value(db_obj, rel, db.scalars(stmt).all())
 
     def get_by_slug(self, db: Session, slug: str) -> Optional[models.Case]:
-        return db.query(models.Case).filter(models.Case.slug == slug).first()
+        return db.scalars(self._select_by_slug, {"slug": slug}).first()
+
+    def get_by_slugs(self, db: Session, slugs: Sequence[str]) -> Dict[str, models.Case]:
+        if not slugs:
+            return {}
+        stmt = select(models.Case).where(models.Case.slug.in_(set(slugs))).options(*self.load_options)
+        return {obj.slug: obj for obj in db.scalars(stmt)}
+
+
+def page(items: List[Any], total: int, skip: int, limit: int, *, estimated: bool = False) -> Dict[str, Any]:
+    return {"items": items, "total": total, "total_is_estimate": estimated, "skip": skip, "limit": limit}
+
+
+def page_of(items: Sequence[Any], skip: int, limit: int) -> Dict[str, Any]:
+    """Page over an in-memory list, e.g. cached reference data, with an exact total."""
+    return page(list(items[skip:skip + limit]), len(items), skip, limit)
+
+
+def table_rows(db: Session, table: str) -> Optional[int]:
+    """
+    Planner row estimate for a table (summed over partitions), or None when
+    statistics are unavailable (not PostgreSQL, or never analyzed).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = db.execute(text(
+        "SELECT SUM(c.reltuples) FILTER (WHERE c.reltuples >= 0) FROM pg_class c "
+        "WHERE c.oid = to_regclass(:table) "
+        "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table))"
+    ), {"table": table}).scalar()
+    return int(estimate) if estimate is not None else None
+
+
+def explain_rows(db: Session, query: Query) -> Optional[int]:
+    """Row estimate for a query from ``EXPLAIN``, without executing it."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.statement.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def as_batch(keys: Sequence[Any], found: Dict[Any, Any]) -> List[Dict[str, Any]]:
+    """Arrange batch lookup results in request order, marking keys that were not found."""
+    return [{"key": key, "found": key in found, "item": found.get(key)} for key in keys]
 
 
 # --- Instantiate CRUD objects ---
 
-case = CRUDCase(models.Case)
-jurisdiction = CRUDBase[models.Jurisdiction, schemas.JurisdictionCreate, schemas.JurisdictionUpdate](models.Jurisdiction)
-docket = CRUDBase[models.Docket, schemas.DocketCreate, schemas.DocketUpdate](models.Docket)
-document = CRUDBase[models.Document, schemas.DocumentCreate, schemas.DocumentUpdate](models.Document)
-secondary_source = CRUDBase[models.SecondarySource, schemas.SecondarySourceCreate, schemas.SecondarySourceUpdate](models.SecondarySource)
+case = CRUDCase(
+    models.Case,
+    load_options=(
+        selectinload(models.Case.jurisdiction),
+        selectinload(models.Case.dockets).selectinload(models.Docket.documents),
+        selectinload(models.Case.secondary_sources),
+        selectinload(models.Case.areas),
+        selectinload(models.Case.issues),
+        selectinload(models.Case.causes),
+        selectinload(models.Case.algorithms),
+        selectinload(models.Case.organizations),
+    ),
+    on_write=lambda ids: invalidate_cases(ids),
+)
+jurisdiction = CRUDBase[models.Jurisdiction, schemas.JurisdictionCreate, schemas.JurisdictionUpdate](
+    models.Jurisdiction, on_write=lambda ids: reference_data.invalidate("jurisdictions")
+)
+# Child rows are embedded in case responses; a write evicts the cases that own them.
+docket = CRUDBase[models.Docket, schemas.DocketCreate, schemas.DocketUpdate](
+    models.Docket,
+    load_options=(selectinload(models.Docket.documents),),
+    on_write=lambda ids: invalidate_cases(ids, reindex=False),
+    owner=models.Docket.case_id,
+)
+document = CRUDBase[models.Document, schemas.DocumentCreate, schemas.DocumentUpdate](
+    models.Document,
+    on_write=lambda ids: invalidate_cases(ids, reindex=False),
+    # Named rather than correlated: ORM INSERT ... RETURNING does not correlate to the target table.
+    owner=select(models.Docket.case_id)
+    .where(models.Docket.docket_id == literal_column("documents.docket_id"))
+    .scalar_subquery(),
+)
+secondary_source = CRUDBase[models.SecondarySource, schemas.SecondarySourceCreate, schemas.SecondarySourceUpdate](
+    models.SecondarySource, on_write=lambda ids: invalidate_cases(ids, reindex=False), owner=models.SecondarySource.case_id
+)
 
 # Taxonomy CRUDs
-area = CRUDBase[models.AreaOfApplication, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](models.AreaOfApplication)
-issue = CRUDBase[models.Issue, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](models.Issue)
-cause = CRUDBase[models.CauseOfAction, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](models.CauseOfAction)
-algorithm = CRUDBase[models.Algorithm, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](models.Algorithm)
-organization = CRUDBase[models.Organization, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](models.Organization)
+area = CRUDBase[models.AreaOfApplication, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](
+    models.AreaOfApplication, on_write=lambda ids: reference_data.invalidate("areas")
+)
+issue = CRUDBase[models.Issue, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](
+    models.Issue, on_write=lambda ids: reference_data.invalidate("issues")
+)
+cause = CRUDBase[models.CauseOfAction, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](
+    models.CauseOfAction, on_write=lambda ids: reference_data.invalidate("causes")
+)
+algorithm = CRUDBase[models.Algorithm, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](
+    models.Algorithm, on_write=lambda ids: reference_data.invalidate("algorithms")
+)
+organization = CRUDBase[models.Organization, schemas.TaxonomyCreate, schemas.TaxonomyUpdate](
+    models.Organization, on_write=lambda ids: reference_data.invalidate("organizations")
+)
+
+
+# --- Reference data and response caches ---
+
+reference_data = ReferenceCache(cache, ttl=settings.REFERENCE_CACHE_TTL)
+
+
+def _reference_loader(crud_obj: CRUDBase):
+    def load(db: Session) -> List[Any]:
+        return crud_obj.get_multi(db, limit=None)
+    return load
+
+
+reference_data.register("jurisdictions", _reference_loader(jurisdiction), schemas.Jurisdiction)
+reference_data.register("areas", _reference_loader(area), schemas.AreaOfApplication)
+reference_data.register("issues", _reference_loader(issue), schemas.Issue)
+reference_data.register("causes", _reference_loader(cause), schemas.CauseOfAction)
+reference_data.register("algorithms", _reference_loader(algorithm), schemas.Algorithm)
+reference_data.register("organizations", _reference_loader(organization), schemas.Organization)
+
+
+def case_key(id: Any) -> str:
+    return f"case:{id}"
+
+
+# Called with the same ``ids`` as invalidate_cases when case rows or their taxonomy
+# links changed, so indexes derived from them can follow writes.
+case_change_hooks: List[Callable[[Optional[Sequence[Any]]], None]] = []
+
+
+def invalidate_cases(ids: Optional[Sequence[Any]] = None, *, reindex: bool = True) -> None:
+    """
+    Drop cached case responses. Without ``ids`` every case is dropped,
+    for changes whose cases are not known (imports, reference data).
+    ``reindex=False`` is for changes that leave the case rows and their
+    taxonomy links alone (dockets, documents, sources, reference names),
+    which only need the responses dropped.
+    """
+    if ids is None:
+        cache.delete_prefix("case:")
+    elif ids:
+        cache.delete(*[case_key(id) for id in ids])
+    else:
+        return
+    if reindex:
+        for hook in case_change_hooks:
+            hook(ids)
@@ -1,17 +1,65 @@
+import time
+
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.v1.api import api_router
+from app.core import admission, coalescing
+from app.core.cache import cache
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.models import models # Import models to ensure they are registered with Base
+from app.core.database import SessionLocal, engine, warm_pool
+from app.crud import crud
+from app.services import imports, invalidation
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+    warm_pool(settings.DB_POOL_WARM)
+    db = SessionLocal()
+    try:
+        crud.reference_data.warm(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema creation is not done here; run `python -m app.cli create-schema` once per database.
+    try:
+        await run_in_threadpool(_warm_up)
+        app.state.ready = True
+    except Exception:
+        logger.exception("Startup warm-up failed; /healthz will retry the database")
+        app.state.ready = False
+    invalidation.start()
+
+    app.state.startup_seconds = time.perf_counter() - _import_started
+    if app.state.startup_seconds > settings.STARTUP_BUDGET_SECONDS:
+        logger.warning(
+            "Startup took %.2fs, over the %.2fs budget",
+            app.state.startup_seconds, settings.STARTUP_BUDGET_SECONDS,
+        )
+    else:
+        logger.info("Startup took %.2fs", app.state.startup_seconds)
+    yield
+    invalidation.stop()
+    imports.shutdown()
+    engine.dispose()
 
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -23,9 +71,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+        zstd_level=settings.ZSTD_LEVEL,
+    )
+
+# Added last so it runs first: shed requests are neither compressed nor routed.
+admission_controller = admission.from_settings(settings)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(admission.AdmissionMiddleware, controller=admission_controller)
+    if settings.ADMISSION_DEFAULT_LIMIT + settings.ADMISSION_HEAVY_LIMIT > settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW:
+        logger.warning("Admission limits exceed the connection pool; cheap reads may wait for connections")
+
+# Outermost: requests that join an identical in-flight GET take no admission slot.
+single_flight = coalescing.SingleFlight(
+    settings.API_V1_STR,
+    max_bytes=settings.SINGLE_FLIGHT_MAX_BYTES,
+    max_keys=settings.SINGLE_FLIGHT_MAX_KEYS,
+    exempt=admission.EXEMPT,
+)
+if settings.SINGLE_FLIGHT_ENABLED:
+    app.add_middleware(coalescing.SingleFlightMiddleware, flights=single_flight)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
 def root():
     return {"message": "Welcome to the SchemaForge AI Legal Database API"}
+
+
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    """
+    Readiness probe. Cheap once warm-up has succeeded; otherwise retries the database.
+    """
+    if not app.state.ready:
+        try:
+            warm_pool(1)
+            app.state.ready = True
+        except Exception:
+            return JSONResponse(status_code=503, content={"status": "unavailable"})
+    return {"status": "ok", "startup_seconds": round(app.state.startup_seconds, 3)}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Per-tier cache hits, misses, errors and hit rate, admission queue depths
+    and shed counts, and coalesced GETs, for this worker process.
+    """
+    return {"cache": cache.stats(), "admission": admission_controller.stats(), "single_flight": single_flight.stats()}
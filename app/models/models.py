@@ -1,5 +1,6 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, Date, ForeignKey, Table, CheckConstraint
+    Column, Integer, String, Text, Boolean, Date, DateTime, FetchedValue, ForeignKey, Table, CheckConstraint, Index,
+    JSON, func
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -9,35 +10,35 @@ case_areas = Table(
     "case_areas",
     Base.metadata,
     Column("case_id", Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), primary_key=True),
-    Column("area_id", Integer, ForeignKey("areas_of_application.area_id", ondelete="CASCADE"), primary_key=True),
+    Column("area_id", Integer, ForeignKey("areas_of_application.area_id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 case_issues = Table(
     "case_issues",
     Base.metadata,
     Column("case_id", Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), primary_key=True),
-    Column("issue_id", Integer, ForeignKey("issues.issue_id", ondelete="CASCADE"), primary_key=True),
+    Column("issue_id", Integer, ForeignKey("issues.issue_id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 case_causes = Table(
     "case_causes",
     Base.metadata,
     Column("case_id", Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), primary_key=True),
-    Column("cause_id", Integer, ForeignKey("causes_of_action.cause_id", ondelete="CASCADE"), primary_key=True),
+    Column("cause_id", Integer, ForeignKey("causes_of_action.cause_id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 case_algorithms = Table(
     "case_algorithms",
     Base.metadata,
     Column("case_id", Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), primary_key=True),
-    Column("algorithm_id", Integer, ForeignKey("algorithms.algorithm_id", ondelete="CASCADE"), primary_key=True),
+    Column("algorithm_id", Integer, ForeignKey("algorithms.algorithm_id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 case_organizations = Table(
     "case_organizations",
     Base.metadata,
     Column("case_id", Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), primary_key=True),
-    Column("organization_id", Integer, ForeignKey("organizations.organization_id", ondelete="CASCADE"), primary_key=True),
+    Column("organization_id", Integer, ForeignKey("organizations.organization_id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -57,6 +58,11 @@ class Jurisdiction(Base):
 
 class Case(Base):
     __tablename__ = "cases"
+    # Descending counterparts live in sql/migrations/0006_date_order_indexes.sql.
+    __table_args__ = (
+        Index("ix_cases_filing_date_case_id", "filing_date", "case_id"),
+        Index("ix_cases_activity_date_case_id", "most_recent_activity_date", "case_id"),
+    )
 
     case_id = Column(Integer, primary_key=True, index=True)
     slug = Column(Text, unique=True, index=True)
@@ -74,41 +80,55 @@ class Case(Base):
     most_recent_activity_date = Column(Date)
     date_added = Column(Date)
     last_update = Column(Date)
-    jurisdiction_id = Column(Integer, ForeignKey("jurisdictions.jurisdiction_id"))
+    jurisdiction_id = Column(Integer, ForeignKey("jurisdictions.jurisdiction_id"), index=True)
 
     jurisdiction = relationship("Jurisdiction", back_populates="cases")
-    dockets = relationship("Docket", back_populates="case", cascade="all, delete-orphan")
-    secondary_sources = relationship("SecondarySource", back_populates="case", cascade="all, delete-orphan")
+    dockets = relationship("Docket", back_populates="case", cascade="all, delete-orphan", passive_deletes=True)
+    secondary_sources = relationship("SecondarySource", back_populates="case", cascade="all, delete-orphan", passive_deletes=True)
     
-    areas = relationship("AreaOfApplication", secondary=case_areas, back_populates="cases")
-    issues = relationship("Issue", secondary=case_issues, back_populates="cases")
-    causes = relationship("CauseOfAction", secondary=case_causes, back_populates="cases")
-    algorithms = relationship("Algorithm", secondary=case_algorithms, back_populates="cases")
-    organizations = relationship("Organization", secondary=case_organizations, back_populates="cases")
+    areas = relationship("AreaOfApplication", secondary=case_areas, back_populates="cases", passive_deletes=True)
+    issues = relationship("Issue", secondary=case_issues, back_populates="cases", passive_deletes=True)
+    causes = relationship("CauseOfAction", secondary=case_causes, back_populates="cases", passive_deletes=True)
+    algorithms = relationship("Algorithm", secondary=case_algorithms, back_populates="cases", passive_deletes=True)
+    organizations = relationship("Organization", secondary=case_organizations, back_populates="cases", passive_deletes=True)
 
 
 class Docket(Base):
     __tablename__ = "dockets"
 
     docket_id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(Integer, ForeignKey("cases.case_id", ondelete="CASCADE"))
+    case_id = Column(Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), index=True)
     court = Column(Text)
     docket_number = Column(Text)
     link = Column(Text)
+    # Generated by Postgres (sql/migrations/0008_identifier_keys.sql); never written by the app.
+    docket_number_key = Column(
+        Text, FetchedValue(), server_onupdate=FetchedValue(), index=True, info={"normalize": "normalize_docket_number"}
+    )
 
     case = relationship("Case", back_populates="dockets")
-    documents = relationship("Document", back_populates="docket", cascade="all, delete-orphan")
+    documents = relationship("Document", back_populates="docket", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Document(Base):
     __tablename__ = "documents"
-
-    document_id = Column(Integer, primary_key=True, index=True)
-    docket_id = Column(Integer, ForeignKey("dockets.docket_id", ondelete="CASCADE"))
+    # On Postgres, sql/migrations/0007_partition_documents.sql turns this into
+    # a table range-partitioned by filing_date year. The primary key is then
+    # declared per partition (a table-wide one would have to include the
+    # nullable filing_date), so document_id carries no separate index here;
+    # 0009_document_ids keeps it unique across partitions.
+    __table_args__ = (Index("ix_documents_filing_date_document_id", "filing_date", "document_id"),)
+
+    document_id = Column(Integer, primary_key=True)
+    docket_id = Column(Integer, ForeignKey("dockets.docket_id", ondelete="CASCADE"), index=True)
     document_type = Column(Text)
     filing_date = Column(Date)
     link = Column(Text)
     citation = Column(Text)
+    # Generated by Postgres (sql/migrations/0008_identifier_keys.sql); never written by the app.
+    citation_key = Column(
+        Text, FetchedValue(), server_onupdate=FetchedValue(), index=True, info={"normalize": "normalize_citation"}
+    )
 
     docket = relationship("Docket", back_populates="documents")
 
@@ -117,7 +137,7 @@ class SecondarySource(Base):
     __tablename__ = "secondary_sources"
 
     source_id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(Integer, ForeignKey("cases.case_id", ondelete="CASCADE"))
+    case_id = Column(Integer, ForeignKey("cases.case_id", ondelete="CASCADE"), index=True)
     title = Column(Text)
     link = Column(Text)
 
@@ -167,3 +187,22 @@ class Organization(Base):
     name = Column(Text, unique=True, index=True)
 
     cases = relationship("Case", secondary=case_organizations, back_populates="organizations")
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(32), nullable=False)
+    filename = Column(Text)
+    sheet_name = Column(Text)
+    status = Column(String(16), nullable=False, default="queued")
+    rows_total = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_loaded = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    rejected = Column(JSON, nullable=False, default=list)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
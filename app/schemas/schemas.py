@@ -1,6 +1,9 @@
-from datetime import date
-from typing import List, Optional
-from pydantic import BaseModel, ConfigDict, HttpUrl
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from pydantic import BaseModel, ConfigDict, HttpUrl, computed_field
+
+ItemT = TypeVar("ItemT")
 
 
 # --- Taxonomy Schemas ---
@@ -181,3 +184,155 @@ class Case(CaseBase):
     organizations: List[Organization] = []
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class CaseHit(BaseModel):
+    case_id: int
+    slug: Optional[str] = None
+    caption: Optional[str] = None
+    score: float
+
+
+# --- Batch Schemas ---
+
+class BatchItem(BaseModel, Generic[ItemT]):
+    key: Union[int, str]
+    found: bool
+    item: Optional[ItemT] = None
+
+
+# --- Pagination Schemas ---
+
+class CountMode(str, Enum):
+    exact = "exact"
+    estimated = "estimated"
+    auto = "auto"
+
+# Sort orders for search endpoints: a leading "-" sorts descending.
+class CaseSort(str, Enum):
+    filing_date = "filing_date"
+    filing_date_desc = "-filing_date"
+    most_recent_activity_date = "most_recent_activity_date"
+    most_recent_activity_date_desc = "-most_recent_activity_date"
+    case_id = "case_id"
+    case_id_desc = "-case_id"
+
+class DocumentSort(str, Enum):
+    filing_date = "filing_date"
+    filing_date_desc = "-filing_date"
+    document_id = "document_id"
+    document_id_desc = "-document_id"
+
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    total: int
+    total_is_estimate: bool = False
+    skip: int
+    limit: int
+
+
+# --- Bulk Delete Schemas ---
+
+class BulkDelete(BaseModel):
+    ids: Optional[List[int]] = None
+    filters: Dict[str, Any] = {}
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+    ids: List[int]
+
+
+# --- Import Job Schemas ---
+
+class ImportKind(str, Enum):
+    cases = "cases"
+    dockets = "dockets"
+    documents = "documents"
+    secondary_sources = "secondary_sources"
+
+class ImportStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+class RejectedRow(BaseModel):
+    row: int
+    reason: str
+
+class ImportJob(BaseModel):
+    job_id: int
+    kind: ImportKind
+    filename: Optional[str] = None
+    sheet_name: Optional[str] = None
+    status: ImportStatus
+    rows_total: int
+    rows_processed: int
+    rows_loaded: int
+    rows_rejected: int
+    rejected: List[RejectedRow] = []
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+# --- Analytics Schemas ---
+
+class AnalyticsDimension(str, Enum):
+    jurisdiction_type = "jurisdiction_type"
+    status = "status"
+    area = "area"
+    issue = "issue"
+    cause = "cause"
+    algorithm = "algorithm"
+    organization = "organization"
+
+class Rollup(BaseModel):
+    dimension: AnalyticsDimension
+    year_basis: str
+    years: List[Optional[int]]
+    keys: List[Optional[str]]
+    counts: List[List[int]]
+    totals: List[int]
+
+
+# --- Change Feed Schemas ---
+
+class ChangeOp(str, Enum):
+    upsert = "upsert"
+    delete = "delete"
+
+class Change(BaseModel):
+    table: str
+    pk: int
+    op: ChangeOp
+    change: str
+    data: Dict[str, Any]
+
+class ChangeFeed(BaseModel):
+    changes: List[Change]
+    next: str
+    has_more: bool
+
+
+# --- Snapshot Schemas ---
+
+class SnapshotTable(BaseModel):
+    rows: int
+    bytes: int
+    build: str
+
+class SnapshotManifest(BaseModel):
+    version: str
+    horizon: str
+    built_at: float
+    tables: Dict[str, SnapshotTable]
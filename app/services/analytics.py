@@ -0,0 +1,196 @@
+"""
+Litigation-trend rollups served by ``/analytics``.
+
+Each dimension counts cases per year and key: filing year by jurisdiction
+type and by each taxonomy, and year added by status. The counts live in
+``case_rollups`` (see ``sql/migrations/0004_analytics.sql``), so a chart is
+one indexed range read instead of a scan over cases and junction tables.
+
+Triggers queue changed cases in ``analytics_dirty``. ``refresh`` claims
+the queue, replaces those cases' rows in ``case_rollup_members`` and
+recounts only the buckets they left or entered. It runs after imports,
+from ``python -m app.cli refresh-analytics`` after ETL runs, and lazily
+before a read when the queue is not empty. Concurrent refreshes are
+serialised with a transaction-level advisory lock; a reader that loses
+the race serves the current counts rather than waiting.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Arbitrary key for pg_try_advisory_xact_lock; see MIGRATION_LOCK_KEY.
+REFRESH_LOCK_KEY = 727_002
+
+# name -> (year column on cases, joins from cases c, key expression)
+DIMENSIONS: Dict[str, tuple] = {
+    "jurisdiction_type": (
+        "filing_date", "LEFT JOIN jurisdictions j ON j.jurisdiction_id = c.jurisdiction_id", "j.jurisdiction_type",
+    ),
+    "status": ("date_added", "", "c.status_disposition"),
+    "area": (
+        "filing_date",
+        "JOIN case_areas x ON x.case_id = c.case_id JOIN areas_of_application t ON t.area_id = x.area_id",
+        "t.name",
+    ),
+    "issue": (
+        "filing_date", "JOIN case_issues x ON x.case_id = c.case_id JOIN issues t ON t.issue_id = x.issue_id", "t.name",
+    ),
+    "cause": (
+        "filing_date",
+        "JOIN case_causes x ON x.case_id = c.case_id JOIN causes_of_action t ON t.cause_id = x.cause_id",
+        "t.name",
+    ),
+    "algorithm": (
+        "filing_date",
+        "JOIN case_algorithms x ON x.case_id = c.case_id JOIN algorithms t ON t.algorithm_id = x.algorithm_id",
+        "t.name",
+    ),
+    "organization": (
+        "filing_date",
+        "JOIN case_organizations x ON x.case_id = c.case_id "
+        "JOIN organizations t ON t.organization_id = x.organization_id",
+        "t.name",
+    ),
+}
+
+YEAR_BASIS = {"filing_date": "filing_year", "date_added": "year_added"}
+
+
+def _members_sql(where: str = "") -> str:
+    """One SELECT per dimension producing (case_id, dimension, year, key) rows."""
+    parts = []
+    for name, (year_column, joins, key) in DIMENSIONS.items():
+        parts.append(
+            f"SELECT DISTINCT c.case_id, '{name}' AS dimension, "
+            f"COALESCE(EXTRACT(YEAR FROM c.{year_column})::int, 0) AS year, COALESCE({key}, '') AS key "
+            f"FROM cases c {joins} {where}"
+        )
+    return "\nUNION ALL\n".join(parts)
+
+
+def _recount(db: Session) -> None:
+    """Rewrite the counts of the buckets listed in ``refresh_buckets``."""
+    db.execute(text(
+        """
+        WITH counts AS (
+            SELECT b.dimension, b.year, b.key, count(m.case_id) AS cases
+            FROM (SELECT DISTINCT dimension, year, key FROM refresh_buckets) b
+            LEFT JOIN case_rollup_members m
+                ON m.dimension = b.dimension AND m.year = b.year AND m.key = b.key
+            GROUP BY b.dimension, b.year, b.key
+        ), emptied AS (
+            DELETE FROM case_rollups r USING counts c
+            WHERE c.cases = 0 AND r.dimension = c.dimension AND r.year = c.year AND r.key = c.key
+        )
+        INSERT INTO case_rollups (dimension, year, key, cases)
+        SELECT dimension, year, key, cases FROM counts WHERE cases > 0
+        ON CONFLICT (dimension, year, key) DO UPDATE SET cases = EXCLUDED.cases
+        """
+    ))
+
+
+def refresh(db: Session, *, full: bool = False, wait: bool = True) -> Optional[int]:
+    """
+    Apply queued case changes to the rollups and commit. Returns the number
+    of cases refreshed, or None if ``wait`` is False and another refresh holds the lock.
+    """
+    if wait:
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY})
+    elif not db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}).scalar():
+        db.rollback()
+        return None
+
+    if full:
+        db.execute(text("TRUNCATE analytics_dirty, case_rollup_members, case_rollups"))
+        db.execute(text(f"INSERT INTO case_rollup_members (case_id, dimension, year, key) {_members_sql()}"))
+        db.execute(text(
+            "INSERT INTO case_rollups (dimension, year, key, cases) "
+            "SELECT dimension, year, key, count(*) FROM case_rollup_members GROUP BY dimension, year, key"
+        ))
+        refreshed = db.execute(text("SELECT count(*) FROM cases")).scalar()
+        db.commit()
+        return refreshed
+
+    ids = db.execute(text("DELETE FROM analytics_dirty RETURNING case_id")).scalars().all()
+    if not ids:
+        db.commit()
+        return 0
+    db.execute(text(
+        "CREATE TEMPORARY TABLE refresh_buckets (dimension VARCHAR(32), year INT, key TEXT) ON COMMIT DROP"
+    ))
+    db.execute(text(
+        """
+        WITH removed AS (
+            DELETE FROM case_rollup_members WHERE case_id = ANY(:ids) RETURNING dimension, year, key
+        )
+        INSERT INTO refresh_buckets SELECT DISTINCT dimension, year, key FROM removed
+        """
+    ), {"ids": ids})
+    db.execute(text(
+        f"""
+        WITH added AS (
+            INSERT INTO case_rollup_members (case_id, dimension, year, key)
+            {_members_sql("WHERE c.case_id = ANY(:ids)")}
+            RETURNING dimension, year, key
+        )
+        INSERT INTO refresh_buckets SELECT DISTINCT dimension, year, key FROM added
+        """
+    ), {"ids": ids})
+    _recount(db)
+    db.commit()
+    return len(ids)
+
+
+def refresh_if_dirty(db: Session) -> None:
+    if db.execute(text("SELECT EXISTS (SELECT 1 FROM analytics_dirty)")).scalar():
+        refresh(db, wait=False)
+
+
+def rollup(
+    db: Session,
+    dimension: str,
+    *,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    top: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Counts for one dimension as columns: ``counts[k][y]`` is the number of
+    cases with ``keys[k]`` in ``years[y]``. Keys are ordered by total, largest first.
+    """
+    refresh_if_dirty(db)
+    query = "SELECT year, key, cases FROM case_rollups WHERE dimension = :dimension"
+    params: Dict[str, Any] = {"dimension": dimension}
+    if year_from is not None:
+        query += " AND year >= :year_from"
+        params["year_from"] = year_from
+    if year_to is not None:
+        query += " AND year <= :year_to"
+        params["year_to"] = year_to
+    rows = db.execute(text(query), params).all()
+
+    # Unknown years (0) sort last.
+    years = sorted({row.year for row in rows}, key=lambda year: (year == 0, year))
+    totals: Dict[str, int] = {}
+    for row in rows:
+        totals[row.key] = totals.get(row.key, 0) + row.cases
+    keys = sorted(totals, key=lambda key: (-totals[key], key))
+    if top is not None:
+        keys = keys[:top]
+    year_index = {year: i for i, year in enumerate(years)}
+    key_index = {key: i for i, key in enumerate(keys)}
+    counts: List[List[int]] = [[0] * len(years) for _ in keys]
+    for row in rows:
+        if row.key in key_index:
+            counts[key_index[row.key]][year_index[row.year]] = row.cases
+
+    return {
+        "dimension": dimension,
+        "year_basis": YEAR_BASIS[DIMENSIONS[dimension][0]],
+        "years": [year or None for year in years],
+        "keys": [key or None for key in keys],
+        "counts": counts,
+        "totals": [totals[key] for key in keys],
+    }
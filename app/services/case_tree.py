@@ -0,0 +1,89 @@
+"""
+Whole case trees rendered by Postgres.
+
+``tree`` and ``trees`` return the JSON of ``schemas.Case`` (case,
+jurisdiction, dockets with their documents, secondary sources and
+taxonomy terms) as text built by one query with ``json_build_object`` /
+``json_agg`` over lateral joins. No ORM objects are loaded and nothing is
+re-validated in Python; the bytes go straight to the response. Field lists
+come from the pydantic schemas so the output keeps their shape. Child
+lists are ordered by primary key.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.schemas import schemas
+
+# Case field -> (schema, link table or None, table, primary key)
+CHILDREN: Dict[str, Tuple[Type[BaseModel], Optional[str], str, str]] = {
+    "secondary_sources": (schemas.SecondarySource, None, "secondary_sources", "source_id"),
+    "areas": (schemas.AreaOfApplication, "case_areas", "areas_of_application", "area_id"),
+    "issues": (schemas.Issue, "case_issues", "issues", "issue_id"),
+    "causes": (schemas.CauseOfAction, "case_causes", "causes_of_action", "cause_id"),
+    "algorithms": (schemas.Algorithm, "case_algorithms", "algorithms", "algorithm_id"),
+    "organizations": (schemas.Organization, "case_organizations", "organizations", "organization_id"),
+}
+NESTED = ("jurisdiction", "dockets", *CHILDREN)
+
+
+def _fields(schema: Type[BaseModel], alias: str, exclude: Sequence[str] = ()) -> str:
+    return ", ".join(f"'{name}', {alias}.{name}" for name in schema.model_fields if name not in exclude)
+
+
+def _children(name: str) -> str:
+    schema, link, table, pk = CHILDREN[name]
+    source = (
+        f"{link} l JOIN {table} x ON x.{pk} = l.{pk} WHERE l.case_id = c.case_id"
+        if link else f"{table} x WHERE x.case_id = c.case_id"
+    )
+    return (
+        f"LEFT JOIN LATERAL (SELECT json_agg(json_build_object({_fields(schema, 'x')}) ORDER BY x.{pk}) AS items "
+        f"FROM {source}) {name} ON true"
+    )
+
+
+_CASE_OBJECT = (
+    f"json_build_object({_fields(schemas.Case, 'c', exclude=NESTED)}, "
+    "'jurisdiction', jurisdiction.item, "
+    "'dockets', COALESCE(dockets.items, '[]'::json), "
+    + ", ".join(f"'{name}', COALESCE({name}.items, '[]'::json)" for name in CHILDREN)
+    + ")"
+)
+
+_CASE_JOINS = "\n".join([
+    f"LEFT JOIN LATERAL (SELECT json_build_object({_fields(schemas.Jurisdiction, 'j')}) AS item "
+    "FROM jurisdictions j WHERE j.jurisdiction_id = c.jurisdiction_id) jurisdiction ON true",
+    f"LEFT JOIN LATERAL (SELECT json_agg(json_build_object({_fields(schemas.Docket, 'd', exclude=('documents',))}, "
+    "'documents', COALESCE(documents.items, '[]'::json)) ORDER BY d.docket_id) AS items "
+    "FROM dockets d "
+    f"LEFT JOIN LATERAL (SELECT json_agg(json_build_object({_fields(schemas.Document, 'x')}) ORDER BY x.document_id) "
+    "AS items FROM documents x WHERE x.docket_id = d.docket_id) documents ON true "
+    "WHERE d.case_id = c.case_id) dockets ON true",
+    *(_children(name) for name in CHILDREN),
+])
+
+TREE_SQL = f"SELECT {_CASE_OBJECT}::text FROM cases c\n{_CASE_JOINS}\nWHERE c.case_id = :id"
+
+# Same shape as the other batch endpoints: one entry per requested id, in request order.
+TREES_SQL = (
+    "SELECT COALESCE(json_agg(json_build_object("
+    f"'key', k.key, 'found', c.case_id IS NOT NULL, 'item', CASE WHEN c.case_id IS NOT NULL THEN {_CASE_OBJECT} END"
+    ") ORDER BY k.n), '[]'::json)::text "
+    "FROM unnest(CAST(:ids AS int[])) WITH ORDINALITY AS k(key, n) "
+    f"LEFT JOIN cases c ON c.case_id = k.key\n{_CASE_JOINS}"
+)
+
+
+def tree(db: Session, case_id: int) -> Optional[bytes]:
+    """The case's JSON, or None if it does not exist."""
+    body = db.execute(text(TREE_SQL), {"id": case_id}).scalar()
+    return body.encode() if body is not None else None
+
+
+def trees(db: Session, case_ids: Sequence[int]) -> bytes:
+    """A JSON array of ``{"key", "found", "item"}`` entries for ``case_ids``, in order."""
+    return db.execute(text(TREES_SQL), {"ids": list(case_ids)}).scalar().encode()
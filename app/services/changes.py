@@ -0,0 +1,121 @@
+"""
+Change feed over the tables stamped by ``sql/migrations/0005_change_feed.sql``.
+
+A token is ``"<xid>.<seq>"``: the transaction id and change sequence of the
+last change a client has seen. Each table (and the tombstone table) is
+read through its ``(change_xid, change_seq)`` index past the token, up to
+one horizon shared by the whole page: the oldest transaction still
+running. Anything committed later has a transaction id at or above that
+horizon, so it always sorts after the returned token.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Table name -> primary key column.
+TABLES = {
+    "cases": "case_id",
+    "dockets": "docket_id",
+    "documents": "document_id",
+    "secondary_sources": "source_id",
+    "jurisdictions": "jurisdiction_id",
+    "areas_of_application": "area_id",
+    "issues": "issue_id",
+    "causes_of_action": "cause_id",
+    "algorithms": "algorithm_id",
+    "organizations": "organization_id",
+}
+
+# Link tables folded into case entries as id lists.
+CASE_LINKS = {
+    "area_ids": ("case_areas", "area_id"),
+    "issue_ids": ("case_issues", "issue_id"),
+    "cause_ids": ("case_causes", "cause_id"),
+    "algorithm_ids": ("case_algorithms", "algorithm_id"),
+    "organization_ids": ("case_organizations", "organization_id"),
+}
+
+Position = Tuple[int, int]
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def parse_token(token: Optional[str]) -> Position:
+    if not token:
+        return (0, 0)
+    try:
+        xid, seq = token.split(".")
+        return (int(xid), int(seq))
+    except ValueError:
+        raise InvalidToken(f"Invalid change token {token!r}")
+
+
+def format_token(position: Position) -> str:
+    return f"{position[0]}.{position[1]}"
+
+
+def _after(position: Position, horizon: str, limit: int) -> Dict[str, Any]:
+    return {"xid": str(position[0]), "seq": position[1], "horizon": horizon, "limit": limit}
+
+
+_WINDOW = (
+    "(change_xid, change_seq) > (CAST(:xid AS xid8), :seq) AND change_xid < CAST(:horizon AS xid8) "
+    "ORDER BY change_xid, change_seq LIMIT :limit"
+)
+
+
+def feed(db: Session, since: Optional[str], limit: int, tables: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Up to ``limit`` changes after ``since``, oldest first, with the token to resume from."""
+    position = parse_token(since)
+    tables = list(tables or TABLES)
+    horizon = db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")).scalar()
+    params = _after(position, horizon, limit)
+
+    streams = []
+    for table in tables:
+        rows = db.execute(text(
+            f"SELECT change_xid::text AS xid, change_seq AS seq, {TABLES[table]} AS pk, "
+            f"to_jsonb(t) - 'change_xid' AS data FROM {table} t WHERE {_WINDOW}"
+        ), params).all()
+        streams.append([((int(r.xid), r.seq), table, r.pk, "upsert", r.data) for r in rows])
+    rows = db.execute(text(
+        "SELECT change_xid::text AS xid, change_seq AS seq, table_name, pk, deleted_at "
+        f"FROM change_tombstones WHERE table_name = ANY(:tables) AND {_WINDOW}"
+    ), {**params, "tables": tables}).all()
+    streams.append([
+        ((int(r.xid), r.seq), r.table_name, r.pk, "delete", {"deleted_at": r.deleted_at.isoformat()})
+        for r in rows
+    ])
+
+    merged = list(heapq.merge(*streams, key=lambda change: change[0]))
+    page = merged[:limit]
+    _attach_case_links(db, [change[4] for change in page if change[1] == "cases" and change[3] == "upsert"])
+
+    return {
+        "changes": [
+            {"table": table, "pk": pk, "op": op, "change": format_token(pos), "data": data}
+            for pos, table, pk, op, data in page
+        ],
+        "next": format_token(page[-1][0]) if page else format_token(position),
+        "has_more": len(merged) > limit or any(len(stream) == limit for stream in streams),
+    }
+
+
+def _attach_case_links(db: Session, cases: List[Dict[str, Any]]) -> None:
+    if not cases:
+        return
+    by_id = {case["case_id"]: case for case in cases}
+    for field, (table, column) in CASE_LINKS.items():
+        for case in cases:
+            case[field] = []
+        rows = db.execute(
+            text(f"SELECT case_id, {column} FROM {table} WHERE case_id = ANY(:ids) ORDER BY case_id, {column}"),
+            {"ids": list(by_id)},
+        )
+        for case_id, term_id in rows:
+            by_id[case_id][field].append(term_id)
@@ -0,0 +1,50 @@
+"""
+Documented examples of the identifier normalization functions.
+
+``sql/migrations/0008_identifier_keys.sql`` defines
+``normalize_docket_number`` and ``normalize_citation``, which generate
+``dockets.docket_number_key`` and ``documents.citation_key``. The README
+and API documentation promise that certain spellings find each other;
+``check`` runs those spellings through the installed functions so a
+change to either function that breaks a documented match is caught by
+``python -m app.cli check-identifier-keys`` before it ships.
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# (function, input, expected key), as given in the docs and the migration header.
+EXAMPLES: Tuple[Tuple[str, str, str], ...] = (
+    ("normalize_docket_number", "No. 1:23-cv-03440", "23-cv-3440"),
+    ("normalize_docket_number", "23-CV-3440", "23-cv-3440"),
+    ("normalize_docket_number", "23 CV 3440", "23-cv-3440"),
+    ("normalize_docket_number", "1:23-cv-03440-ABC", "23-cv-3440"),
+    ("normalize_docket_number", "1:23-cv-00456", "23-cv-456"),
+    ("normalize_docket_number", "23 CV 456", "23-cv-456"),
+    ("normalize_docket_number", "Case No. 23-cv-456-ABC", "23-cv-456"),
+    ("normalize_citation", "12 F. Supp. 3d 45", "12 fsupp3d 45"),
+    ("normalize_citation", "12 F.Supp.3d 45", "12 fsupp3d 45"),
+    ("normalize_citation", "484 F.Supp.3d 561 (N.D. Ill. 2019)", "484 fsupp3d 561"),
+    ("normalize_citation", "5 F. App'x 7", "5 fedappx 7"),
+    ("normalize_citation", "5 Fed. Appx. 7", "5 fedappx 7"),
+    ("normalize_citation", "2024 Cal. Super. LEXIS 123", "2024 calsuperlexis 123"),
+)
+
+
+class Mismatch(NamedTuple):
+    function: str
+    value: str
+    expected: str
+    actual: Optional[str]
+
+
+def check(db: Session) -> List[Mismatch]:
+    """Run every example through the database and return those that do not match."""
+    mismatches = []
+    for function, value, expected in EXAMPLES:
+        actual = db.execute(select(getattr(func, function)(value))).scalar()
+        if actual != expected:
+            mismatches.append(Mismatch(function, value, expected, actual))
+    return mismatches
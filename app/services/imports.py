@@ -0,0 +1,264 @@
+"""
+Background spreadsheet imports.
+
+``POST /imports`` copies the upload to ``IMPORT_DIR`` in fixed-size
+chunks, records an ``import_jobs`` row and hands the job to a small
+thread pool, so API workers return as soon as the file is on disk.
+
+Workers run the ``scripts`` loaders on a pooled DBAPI connection inside
+one transaction: a job loads every accepted row or nothing. Progress,
+rejected rows and timings are written to the job row through a separate
+session while the load is running.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.crud import crud
+from app.models import models
+from app.schemas import schemas
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+EXTENSIONS = (".xlsx", ".csv")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_futures: Dict[int, Future] = {}
+_lock = threading.Lock()
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def save_upload(source: BinaryIO, filename: str) -> str:
+    """Copy ``source`` into ``IMPORT_DIR`` chunk by chunk and return the new path."""
+    os.makedirs(settings.IMPORT_DIR, exist_ok=True)
+    extension = os.path.splitext(filename)[1].lower()
+    path = os.path.join(settings.IMPORT_DIR, f"{uuid.uuid4().hex}{extension}")
+    written = 0
+    try:
+        with open(path, "wb") as target:
+            while chunk := source.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > settings.IMPORT_MAX_BYTES:
+                    raise UploadTooLarge(f"Uploads are limited to {settings.IMPORT_MAX_BYTES} bytes.")
+                target.write(chunk)
+    except BaseException:
+        _discard(path)
+        raise
+    return path
+
+
+def enqueue(db: Session, kind: schemas.ImportKind, filename: str, sheet_name: Optional[str], path: str) -> models.ImportJob:
+    job = models.ImportJob(kind=kind.value, filename=filename, sheet_name=sheet_name, status="queued", rejected=[])
+    db.add(job)
+    db.commit()
+    with _lock:
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMPORT_WORKERS, thread_name_prefix="import")
+        future = _executor.submit(run, job.job_id, path)
+        _futures[job.job_id] = future
+    future.add_done_callback(lambda _: _futures.pop(job.job_id, None))
+    return job
+
+
+def shutdown() -> None:
+    """Stop accepting jobs; running jobs finish, queued ones are marked failed."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        pending = dict(_futures)
+    if executor is None:
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+    cancelled = [job_id for job_id, future in pending.items() if future.cancelled()]
+    if not cancelled:
+        return
+    db = SessionLocal()
+    try:
+        for job_id in cancelled:
+            job = db.get(models.ImportJob, job_id)
+            if job is not None:
+                job.status = "failed"
+                job.error = "Cancelled by server shutdown before it started."
+                job.finished_at = _now()
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record_outcome(job_id: int, status: str, error: Optional[str]) -> None:
+    """Write a finished job's status through a fresh session."""
+    db = SessionLocal()
+    try:
+        job = db.get(models.ImportJob, job_id)
+        if job is not None:
+            job.status = status
+            job.error = error
+            job.finished_at = _now()
+            db.commit()
+    except Exception:
+        logger.exception("Import job %s could not be marked %s", job_id, status)
+    finally:
+        db.close()
+
+
+def _loader(kind: str):
+    # Imported here so that pandas is only loaded by processes that run imports.
+    from scripts.load_cases import load_cases
+    from scripts.load_dockets import load_dockets
+    from scripts.load_documents import load_documents
+    from scripts.load_secondary import load_secondary
+
+    return {
+        "cases": load_cases,
+        "dockets": load_dockets,
+        "documents": load_documents,
+        "secondary_sources": load_secondary,
+    }[kind]
+
+
+def run(job_id: int, path: str) -> None:
+    from scripts.load_cases import fetch_record_map
+    from scripts.utils import LoadReport
+
+    db = SessionLocal()
+    job = db.get(models.ImportJob, job_id)
+    if job is None:
+        db.close()
+        _discard(path)
+        return
+
+    def record(report: LoadReport) -> None:
+        job.rows_total = report.total
+        job.rows_processed = report.processed
+        job.rows_loaded = report.loaded
+        job.rows_rejected = report.rejected
+        job.rejected = list(report.rejected_rows)
+        db.commit()
+
+    report = LoadReport(progress=record, max_rejected=settings.IMPORT_MAX_REJECTED)
+    try:
+        job.status = "running"
+        job.started_at = _now()
+        db.commit()
+
+        load = _loader(job.kind)
+        sheet_name = job.sheet_name
+        conn = engine.raw_connection()
+        try:
+            options = dict(conn=conn, report=report, chunk_size=settings.IMPORT_CHUNK_SIZE)
+            if job.kind == "cases":
+                load(path, sheet_name, **options)
+            else:
+                load(fetch_record_map(conn), path, sheet_name, **options)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        job.status = "succeeded"
+    except Exception as e:
+        logger.exception("Import job %s failed", job_id)
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = _now()
+        status, error = job.status, job.error
+        try:
+            record(report)
+        except Exception:
+            # The session's connection may be gone; the outcome still gets written.
+            logger.exception("Recording the result of import job %s failed", job_id)
+            _record_outcome(job_id, status, error)
+        finally:
+            db.close()
+            _discard(path)
+
+    # New jurisdictions, taxonomy terms and case children may have been added.
+    crud.reference_data.invalidate()
+    crud.invalidate_cases()
+    if job.status == "succeeded":
+        _refresh_analytics()
+        if job.kind == "cases":
+            _rebuild_search_index()
+        if job.kind == "documents":
+            _create_document_partitions()
+        _refresh_snapshots()
+
+
+def _refresh_analytics() -> None:
+    from app.services import analytics
+
+    db = SessionLocal()
+    try:
+        analytics.refresh(db)
+    except Exception:
+        logger.exception("Refreshing analytics after an import failed")
+    finally:
+        db.close()
+
+
+def _rebuild_search_index() -> None:
+    from app.services import search_index
+
+    db = SessionLocal()
+    try:
+        search_index.build(db)
+    except Exception:
+        logger.exception("Rebuilding the search index after an import failed")
+    finally:
+        db.close()
+
+
+def _create_document_partitions() -> None:
+    from app.services import partitions
+
+    # Documents filed in years without a partition landed in documents_default.
+    db = SessionLocal()
+    try:
+        partitions.create(db, settings.DOCUMENT_PARTITIONS_AHEAD)
+    except Exception:
+        logger.exception("Creating document partitions after an import failed")
+    finally:
+        db.close()
+
+
+def _refresh_snapshots() -> None:
+    from app.services import snapshots
+
+    # Snapshots are opt-in: only keep them current once someone has built one.
+    if snapshots.read_manifest() is None:
+        return
+    db = SessionLocal()
+    try:
+        snapshots.build(db)
+    except Exception:
+        logger.exception("Refreshing snapshots after an import failed")
+    finally:
+        db.close()
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,195 @@
+"""
+Cross-worker cache invalidation through Postgres ``LISTEN``/``NOTIFY``.
+
+Triggers installed by ``sql/migrations/0003_change_notify.sql`` publish
+every row change on ``CHANNEL``. Each API process runs one listener thread
+on a dedicated connection and turns notifications into evictions: the
+cached responses of the cases named in the payload, or the reference list
+for the table. Writes made outside the API (``scripts/``, psql) are
+evicted the same way.
+
+While the listener is connected the local LRU keeps entries for
+``CACHE_NOTIFY_LOCAL_TTL`` instead of ``CACHE_LOCAL_TTL``. If the
+connection drops, the local tier goes back to the short TTL and is
+cleared; after reconnecting the whole cache is cleared, since changes may
+have been missed in between.
+"""
+
+import json
+import logging
+import select
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.crud import crud
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "schemaforge_changes"
+
+# Table name -> ReferenceCache name.
+REFERENCE_TABLES = {
+    "jurisdictions": "jurisdictions",
+    "areas_of_application": "areas",
+    "issues": "issues",
+    "causes_of_action": "causes",
+    "algorithms": "algorithms",
+    "organizations": "organizations",
+}
+
+# Tables whose changes alter the case rows or their taxonomy links.
+CASE_TABLES = {"cases", "case_areas", "case_issues", "case_causes", "case_algorithms", "case_organizations"}
+
+_listener: Optional["ChangeListener"] = None
+
+
+def apply_changes(changes: Iterable[Dict[str, Any]]) -> None:
+    """Evict the cache entries affected by a batch of change payloads."""
+    case_ids = set()
+    child_case_ids = set()
+    references = set()
+    all_cases = False
+    for change in changes:
+        table, op = change.get("table"), change.get("op")
+        if op == "TRUNCATE":
+            cache.clear()
+            crud.invalidate_cases(reindex=table in CASE_TABLES)
+            return
+        if table in REFERENCE_TABLES:
+            references.add(REFERENCE_TABLES[table])
+            # Case responses embed jurisdiction and taxonomy names.
+            all_cases = all_cases or op != "INSERT"
+        elif table in CASE_TABLES:
+            case_ids.update(change.get("case_ids") or ())
+        else:
+            child_case_ids.update(change.get("case_ids") or ())
+    for name in references:
+        crud.reference_data.invalidate(name)
+    if all_cases:
+        # Deleted terms also remove their links, which arrive as link table changes.
+        crud.invalidate_cases(reindex=False)
+    else:
+        crud.invalidate_cases(sorted(child_case_ids - case_ids), reindex=False)
+    crud.invalidate_cases(sorted(case_ids))
+
+
+def connect_args(uri: str) -> Optional[Dict[str, Any]]:
+    """psycopg2 keyword arguments for ``uri``, or None if it is not a Postgres URI."""
+    url = make_url(uri)
+    if url.get_backend_name() != "postgresql":
+        return None
+    args = url.translate_connect_args(username="user", database="dbname")
+    args.update({key: value for key, value in url.query.items() if isinstance(value, str)})
+    # Notice a silently dropped connection instead of waiting on it forever.
+    args.setdefault("keepalives", 1)
+    args.setdefault("keepalives_idle", 30)
+    args.setdefault("keepalives_interval", 10)
+    args.setdefault("keepalives_count", 3)
+    return args
+
+
+class ChangeListener:
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        on_changes: Callable[[List[Dict[str, Any]]], None],
+        *,
+        channel: str = CHANNEL,
+        poll_interval: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ):
+        self.connect = connect
+        self.on_changes = on_changes
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.max_retry_delay = max_retry_delay
+        self.connected = False
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        delay = 1.0
+        listened = False
+        while not self._stopping.is_set():
+            try:
+                conn = self.connect()
+            except Exception:
+                logger.warning("Cannot connect for %s; retrying in %.0fs", self.channel, delay, exc_info=True)
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                if listened:
+                    cache.clear()
+                listened, delay = True, 1.0
+                self._connected(True)
+                self._listen(conn)
+            except Exception:
+                logger.warning("Lost %s listener connection", self.channel, exc_info=True)
+            finally:
+                self._connected(False)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _listen(self, conn: Any) -> None:
+        while not self._stopping.is_set():
+            if not select.select([conn], [], [], self.poll_interval)[0]:
+                continue
+            conn.poll()
+            changes = []
+            while conn.notifies:
+                payload = conn.notifies.pop(0).payload
+                try:
+                    changes.append(json.loads(payload))
+                except ValueError:
+                    logger.warning("Ignoring malformed change notification %r", payload)
+            if changes:
+                self.on_changes(changes)
+
+    def _connected(self, connected: bool) -> None:
+        if connected == self.connected:
+            return
+        self.connected = connected
+        local = cache.tiers[0]
+        if len(cache.tiers) > 1:
+            local.max_ttl = settings.CACHE_NOTIFY_LOCAL_TTL if connected else settings.CACHE_LOCAL_TTL
+        if not connected:
+            # Entries may have been cached with the long TTL; nothing evicts them now.
+            local.delete_prefix("")
+
+
+def start() -> None:
+    """Start this process's listener, if enabled and the database is Postgres."""
+    global _listener
+    args = connect_args(settings.SQLALCHEMY_DATABASE_URI)
+    if not settings.CACHE_NOTIFY_ENABLED or args is None or _listener is not None:
+        return
+    import psycopg2
+
+    _listener = ChangeListener(lambda: psycopg2.connect(**args), apply_changes)
+    _listener.start()
+
+
+def stop() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,90 @@
+"""
+Maintenance of the yearly ``documents`` partitions.
+
+``sql/migrations/0007_partition_documents.sql`` range-partitions documents by
+``filing_date`` year. ``create`` adds the partitions for the coming years,
+plus one for every year with rows in ``documents_default`` (a document
+filed in a year that had no partition yet), which moves those rows out of
+the default partition. ``archive`` detaches the partitions of old years and
+moves them to the ``archive`` schema: the rows stay queryable there but
+leave the API, and no rows are deleted or rewritten.
+"""
+
+import json
+import re
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.invalidation import CHANNEL
+
+PARENT = "documents"
+DEFAULT = "documents_default"
+ARCHIVE_SCHEMA = "archive"
+# Attaching and detaching lock the parent briefly; give up rather than queue
+# behind long-running queries and block every request that follows.
+LOCK_TIMEOUT = "5s"
+
+_YEAR_RE = re.compile(rf"^{PARENT}_(\d{{4}})$")
+
+
+def partitions(db: Session) -> Dict[int, str]:
+    """Year -> name of each attached yearly partition."""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT}).scalars()
+    found = {}
+    for name in names:
+        match = _YEAR_RE.match(name)
+        if match:
+            found[int(match.group(1))] = name
+    return found
+
+
+def create(db: Session, ahead: int, today: Optional[date] = None) -> List[str]:
+    """
+    Create missing partitions for this year and the next ``ahead`` years, and
+    for every year that has rows in the default partition. Returns the names
+    of the partitions created, each committed on its own.
+    """
+    year = (today or date.today()).year
+    stranded = db.execute(text(
+        f"SELECT DISTINCT CAST(extract(year FROM filing_date) AS int) FROM {DEFAULT} WHERE filing_date IS NOT NULL"
+    )).scalars().all()
+    db.rollback()
+    created = []
+    for filing_year in sorted(set(range(year, year + ahead + 1)) | set(stranded)):
+        db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        if db.execute(text("SELECT create_document_partition(:year)"), {"year": filing_year}).scalar():
+            created.append(f"{PARENT}_{filing_year}")
+        db.commit()
+    return created
+
+
+def archive(db: Session, before: int) -> List[str]:
+    """
+    Detach every yearly partition for years before ``before`` and move it to
+    the archive schema. The change feed gets a tombstone for each archived
+    document, and API workers are told to drop their cached cases.
+    """
+    archived = []
+    for year, name in sorted(partitions(db).items()):
+        if year >= before:
+            continue
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        db.execute(text(
+            f"INSERT INTO change_tombstones (table_name, pk) SELECT :parent, document_id FROM {ARCHIVE_SCHEMA}.{name}"
+        ), {"parent": PARENT})
+        # Announced like a TRUNCATE: too many cases to list, so caches are cleared.
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {
+            "channel": CHANNEL, "payload": json.dumps({"table": PARENT, "op": "TRUNCATE"}),
+        })
+        db.commit()
+        archived.append(f"{ARCHIVE_SCHEMA}.{name}")
+    return archived
@@ -0,0 +1,236 @@
+"""
+Offline semantic search over case text.
+
+``build`` reads ``caption``, ``brief_description``,
+``summary_of_significance`` and ``summary_facts_activity`` for every case
+and turns each into a sparse TF-IDF vector. Features are words, word
+bigrams and character 4-grams of words, hashed into ``DIMENSIONS``
+buckets, so no vocabulary or model has to be downloaded or stored, and
+inflections and partial matches ("discriminate" / "discriminatory") still
+overlap. Weights are sublinear term frequency times IDF, L2-normalised.
+
+The index is written term-major (postings per hash bucket) as ``.npy``
+files in a new version directory under ``SEARCH_INDEX_DIR``, then
+published by atomically replacing ``current.json``. API workers map the
+files read-only, so the page cache holds one copy for the whole host, and
+pick up a new version the next time they query. A query hashes its own
+features, gathers their postings and sums them with ``np.bincount``:
+cosine scores for every case in one vectorised pass.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import models
+
+DIMENSIONS = 1 << 20
+TEXT_COLUMNS = ("caption", "brief_description", "summary_of_significance", "summary_facts_activity")
+POINTER = "current.json"
+KEEP_VERSIONS = 2
+ARRAYS = ("term_ptr", "postings_doc", "postings_weight", "idf", "case_ids", "jurisdiction_ids")
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were which with".split()
+)
+
+
+def features(text: str) -> Counter:
+    """Hashed feature counts for ``text``: words, word bigrams and character 4-grams."""
+    words = [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+    counts: Counter = Counter()
+    for word in words:
+        counts[_bucket("w:" + word)] += 1
+        padded = f"<{word}>"
+        for start in range(len(padded) - 3):
+            counts[_bucket("c:" + padded[start:start + 4])] += 1
+    for first, second in zip(words, words[1:]):
+        counts[_bucket(f"b:{first} {second}")] += 1
+    return counts
+
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): it must agree between the build and every worker process.
+    return zlib.crc32(feature.encode()) & (DIMENSIONS - 1)
+
+
+def _weights(counts: Counter) -> Dict[int, float]:
+    return {term: 1.0 + np.log(count) for term, count in counts.items()}
+
+
+def build(db: Session, directory: Optional[str] = None) -> Dict[str, Any]:
+    """Build a new index version from the database and publish it. Returns its metadata."""
+    directory = directory or settings.SEARCH_INDEX_DIR
+    columns = [getattr(models.Case, name) for name in TEXT_COLUMNS]
+    query = (
+        select(models.Case.case_id, models.Case.jurisdiction_id, *columns)
+        .order_by(models.Case.case_id)
+        .execution_options(yield_per=1000)
+    )
+
+    case_ids: List[int] = []
+    jurisdiction_ids: List[int] = []
+    docs: List[np.ndarray] = []
+    terms: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+    for row, (case_id, jurisdiction_id, *texts) in enumerate(db.execute(query)):
+        case_weights = _weights(features(" ".join(text for text in texts if text)))
+        case_ids.append(case_id)
+        jurisdiction_ids.append(jurisdiction_id if jurisdiction_id is not None else -1)
+        docs.append(np.full(len(case_weights), row, dtype=np.int32))
+        terms.append(np.fromiter(case_weights.keys(), dtype=np.int64, count=len(case_weights)))
+        weights.append(np.fromiter(case_weights.values(), dtype=np.float32, count=len(case_weights)))
+
+    size = len(case_ids)
+    doc = np.concatenate(docs) if docs else np.zeros(0, dtype=np.int32)
+    term = np.concatenate(terms) if terms else np.zeros(0, dtype=np.int64)
+    weight = np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32)
+
+    document_frequency = np.bincount(term, minlength=DIMENSIONS)
+    idf = np.log((1.0 + size) / (1.0 + document_frequency)).astype(np.float32) + 1.0
+    weight *= idf[term]
+    norms = np.sqrt(np.bincount(doc, weights=weight.astype(np.float64) ** 2, minlength=size))
+    weight /= np.maximum(norms[doc], 1e-12).astype(np.float32)
+
+    order = np.argsort(term, kind="stable")
+    term_ptr = np.zeros(DIMENSIONS + 1, dtype=np.int64)
+    np.cumsum(document_frequency, out=term_ptr[1:])
+    arrays = {
+        "term_ptr": term_ptr,
+        "postings_doc": doc[order],
+        "postings_weight": weight[order],
+        "idf": idf,
+        "case_ids": np.array(case_ids, dtype=np.int64),
+        "jurisdiction_ids": np.array(jurisdiction_ids, dtype=np.int64),
+    }
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    target = os.path.join(directory, version)
+    os.makedirs(target)
+    for name, array in arrays.items():
+        np.save(os.path.join(target, f"{name}.npy"), array)
+    meta = {"version": version, "cases": size, "postings": int(len(doc)), "dimensions": DIMENSIONS, "built_at": time.time()}
+    pointer = os.path.join(directory, POINTER)
+    with open(pointer + ".tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(pointer + ".tmp", pointer)
+    _prune(directory, keep=version)
+    return meta
+
+
+def _prune(directory: str, keep: str) -> None:
+    versions = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+    # Workers that still map an older version keep their open files; unlinking is safe.
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != keep:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+class IndexNotBuilt(Exception):
+    pass
+
+
+class SearchIndex:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta: Optional[Dict[str, Any]] = None
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._pointer_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> Dict[str, np.ndarray]:
+        pointer = os.path.join(self.directory, POINTER)
+        try:
+            mtime = os.stat(pointer).st_mtime
+        except FileNotFoundError:
+            raise IndexNotBuilt("The search index has not been built; run `python -m app.cli build-search-index`.")
+        if mtime != self._pointer_mtime:
+            with self._lock:
+                if mtime != self._pointer_mtime:
+                    with open(pointer) as f:
+                        meta = json.load(f)
+                    target = os.path.join(self.directory, meta["version"])
+                    self._arrays = {
+                        name: np.load(os.path.join(target, f"{name}.npy"), mmap_mode="r") for name in ARRAYS
+                    }
+                    self.meta, self._pointer_mtime = meta, mtime
+        return self._arrays
+
+    def search(
+        self,
+        text: str,
+        limit: int = 10,
+        *,
+        jurisdiction_id: Optional[int] = None,
+        case_ids: Optional[Iterable[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Case ids and cosine scores for ``text``, best first. ``case_ids``
+        restricts results to those cases (e.g. the members of a taxonomy term).
+        """
+        arrays = self._current()
+        query = features(text)
+        if not query or not len(arrays["case_ids"]):
+            return []
+        terms = np.fromiter(query.keys(), dtype=np.int64, count=len(query))
+        query_weights = np.fromiter(_weights(query).values(), dtype=np.float32, count=len(query))
+        query_weights *= arrays["idf"][terms]
+        query_weights /= np.linalg.norm(query_weights)
+
+        term_ptr = arrays["term_ptr"]
+        starts, ends = term_ptr[terms], term_ptr[terms + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return []
+        positions = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends) if end > start])
+        contributions = arrays["postings_weight"][positions] * np.repeat(query_weights, lengths)
+        scores = np.bincount(arrays["postings_doc"][positions], weights=contributions, minlength=len(arrays["case_ids"]))
+
+        if jurisdiction_id is not None:
+            scores[arrays["jurisdiction_ids"] != jurisdiction_id] = 0.0
+        if case_ids is not None:
+            scores[~np.isin(arrays["case_ids"], np.fromiter(case_ids, dtype=np.int64))] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            {"case_id": int(arrays["case_ids"][row]), "score": round(float(scores[row]), 4)}
+            for row in candidates
+        ]
+
+
+def filter_case_ids(db: Session, **term_ids: Optional[int]) -> Optional[Sequence[int]]:
+    """Cases linked to every given taxonomy term (``area_id=3, issue_id=7``), or None if none are given."""
+    tables = {
+        "area_id": models.case_areas,
+        "issue_id": models.case_issues,
+        "cause_id": models.case_causes,
+        "algorithm_id": models.case_algorithms,
+        "organization_id": models.case_organizations,
+    }
+    allowed: Optional[set] = None
+    for column, term_id in term_ids.items():
+        if term_id is None:
+            continue
+        table = tables[column]
+        members = set(db.scalars(select(table.c.case_id).where(table.c[column] == term_id)))
+        allowed = members if allowed is None else allowed & members
+    return sorted(allowed) if allowed is not None else None
+
+
+index = SearchIndex(settings.SEARCH_INDEX_DIR)
@@ -0,0 +1,285 @@
+"""
+Similar cases by taxonomy overlap.
+
+Every case becomes a vector over the taxonomy terms linked through
+``case_areas``, ``case_issues``, ``case_causes``, ``case_algorithms`` and
+``case_organizations``. Terms are weighted by inverse document frequency,
+so sharing a rare algorithm counts for more than sharing a common issue,
+and vectors are L2-normalised so a dot product is their cosine similarity.
+
+The ``SIMILARITY_TOP_K`` nearest neighbours of every case are computed
+once, in row blocks, and kept in NumPy arrays; a lookup is a dictionary
+hit and a slice. Writes to cases and their taxonomy links (API or, with
+the change listener, any client) mark cases dirty through
+``crud.case_change_hooks``; writes to dockets, documents and sources do
+not touch the vectors and are ignored. The next lookup starts a
+background refresh that reloads only the dirty cases and recomputes the
+neighbour lists they can affect, on copies of the arrays, then swaps the
+result in. Lookups keep answering from the previous build meanwhile and
+never wait for a refresh; only the first lookup in a process waits for
+the initial build. Term weights are fixed until the next full build,
+which happens when unknown terms appear, many cases change at once, or
+the changed cases are not known.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud import crud
+from app.models import models
+
+TAXONOMIES = (
+    ("areas", models.case_areas.c.area_id),
+    ("issues", models.case_issues.c.issue_id),
+    ("causes", models.case_causes.c.cause_id),
+    ("algorithms", models.case_algorithms.c.algorithm_id),
+    ("organizations", models.case_organizations.c.organization_id),
+)
+
+logger = logging.getLogger(__name__)
+
+BLOCK_ROWS = 1024
+# Above this share of changed cases a full build is cheaper than patching.
+REBUILD_FRACTION = 0.1
+
+Feature = Tuple[str, int]
+
+
+def _memberships(db: Session, case_ids: Optional[Sequence[int]] = None) -> Dict[int, Set[Feature]]:
+    terms: Dict[int, Set[Feature]] = {}
+    for name, column in TAXONOMIES:
+        case_id = column.table.c.case_id
+        query = select(case_id, column)
+        if case_ids is not None:
+            query = query.where(case_id.in_(case_ids))
+        for owner, term in db.execute(query):
+            terms.setdefault(owner, set()).add((name, term))
+    return terms
+
+
+def _cases(db: Session, case_ids: Optional[Sequence[int]] = None) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+    query = select(models.Case.case_id, models.Case.slug, models.Case.caption)
+    if case_ids is not None:
+        query = query.where(models.Case.case_id.in_(case_ids))
+    return {case_id: (slug, caption) for case_id, slug, caption in db.execute(query)}
+
+
+class _Build:
+    """The arrays of one build. Published builds are never modified; refreshes patch a copy."""
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self.case_ids = np.zeros(0, dtype=np.int64)
+        self.rows: Dict[int, int] = {}
+        self.meta: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        self.features: Dict[Feature, int] = {}
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.neighbors = np.zeros((0, 0), dtype=np.int32)
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+
+    def copy(self) -> "_Build":
+        other = _Build(self.top_k)
+        other.case_ids = self.case_ids.copy()
+        other.rows = dict(self.rows)
+        other.meta = dict(self.meta)
+        # Term weights only change in a full build, so they are shared.
+        other.features = self.features
+        other.weights = self.weights
+        other.vectors = self.vectors.copy()
+        other.neighbors = self.neighbors.copy()
+        other.scores = self.scores.copy()
+        return other
+
+    def build(self, db: Session) -> None:
+        self.meta = _cases(db)
+        terms = _memberships(db)
+        self.case_ids = np.array(sorted(self.meta), dtype=np.int64)
+        self.rows = {int(case_id): row for row, case_id in enumerate(self.case_ids)}
+        self.features = {feature: column for column, feature in enumerate(sorted(set().union(*terms.values())))}
+
+        counts = np.zeros((len(self.case_ids), len(self.features)), dtype=np.float32)
+        for case_id, case_terms in terms.items():
+            row = self.rows.get(case_id)
+            if row is not None:
+                counts[row, [self.features[feature] for feature in case_terms]] = 1.0
+        document_frequency = counts.sum(axis=0)
+        self.weights = np.log1p(len(self.case_ids) / np.maximum(document_frequency, 1.0)).astype(np.float32)
+        self.vectors = self._normalise(counts * self.weights)
+
+        size = len(self.case_ids)
+        self.neighbors = np.full((size, self.top_k), -1, dtype=np.int32)
+        self.scores = np.zeros((size, self.top_k), dtype=np.float32)
+        for start in range(0, size, BLOCK_ROWS):
+            self._rank(np.arange(start, min(start + BLOCK_ROWS, size)))
+
+    def update(self, db: Session, dirty: Set[int]) -> bool:
+        """Patch the index for ``dirty`` cases; False if a full build is needed instead."""
+        ids = sorted(dirty)
+        meta = _cases(db, ids)
+        terms = _memberships(db, ids)
+        if any(feature not in self.features for case_terms in terms.values() for feature in case_terms):
+            return False
+
+        new = [case_id for case_id in ids if case_id in meta and case_id not in self.rows]
+        if new:
+            start = len(self.case_ids)
+            self.case_ids = np.concatenate([self.case_ids, np.array(new, dtype=np.int64)])
+            self.rows.update({case_id: start + offset for offset, case_id in enumerate(new)})
+            self.vectors = np.vstack([self.vectors, np.zeros((len(new), len(self.features)), dtype=np.float32)])
+            self.neighbors = np.vstack([self.neighbors, np.full((len(new), self.top_k), -1, dtype=np.int32)])
+            self.scores = np.vstack([self.scores, np.zeros((len(new), self.top_k), dtype=np.float32)])
+
+        changed = []
+        for case_id in ids:
+            row = self.rows.get(case_id)
+            if row is None:
+                continue
+            vector = np.zeros(len(self.features), dtype=np.float32)
+            if case_id in meta:
+                self.meta[case_id] = meta[case_id]
+                columns = [self.features[feature] for feature in terms.get(case_id, ())]
+                vector[columns] = self.weights[columns]
+            else:
+                # Deleted: a zero vector drops out of every neighbour list on re-ranking.
+                del self.rows[case_id]
+                self.meta.pop(case_id, None)
+            self.vectors[row] = self._normalise(vector[None, :])[0]
+            changed.append(row)
+        if not changed:
+            return True
+
+        changed_rows = np.array(changed)
+        # Re-rank rows that listed a changed case, or that a changed case now beats.
+        affected = np.isin(self.neighbors, changed_rows).any(axis=1)
+        similarity = self.vectors[changed_rows] @ self.vectors.T
+        affected |= (similarity > self.scores[:, -1]).any(axis=0)
+        affected[changed_rows] = True
+        rows = np.flatnonzero(affected)
+        for start in range(0, len(rows), BLOCK_ROWS):
+            self._rank(rows[start:start + BLOCK_ROWS])
+        return True
+
+    def _rank(self, rows: np.ndarray) -> None:
+        similarity = self.vectors[rows] @ self.vectors.T
+        similarity[np.arange(len(rows)), rows] = 0.0
+        k = min(self.top_k, similarity.shape[1])
+        if k == 0:
+            return
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        neighbors = np.full((len(rows), self.top_k), -1, dtype=np.int32)
+        scores = np.zeros((len(rows), self.top_k), dtype=np.float32)
+        neighbors[:, :k] = np.where(top_scores > 0, top, -1)
+        scores[:, :k] = np.where(top_scores > 0, top_scores, 0.0)
+        self.neighbors[rows] = neighbors
+        self.scores[rows] = scores
+
+    @staticmethod
+    def _normalise(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SimilarityIndex:
+    def __init__(self, top_k: int = 50, sessions: Callable[[], Session] = SessionLocal):
+        self.top_k = top_k
+        self.sessions = sessions
+        # Guards the dirty state and the refresh thread; never held while computing.
+        self._lock = threading.Lock()
+        # One build or refresh at a time.
+        self._build_lock = threading.Lock()
+        self._stale = True
+        self._dirty: Set[int] = set()
+        self._current: Optional[_Build] = None
+        self._refresher: Optional[threading.Thread] = None
+
+    def mark_dirty(self, case_ids: Optional[Sequence[Any]] = None) -> None:
+        """Record changed cases; ``None`` means unknown, so the next refresh rebuilds."""
+        with self._lock:
+            if case_ids is None:
+                self._stale = True
+            else:
+                self._dirty.update(int(case_id) for case_id in case_ids)
+
+    def similar(self, db: Session, case_id: int, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Up to ``limit`` most similar cases, best first; None if the case does not exist."""
+        current = self._current
+        if current is None:
+            current = self._initial(db)
+        else:
+            self._schedule()
+        row = current.rows.get(case_id)
+        if row is None:
+            # Created after this build: no neighbours until the refresh lands.
+            return [] if db.get(models.Case, case_id) is not None else None
+        results = []
+        for neighbor, score in zip(current.neighbors[row, :limit], current.scores[row, :limit]):
+            if neighbor < 0:
+                break
+            other = int(current.case_ids[neighbor])
+            slug, caption = current.meta[other]
+            results.append({"case_id": other, "slug": slug, "caption": caption, "score": round(float(score), 4)})
+        return results
+
+    def _take(self) -> Tuple[bool, Set[int]]:
+        with self._lock:
+            stale, dirty = self._stale, self._dirty
+            self._stale, self._dirty = False, set()
+        return stale, dirty
+
+    def _initial(self, db: Session) -> _Build:
+        with self._build_lock:
+            if self._current is None:
+                # Taken before reading, so changes made during the build stay pending.
+                self._take()
+                build = _Build(self.top_k)
+                build.build(db)
+                self._current = build
+            return self._current
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if not (self._stale or self._dirty):
+                return
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher = threading.Thread(target=self._refresh, name="similarity-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh(self) -> None:
+        """Apply pending changes until there are none, publishing a new build each time."""
+        while True:
+            stale, dirty = self._take()
+            if not stale and not dirty:
+                return
+            try:
+                with self._build_lock, self.sessions() as db:
+                    current = self._current
+                    build = None
+                    if not stale and len(dirty) <= REBUILD_FRACTION * max(len(current.rows), 1):
+                        build = current.copy()
+                        if not build.update(db, dirty):
+                            build = None
+                    if build is None:
+                        build = _Build(self.top_k)
+                        build.build(db)
+                    self._current = build
+            except Exception:
+                logger.exception("Refreshing the similarity index failed; the next lookup retries")
+                self.mark_dirty(None)
+                return
+
+
+index = SimilarityIndex(top_k=settings.SIMILARITY_TOP_K)
+crud.case_change_hooks.append(index.mark_dirty)
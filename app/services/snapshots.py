@@ -0,0 +1,261 @@
+"""
+Columnar snapshots of the database for bulk consumers.
+
+``build`` writes one Parquet file per table plus ``cases_flat``: cases
+with their jurisdiction and taxonomy names as list columns, ready for
+``pandas.read_parquet``. Rows are read through server-side cursors and
+written ``SNAPSHOT_BATCH_ROWS`` at a time, so memory stays bounded by the
+batch size. Every table is read in one REPEATABLE READ transaction, so
+the files agree with each other.
+
+A snapshot records the change-feed horizon it was taken at (see
+``app.services.changes``). The next build only queries rows stamped at or
+after that horizon: it copies the previous file without the changed and
+deleted rows, then appends the changed rows. Unchanged tables are
+hard-linked from the previous version. ``cases_flat`` is rebuilt in full
+when a jurisdiction or taxonomy term changes, since that renames labels
+on cases that were not themselves restamped, and any table whose columns
+changed since the previous snapshot is rebuilt in full.
+
+Versions are published like the search index: a new directory under
+``SNAPSHOT_DIR`` and an atomic replace of ``current.json``. Building needs
+``pyarrow`` (listed in requirements.txt); serving the files does not.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import models  # noqa: F401  (registers tables on Base.metadata)
+from app.services.changes import TABLES
+
+POINTER = "current.json"
+KEEP_VERSIONS = 2
+MEDIA_TYPE = "application/vnd.apache.parquet"
+FLAT_TABLE = "cases_flat"
+
+# List column -> (link table, taxonomy table, shared column)
+FLAT_LISTS = {
+    "areas": ("case_areas", "areas_of_application", "area_id"),
+    "issues": ("case_issues", "issues", "issue_id"),
+    "causes": ("case_causes", "causes_of_action", "cause_id"),
+    "algorithms": ("case_algorithms", "algorithms", "algorithm_id"),
+    "organizations": ("case_organizations", "organizations", "organization_id"),
+}
+FLAT_JURISDICTION = ("jurisdiction_name", "jurisdiction_type", "court_name")
+# Tables whose changes relabel cases_flat rows without restamping the case.
+FLAT_LABEL_TABLES = {"jurisdictions"} | {taxonomy for _, taxonomy, _ in FLAT_LISTS.values()}
+
+_SINCE = "change_xid >= CAST(:horizon AS xid8)"
+
+
+class Source:
+    """How to read one snapshot table: the base table it follows and its SELECT."""
+
+    def __init__(self, name: str, table: str, pk: str, schema: Any, select: str, alias: str):
+        self.name = name
+        self.table = table
+        self.pk = pk
+        self.schema = schema
+        self._select = select
+        self._alias = alias
+
+    def query(self, changed_only: bool) -> str:
+        where = f"WHERE {self._alias}.{_SINCE} " if changed_only else ""
+        return f"{self._select} {where}ORDER BY {self._alias}.{self.pk}"
+
+
+def _arrow_type(pa, column_type) -> Any:
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _sources(pa) -> List[Source]:
+    updated_at = pa.field("updated_at", pa.timestamp("us", tz="UTC"))
+    sources = []
+    for name, pk in TABLES.items():
+        columns = Base.metadata.tables[name].columns
+        schema = pa.schema([pa.field(c.name, _arrow_type(pa, c.type)) for c in columns] + [updated_at])
+        select = f"SELECT {', '.join('t.' + c.name for c in columns)}, t.updated_at FROM {name} t"
+        sources.append(Source(name, name, pk, schema, select, "t"))
+
+    case_columns = Base.metadata.tables["cases"].columns
+    fields = [pa.field(c.name, _arrow_type(pa, c.type)) for c in case_columns] + [updated_at]
+    fields += [pa.field(column, pa.string()) for column in FLAT_JURISDICTION]
+    fields += [pa.field(column, pa.list_(pa.string())) for column in FLAT_LISTS]
+    lists = [
+        f"ARRAY(SELECT x.name FROM {link} l JOIN {taxonomy} x ON x.{column} = l.{column} "
+        f"WHERE l.case_id = c.case_id ORDER BY x.name) AS {name}"
+        for name, (link, taxonomy, column) in FLAT_LISTS.items()
+    ]
+    select = (
+        f"SELECT {', '.join('c.' + c.name for c in case_columns)}, c.updated_at, "
+        f"{', '.join('j.' + column for column in FLAT_JURISDICTION)}, {', '.join(lists)} "
+        "FROM cases c LEFT JOIN jurisdictions j ON j.jurisdiction_id = c.jurisdiction_id"
+    )
+    sources.append(Source(FLAT_TABLE, "cases", "case_id", pa.schema(fields), select, "c"))
+    return sources
+
+
+def read_manifest(directory: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The published snapshot's manifest, or None if nothing has been built yet."""
+    directory = directory or settings.SNAPSHOT_DIR
+    try:
+        with open(os.path.join(directory, POINTER)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def path(manifest: Dict[str, Any], table: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or settings.SNAPSHOT_DIR, manifest["version"], f"{table}.parquet")
+
+
+def build(
+    db: Session,
+    directory: Optional[str] = None,
+    *,
+    full: bool = False,
+    batch_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Write a new snapshot version, incrementally from the last one unless ``full``, and publish it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Snapshots require the 'pyarrow' package") from e
+
+    directory = directory or settings.SNAPSHOT_DIR
+    batch_rows = batch_rows or settings.SNAPSHOT_BATCH_ROWS
+    previous = None if full else read_manifest(directory)
+
+    # Must be the session's first statement: it fixes the snapshot every table is read from.
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    horizon = db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")).scalar()
+    changed = _changed_tables(db, previous["horizon"]) if previous else set()
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    target = os.path.join(directory, version)
+    os.makedirs(target)
+    tables: Dict[str, Dict[str, Any]] = {}
+    try:
+        for source in _sources(pa):
+            destination = os.path.join(target, f"{source.name}.parquet")
+            old = path(previous, source.name, directory) if previous else None
+            if (
+                old is None or not os.path.exists(old)
+                or (source.name == FLAT_TABLE and changed & FLAT_LABEL_TABLES)
+                # Columns added or changed since: old rows cannot be reused.
+                or not pq.read_schema(old).equals(source.schema)
+            ):
+                rows = _write(pq, destination, source.schema, _fetch(pa, db, source, None, batch_rows))
+                mode = "full"
+            elif source.table not in changed:
+                _link(old, destination)
+                rows, mode = previous["tables"][source.name]["rows"], "unchanged"
+            else:
+                replaced = pa.array(sorted(_changed_ids(db, source, previous["horizon"])), type=pa.int64())
+                batches = itertools.chain(
+                    _kept(pq, old, source.pk, replaced, batch_rows),
+                    _fetch(pa, db, source, previous["horizon"], batch_rows),
+                )
+                rows = _write(pq, destination, source.schema, batches)
+                mode = "incremental"
+            tables[source.name] = {"rows": rows, "bytes": os.path.getsize(destination), "build": mode}
+    except BaseException:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+    finally:
+        db.rollback()
+
+    manifest = {"version": version, "horizon": horizon, "built_at": time.time(), "tables": tables}
+    with open(os.path.join(target, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+    pointer = os.path.join(directory, POINTER)
+    with open(pointer + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(pointer + ".tmp", pointer)
+    _prune(directory, keep=version)
+    return manifest
+
+
+def _changed_tables(db: Session, horizon: str) -> Set[str]:
+    """Base tables with a row stamped or deleted at or after ``horizon``."""
+    changed = set(db.execute(
+        text(f"SELECT DISTINCT table_name FROM change_tombstones WHERE {_SINCE}"), {"horizon": horizon}
+    ).scalars())
+    for table in TABLES:
+        if db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {_SINCE})"), {"horizon": horizon}).scalar():
+            changed.add(table)
+    return changed
+
+
+def _changed_ids(db: Session, source: Source, horizon: str) -> Set[int]:
+    """Primary keys to drop from the previous file: rows changed or deleted since ``horizon``."""
+    return set(db.execute(
+        text(
+            f"SELECT {source.pk} FROM {source.table} WHERE {_SINCE} "
+            f"UNION SELECT pk FROM change_tombstones WHERE table_name = :table AND {_SINCE}"
+        ),
+        {"horizon": horizon, "table": source.table},
+    ).scalars())
+
+
+def _fetch(pa, db: Session, source: Source, since: Optional[str], batch_rows: int) -> Iterator[Any]:
+    # yield_per streams through a server-side cursor.
+    statement = text(source.query(changed_only=since is not None)).execution_options(yield_per=batch_rows)
+    result = db.execute(statement, {"horizon": since} if since is not None else {})
+    for rows in result.partitions():
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, source.schema)],
+            schema=source.schema,
+        )
+
+
+def _kept(pq, old: str, pk: str, replaced: Any, batch_rows: int) -> Iterator[Any]:
+    import pyarrow.compute as pc
+
+    for batch in pq.ParquetFile(old).iter_batches(batch_size=batch_rows):
+        yield batch.filter(pc.invert(pc.is_in(batch.column(pk), value_set=replaced)))
+
+
+def _write(pq, destination: str, schema: Any, batches: Iterator[Any]) -> int:
+    rows = 0
+    with pq.ParquetWriter(destination, schema, compression="zstd") as writer:
+        for batch in batches:
+            if batch.num_rows:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+def _link(source: str, destination: str) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _prune(directory: str, keep: str) -> None:
+    versions = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+    # Downloads still reading an older version keep their open files; unlinking is safe.
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != keep:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
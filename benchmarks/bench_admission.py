@@ -0,0 +1,95 @@
+"""
+Admission control benchmark.
+
+Runs a storm of slow search requests alongside cheap case lookups against
+an in-process app whose routes hold a simulated connection pool
+(``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW`` slots) for a fixed time, with and
+without ``AdmissionMiddleware``. Reports cheap-read latency percentiles
+and how many searches were shed. No database is needed.
+
+    python -m benchmarks.bench_admission [--heavy-clients 40] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import admission
+from app.core.config import settings
+
+
+def make_app(pool_slots: int, heavy_seconds: float, cheap_seconds: float, admitted: bool) -> Starlette:
+    pool = asyncio.Semaphore(pool_slots)
+
+    def handler(seconds: float):
+        async def endpoint(request):
+            async with pool:
+                await asyncio.sleep(seconds)
+            return JSONResponse({"ok": True})
+        return endpoint
+
+    app = Starlette(routes=[
+        Route(f"{settings.API_V1_STR}/cases/search/", handler(heavy_seconds)),
+        Route(f"{settings.API_V1_STR}/cases/{{id}}", handler(cheap_seconds)),
+    ])
+    if admitted:
+        app.add_middleware(admission.AdmissionMiddleware, controller=admission.from_settings(settings))
+    return app
+
+
+async def run(app: Starlette, heavy_clients: int, cheap_clients: int, seconds: float) -> Dict[str, object]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def heavy():
+            while time.perf_counter() < deadline:
+                response = await client.get(f"{settings.API_V1_STR}/cases/search/")
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 503:
+                    await asyncio.sleep(0.05)
+
+        async def cheap():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                await client.get(f"{settings.API_V1_STR}/cases/1")
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*[heavy() for _ in range(heavy_clients)], *[cheap() for _ in range(cheap_clients)])
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3  # noqa: E731
+    return {"reads": len(latencies), "p50": pick(0.5), "p99": pick(0.99), "max": latencies[-1] * 1e3, "heavy": statuses}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--heavy-clients", type=int, default=40)
+    parser.add_argument("--cheap-clients", type=int, default=4)
+    parser.add_argument("--heavy-ms", type=float, default=200.0)
+    parser.add_argument("--cheap-ms", type=float, default=2.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    slots = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    print(f"pool slots: {slots}, heavy limit: {settings.ADMISSION_HEAVY_LIMIT}, default limit: {settings.ADMISSION_DEFAULT_LIMIT}")
+    print(f"{'admission':<11}{'reads':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}  searches by status")
+    for admitted in (False, True):
+        app = make_app(slots, args.heavy_ms / 1e3, args.cheap_ms / 1e3, admitted)
+        result = asyncio.run(run(app, args.heavy_clients, args.cheap_clients, args.seconds))
+        print(
+            f"{'on' if admitted else 'off':<11}{result['reads']:>7}{result['p50']:>9.1f}{result['p99']:>9.1f}"
+            f"{result['max']:>9.1f}  {result['heavy']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
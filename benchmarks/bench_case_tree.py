@@ -0,0 +1,82 @@
+"""
+Case tree benchmark.
+
+Compares building a case's JSON the way ``GET /cases/{id}`` does on a cache
+miss (load through the ORM, lazy-load its relationships, serialize with
+pydantic) with ``case_tree``, where Postgres builds the JSON in one query.
+Runs against the configured database (Postgres, with data loaded), single
+cases and batches alike, on a fresh session per call. Reports latency,
+statements per call and response size.
+
+    python -m benchmarks.bench_case_tree [--calls 200] [--batch 50]
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from sqlalchemy import event, select
+
+from app.core.database import SessionLocal, engine
+from app.core.serialization import dump_json
+from app.crud import crud
+from app.models import models
+from app.schemas import schemas
+from app.services import case_tree
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+    if engine.dialect.name != "postgresql":
+        parser.error("case trees are built by Postgres; point SQLALCHEMY_DATABASE_URI at it")
+
+    with SessionLocal() as db:
+        ids: List[int] = db.scalars(select(models.Case.case_id).order_by(models.Case.case_id)).all()
+    if not ids:
+        parser.error("no cases loaded")
+
+    statements = [0]
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.__setitem__(0, statements[0] + 1))
+
+    def batch(i: int) -> List[int]:
+        return [ids[(i * args.batch + j) % len(ids)] for j in range(args.batch)]
+
+    def orm_one(db, i):
+        return dump_json(schemas.Case, crud.case.get(db, ids[i % len(ids)]))
+
+    def orm_batch(db, i):
+        keys = batch(i)
+        return dump_json(List[schemas.BatchItem[schemas.Case]], crud.as_batch(keys, crud.case.get_by_ids(db, keys)))
+
+    rows = {
+        "one case": (orm_one, lambda db, i: case_tree.tree(db, ids[i % len(ids)])),
+        f"batch of {args.batch}": (orm_batch, lambda db, i: case_tree.trees(db, batch(i))),
+    }
+
+    def timed(fn: Callable) -> tuple:
+        with SessionLocal() as db:
+            fn(db, 0)
+        statements[0], size = 0, 0
+        started = time.perf_counter()
+        for i in range(args.calls):
+            with SessionLocal() as db:
+                size += len(fn(db, i))
+        elapsed = time.perf_counter() - started
+        return elapsed / args.calls * 1e3, statements[0] / args.calls, size / args.calls
+
+    print(f"{len(ids)} cases, {args.calls} calls each")
+    print(f"{'request':<14}{'orm ms':>9}{'stmts':>8}{'tree ms':>9}{'stmts':>8}{'speedup':>9}{'orm KB':>9}{'tree KB':>9}")
+    for name, (orm, tree) in rows.items():
+        orm_ms, orm_stmts, orm_size = timed(orm)
+        tree_ms, tree_stmts, tree_size = timed(tree)
+        print(
+            f"{name:<14}{orm_ms:>9.2f}{orm_stmts:>8.1f}{tree_ms:>9.2f}{tree_stmts:>8.1f}{orm_ms / tree_ms:>8.1f}x"
+            f"{orm_size / 1024:>9.1f}{tree_size / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compression cost benchmark.
+
+Measures CPU time and bytes saved for each available encoding and level on
+a page of synthetic case JSON, as sent by the API. brotli and zstd rows
+appear only when the optional ``brotli`` / ``zstandard`` packages are installed.
+
+    python -m benchmarks.bench_compression [--cases 100] [--repeat 5]
+"""
+
+import argparse
+import time
+from typing import List
+
+from app.core import serialization
+from app.core.compression import BrotliEncoder, GzipEncoder, ZstdEncoder, available_encodings
+from app.schemas import schemas
+from benchmarks.bench_serialization import make_case
+
+LEVELS = {
+    "gzip": (GzipEncoder, [1, 6, 9]),
+    "br": (BrotliEncoder, [1, 4, 6, 11]),
+    "zstd": (ZstdEncoder, [1, 3, 9, 19]),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = serialization.dump_json(List[schemas.Case], [make_case(i) for i in range(args.cases)])
+    print(f"payload: {len(payload):,} bytes ({args.cases} cases)")
+    print(f"{'encoding':<10}{'level':>6}{'bytes':>12}{'ratio':>8}{'ms':>9}{'MB/s':>9}")
+    for encoding in available_encodings():
+        encoder_cls, levels = LEVELS[encoding]
+        for level in levels:
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                encoder = encoder_cls(level)
+                body = encoder.compress(payload) + encoder.finish()
+                best = min(best, time.perf_counter() - started)
+            mb_s = len(payload) / best / 1e6
+            print(f"{encoding:<10}{level:>6}{len(body):>12,}{len(payload) / len(body):>7.1f}x{best * 1e3:>9.2f}{mb_s:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+CRUD lookup microbenchmark.
+
+Times the per-call cost of ``CRUDBase.get``, ``get_multi`` and
+``CRUDCase.get_by_slug`` against the ``Query`` forms they replaced, on an
+in-memory SQLite database, so the numbers are dominated by statement
+construction rather than the database. The ``lambda`` column times the same
+lookups as ``lambda_stmt`` statements, which analyse their closure on every call. ``get`` is timed
+on a cold session (query by primary key) and on a warm one (identity-map hit).
+
+    python -m benchmarks.bench_crud [--calls 5000] [--cases 200]
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.crud import crud
+from app.models import models
+
+
+def timed(calls: int, fn: Callable[[int], object]) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--cases", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(models.Case(case_id=i, slug=f"case-{i}", caption=f"Case {i}") for i in range(1, args.cases + 1))
+        db.commit()
+
+    ids = lambda i: i % args.cases + 1  # noqa: E731
+    cold_db = Session(engine)
+    warm = Session(engine)
+    # The identity map holds objects weakly; keep them referenced.
+    loaded = crud.case.get_multi(warm, limit=None)  # noqa: F841
+
+    def cold(fn):
+        def run(i):
+            cold_db.expunge_all()
+            return fn(cold_db, i)
+        return run
+
+    def lambda_get(db, i):
+        case_id = ids(i)
+        return db.scalars(lambda_stmt(lambda: select(models.Case).where(models.Case.case_id == case_id))).first()
+
+    def lambda_multi(db, i):
+        skip = i % 50
+        return db.scalars(lambda_stmt(lambda: select(models.Case).offset(skip).limit(3))).all()
+
+    def lambda_slug(db, i):
+        slug = f"case-{ids(i)}"
+        return db.scalars(lambda_stmt(lambda: select(models.Case).where(models.Case.slug == slug))).first()
+
+    # name -> (Query, lambda_stmt, crud)
+    rows = {
+        "get (cold)": (
+            cold(lambda db, i: db.query(models.Case).filter(models.Case.case_id == ids(i)).first()),
+            cold(lambda_get),
+            cold(lambda db, i: crud.case.get(db, ids(i))),
+        ),
+        "get (identity map)": (
+            lambda i: warm.query(models.Case).filter(models.Case.case_id == ids(i)).first(),
+            lambda i: lambda_get(warm, i),
+            lambda i: crud.case.get(warm, ids(i)),
+        ),
+        "get_multi": (
+            lambda i: warm.query(models.Case).offset(i % 50).limit(3).all(),
+            lambda i: lambda_multi(warm, i),
+            lambda i: crud.case.get_multi(warm, skip=i % 50, limit=3),
+        ),
+        "get_by_slug": (
+            lambda i: warm.query(models.Case).filter(models.Case.slug == f"case-{ids(i)}").first(),
+            lambda i: lambda_slug(warm, i),
+            lambda i: crud.case.get_by_slug(warm, f"case-{ids(i)}"),
+        ),
+    }
+    print(f"{'lookup':<22}{'query us':>10}{'lambda us':>11}{'crud us':>10}{'saved':>8}")
+    for name, paths in rows.items():
+        for path in paths:
+            path(0)
+        old, lam, new = (timed(args.calls, path) for path in paths)
+        print(f"{name:<22}{old:>10.1f}{lam:>11.1f}{new:>10.1f}{1 - new / old:>8.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Serialization microbenchmark.
+
+Compares FastAPI's standard response path (validate against the response
+model, dump to Python primitives, encode with ``json.dumps``) with the
+``app.core.serialization`` fast path (one validation, ``dump_json`` in
+pydantic-core) on synthetic case graphs. No database is needed.
+
+    python -m benchmarks.bench_serialization [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+
+from app.core import serialization
+from app.models import models
+from app.schemas import schemas
+
+LOREM = (
+    "The plaintiffs allege that the automated screening system disproportionately "
+    "rejected applicants over forty and that the vendor failed to validate the model. "
+)
+
+
+def make_case(case_id: int) -> models.Case:
+    jurisdiction = models.Jurisdiction(
+        jurisdiction_id=case_id % 7, court_name="N.D. Cal.",
+        jurisdiction_type="U.S. Federal", jurisdiction_name="California",
+    )
+    dockets = []
+    for d in range(2):
+        docket_id = case_id * 10 + d
+        documents = [
+            models.Document(
+                document_id=docket_id * 10 + n, docket_id=docket_id, document_type="Complaint",
+                filing_date=date(2023, 1, 1) + timedelta(days=n), link="https://example.org/doc.pdf",
+                citation=f"{n} F.4th {case_id}",
+            )
+            for n in range(4)
+        ]
+        dockets.append(models.Docket(
+            docket_id=docket_id, case_id=case_id, court="N.D. Cal.",
+            docket_number=f"3:23-cv-{case_id:05d}", link="https://example.org/docket", documents=documents,
+        ))
+    return models.Case(
+        case_id=case_id, slug=f"case-{case_id}", record_number=case_id, caption=f"Doe v. Acme {case_id}",
+        brief_description=LOREM, filing_date=date(2023, 5, 1), status_disposition="Active",
+        published_opinion_flag=False, class_action_status="Putative", researcher="Staff",
+        summary_of_significance=LOREM * 2, summary_facts_activity=LOREM * 6,
+        most_recent_activity="Motion to dismiss denied.", most_recent_activity_date=date(2024, 2, 1),
+        date_added=date(2023, 6, 1), last_update=date(2024, 2, 2), jurisdiction_id=jurisdiction.jurisdiction_id,
+        jurisdiction=jurisdiction, dockets=dockets,
+        secondary_sources=[
+            models.SecondarySource(source_id=case_id * 10 + n, case_id=case_id, title="Coverage", link="https://news")
+            for n in range(3)
+        ],
+        areas=[models.AreaOfApplication(area_id=n, name=f"Area {n}") for n in range(3)],
+        issues=[models.Issue(issue_id=n, name=f"Issue {n}") for n in range(3)],
+        causes=[models.CauseOfAction(cause_id=n, name=f"Cause {n}") for n in range(2)],
+        algorithms=[models.Algorithm(algorithm_id=n, name=f"Algorithm {n}") for n in range(2)],
+        organizations=[models.Organization(organization_id=n, name=f"Org {n}") for n in range(2)],
+    )
+
+
+def standard_path(schema, content) -> bytes:
+    adapter = serialization.adapter(schema)
+    value = adapter.validate_python(content, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def fast_path(schema, content) -> bytes:
+    return serialization.dump_json(schema, content)
+
+
+def timeit(fn: Callable, repeat: int) -> float:
+    fn()  # warm adapters and caches
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("single case", schemas.Case, make_case(1)),
+        ("page of 100", List[schemas.Case], [make_case(i) for i in range(100)]),
+        ("export of 5000", List[schemas.Case], [make_case(i) for i in range(5000)]),
+    ]
+    print(f"{'scenario':<16}{'standard':>12}{'fast':>12}{'speedup':>10}{'bytes':>12}")
+    for name, schema, content in scenarios:
+        assert json.loads(standard_path(schema, content)) == json.loads(fast_path(schema, content))
+        standard = timeit(lambda: standard_path(schema, content), args.repeat)
+        fast = timeit(lambda: fast_path(schema, content), args.repeat)
+        size = len(fast_path(schema, content))
+        print(f"{name:<16}{standard * 1e3:>10.2f}ms{fast * 1e3:>10.2f}ms{standard / fast:>9.1f}x{size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
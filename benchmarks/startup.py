@@ -0,0 +1,65 @@
+"""
+Cold-start regression check.
+
+Imports ``app.main`` in a fresh interpreter, runs the lifespan startup
+(pool and cache warm-up) and compares the elapsed time with
+``STARTUP_BUDGET_SECONDS``. Exits non-zero when the budget is exceeded.
+
+    python -m benchmarks.startup [--runs 5] [--budget 2.0]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main as main
+imported = time.perf_counter()
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        return main.app.state.ready
+
+ready = asyncio.run(run())
+print(json.dumps({
+    "import": imported - started,
+    "startup": main.app.state.startup_seconds,
+    "ready": ready,
+}))
+"""
+
+
+def measure() -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=settings.STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    samples = [measure() for _ in range(args.runs)]
+    imports = [s["import"] for s in samples]
+    startups = [s["startup"] for s in samples]
+    print(f"import   median {statistics.median(imports):.3f}s  max {max(imports):.3f}s")
+    print(f"startup  median {statistics.median(startups):.3f}s  max {max(startups):.3f}s")
+    if not all(s["ready"] for s in samples):
+        print("warning: warm-up failed in at least one run (database unreachable?)")
+
+    if statistics.median(startups) > args.budget:
+        print(f"FAIL: median startup exceeds the {args.budget:.2f}s budget")
+        return 1
+    print(f"OK: within the {args.budget:.2f}s budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
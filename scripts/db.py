@@ -9,6 +9,7 @@ database connectivity across the ETL pipeline and API layer.
 """
 
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import psycopg2
 
@@ -32,4 +33,29 @@ def get_connection():
         host=os.getenv("PG_HOST"),
         port=os.getenv("PG_PORT"),
         sslmode="require"
-    )
\ No newline at end of file
+    )
+
+
+@contextmanager
+def connection_scope(conn=None):
+    """
+    Yield a connection for a loader.
+
+    If ``conn`` is given it is yielded as-is and the caller owns the
+    transaction. Otherwise a new connection is opened, committed on
+    success, rolled back on error and closed.
+    """
+
+    if conn is not None:
+        yield conn
+        return
+
+    conn = get_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
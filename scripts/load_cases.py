@@ -13,11 +13,77 @@ This module handles:
 """
 
 import pandas as pd
-from db import get_connection
-from utils import clean_df, parse_list
+
+from scripts.db import connection_scope
+from scripts.utils import (
+    CHUNK_SIZE, LoadReport, estimate_rows, explode_lists, insert_rows, iter_frames, records, values_sql
+)
+
+# (cases column, source column, dtype)
+CASE_COLUMNS = [
+    ("slug", "Case_snug", "string"),
+    ("record_number", "Record_Number", "Int64"),
+    ("caption", "Caption", "string"),
+    ("brief_description", "Brief_Description", "string"),
+    ("filing_date", "Date_Action_Filed", "date"),
+    ("status_disposition", "Status_Disposition", "category"),
+    ("published_opinion_flag", "Published_Opinions_binary", "boolean"),
+    ("class_action_status", "Class_Action_list", "category"),
+    ("researcher", "Researcher", "category"),
+    ("summary_of_significance", "Summary_of_Significance", "string"),
+    ("summary_facts_activity", "Summary_Facts_Activity_to_Date", "string"),
+    ("most_recent_activity", "Most_Recent_Activity", "string"),
+    ("most_recent_activity_date", "Most_Recent_Activity_Date", "date"),
+    ("date_added", "Date_Added", "date"),
+    ("last_update", "Last_Update", "date"),
+]
+
+JURISDICTION_COLUMNS = {
+    "Jurisdiction_Filed": "court_name",
+    "Jurisdiction_Type_Text": "jurisdiction_type",
+    "Jurisdiction_Name": "jurisdiction_name",
+}
+
+MULTI_MAP = {
+    "Area_of_Application_List": ("areas_of_application", "case_areas", "area_id"),
+    "Issue_List": ("issues", "case_issues", "issue_id"),
+    "Cause_of_Action_List": ("causes_of_action", "case_causes", "cause_id"),
+    "Name_of_Algorithm_List": ("algorithms", "case_algorithms", "algorithm_id"),
+    "Organizations_involved": ("organizations", "case_organizations", "organization_id"),
+}
+
+DTYPES = {
+    **{source: dtype for _, source, dtype in CASE_COLUMNS},
+    **{source: "category" for source in JURISDICTION_COLUMNS},
+    **{source: "string" for source in MULTI_MAP},
+}
+
+
+def fetch_record_map(conn):
+    """
+    Rebuild the record_number to case_id mapping from the database.
+
+    Used when dockets, documents or secondary sources are loaded
+    without loading cases in the same run.
+
+    Returns:
+        dict[int, int]: Mapping of record_number to case_id.
+    """
+
+    cur = conn.cursor()
+    cur.execute("SELECT record_number, case_id FROM cases WHERE record_number IS NOT NULL")
+    record_map = dict(cur.fetchall())
+    cur.close()
+    return record_map
 
 
-def load_cases():
+def load_cases(
+    path="data/case_table.xlsx",
+    sheet_name="Case_Table_2026-Feb-21_1952",
+    conn=None,
+    report=None,
+    chunk_size=CHUNK_SIZE,
+):
     """
     Load and normalize case records into the database.
 
@@ -28,146 +94,130 @@ def load_cases():
     - Reference entity insertion
     - Many-to-many bridge table population
 
+    Rows are streamed from the file and written ``chunk_size`` at a
+    time with multi-row statements, so memory use does not grow with
+    the size of the file.
+
+    Args:
+        path (str): Source ``.xlsx`` or ``.csv`` file.
+        sheet_name (str, optional): Worksheet to read.
+        conn: Open connection whose transaction the caller owns;
+            a new connection is opened and committed if omitted.
+        report (LoadReport, optional): Collects row counts and rejects.
+        chunk_size (int): Rows read and inserted per batch.
+
     Returns:
         dict[int, int]: Mapping of legacy record_number
         to newly created case_id.
     """
 
-    df = clean_df(
-        pd.read_excel(
-            "data/case_table.xlsx",
-            sheet_name="Case_Table_2026-Feb-21_1952"
-        )
-    )
-
-    conn = get_connection()
-    cur = conn.cursor()
+    report = report or LoadReport()
+    report.start(estimate_rows(path, sheet_name))
 
     record_to_case_id = {}
+    jurisdiction_ids = {}
 
-    for _, row in df.iterrows():
+    with connection_scope(conn) as conn:
+        cur = conn.cursor()
+        for frame in iter_frames(path, sheet_name, chunk_size, DTYPES):
+            _load_frame(cur, frame, report, jurisdiction_ids, record_to_case_id)
+        cur.close()
 
-        slug = row.get("Case_snug")
+    report.finish()
+    print("Cases loaded successfully.")
+    return record_to_case_id
+
+
+def _load_frame(cur, frame, report, jurisdiction_ids, record_to_case_id):
+    missing_slug = frame["Case_snug"].isna()
+    report.reject_many(frame.index[missing_slug], "missing Case_snug")
+    frame = frame[~missing_slug]
+
+    jurisdiction_columns = list(JURISDICTION_COLUMNS)
+    missing_jurisdiction = frame[jurisdiction_columns].isna().any(axis=1)
+    report.reject_many(frame.index[missing_jurisdiction], "missing jurisdiction fields")
+    frame = frame[~missing_jurisdiction]
+
+    frame["jurisdiction_id"] = _resolve_jurisdictions(cur, frame[jurisdiction_columns], jurisdiction_ids)
+    unresolved = frame["jurisdiction_id"].isna()
+    report.reject_many(frame.index[unresolved], "jurisdiction not found")
+    frame = frame[~unresolved]
+
+    if frame.empty:
+        return
+
+    frame["Published_Opinions_binary"] = frame["Published_Opinions_binary"].fillna(False)
+    insert_rows(
+        cur,
+        "cases",
+        [column for column, _, _ in CASE_COLUMNS] + ["jurisdiction_id"],
+        records(frame[[source for _, source, _ in CASE_COLUMNS] + ["jurisdiction_id"]]),
+        suffix="ON CONFLICT (slug) DO NOTHING",
+    )
 
-        if not slug:
-            continue
+    # Existing slugs are kept as-is, so look up ids for new and old rows alike.
+    cur.execute(
+        "SELECT slug, case_id FROM cases WHERE slug = ANY(%s)",
+        (frame["Case_snug"].unique().tolist(),),
+    )
+    frame["case_id"] = frame["Case_snug"].map(dict(cur.fetchall())).astype("Int64")
 
-        court_name = row.get("Jurisdiction_Filed")
-        jurisdiction_type = row.get("Jurisdiction_Type_Text")
-        jurisdiction_name = row.get("Jurisdiction_Name")
+    numbered = frame[frame["Record_Number"].notna()]
+    record_to_case_id.update(records(numbered[["Record_Number", "case_id"]]))
 
-        if not court_name or not jurisdiction_type or not jurisdiction_name:
-            continue
+    links = explode_lists(frame, list(MULTI_MAP))
+    links["case_id"] = frame["case_id"].reindex(links["row"]).to_numpy()
+
+    for col, group in links.groupby("column", sort=False):
+        ref_table, bridge_table, id_column = MULTI_MAP[col]
+
+        insert_rows(
+            cur, ref_table, ["name"], records(group[["value"]].drop_duplicates()),
+            suffix="ON CONFLICT (name) DO NOTHING",
+        )
 
-        cur.execute("""
-            INSERT INTO jurisdictions (court_name, jurisdiction_type, jurisdiction_name)
-            VALUES (%s, %s, %s)
+        placeholders, params = values_sql(records(group[["case_id", "value"]].drop_duplicates()))
+        cur.execute(f"""
+            INSERT INTO {bridge_table} (case_id, {id_column})
+            SELECT v.case_id, r.{id_column}
+            FROM (VALUES {placeholders}) AS v(case_id, name)
+            JOIN {ref_table} r ON r.name = v.name
             ON CONFLICT DO NOTHING
-        """, (
-            court_name,
-            jurisdiction_type,
-            jurisdiction_name
-        ))
-
-        cur.execute("""
-            SELECT jurisdiction_id FROM jurisdictions
-            WHERE court_name = %s
-              AND jurisdiction_type = %s
-              AND jurisdiction_name = %s
-        """, (
-            court_name,
-            jurisdiction_type,
-            jurisdiction_name
-        ))
-
-        jurisdiction_row = cur.fetchone()
-        if not jurisdiction_row:
-            continue
-
-        jurisdiction_id = jurisdiction_row[0]
-
-        slug = row.get("Case_snug")
-
-        cur.execute("""
-            INSERT INTO cases (
-                slug,
-                record_number,
-                caption,
-                brief_description,
-                filing_date,
-                status_disposition,
-                published_opinion_flag,
-                class_action_status,
-                researcher,
-                summary_of_significance,
-                summary_facts_activity,
-                most_recent_activity,
-                most_recent_activity_date,
-                date_added,
-                last_update,
-                jurisdiction_id
-            )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            ON CONFLICT (slug) DO NOTHING
-            RETURNING case_id
-        """, (
-            slug,
-            row.get("Record_Number"),
-            row.get("Caption"),
-            row.get("Brief_Description"),
-            row.get("Date_Action_Filed"),
-            row.get("Status_Disposition"),
-            bool(row.get("Published_Opinions_binary")),
-            row.get("Class_Action_list"),
-            row.get("Researcher"),
-            row.get("Summary_of_Significance"),
-            row.get("Summary_Facts_Activity_to_Date"),
-            row.get("Most_Recent_Activity"),
-            row.get("Most_Recent_Activity_Date"),
-            row.get("Date_Added"),
-            row.get("Last_Update"),
-            jurisdiction_id
-        ))
-
-        result = cur.fetchone()
-
-        if result:
-            case_id = result[0]
-        else:
-            cur.execute("SELECT case_id FROM cases WHERE slug = %s", (slug,))
-            case_id = cur.fetchone()[0]
-
-        record_to_case_id[row.get("Record_Number")] = case_id
-
-        multi_map = {
-            "Area_of_Application_List": ("areas_of_application", "case_areas", "area_id"),
-            "Issue_List": ("issues", "case_issues", "issue_id"),
-            "Cause_of_Action_List": ("causes_of_action", "case_causes", "cause_id"),
-            "Name_of_Algorithm_List": ("algorithms", "case_algorithms", "algorithm_id"),
-            "Organizations_involved": ("organizations", "case_organizations", "organization_id"),
-        }
-
-        for col, (ref_table, bridge_table, id_column) in multi_map.items():
-            values = parse_list(row.get(col))
-
-            for val in values:
-                cur.execute(f"""
-                    INSERT INTO {ref_table} (name)
-                    VALUES (%s)
-                    ON CONFLICT (name) DO NOTHING
-                """, (val,))
-
-                cur.execute(f"""
-                    INSERT INTO {bridge_table} (case_id, {id_column})
-                    SELECT %s, {id_column}
-                    FROM {ref_table}
-                    WHERE name = %s
-                    ON CONFLICT DO NOTHING
-                """, (case_id, val))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+        """, params)
 
-    print("Cases loaded successfully.")
-    return record_to_case_id
\ No newline at end of file
+    report.accept(len(frame))
+
+
+def _resolve_jurisdictions(cur, jurisdictions, jurisdiction_ids):
+    """
+    Insert unseen jurisdictions with one INSERT and one SELECT per
+    chunk, cache their ids in ``jurisdiction_ids`` and return the
+    jurisdiction_id of every row in ``jurisdictions``.
+    """
+
+    jurisdictions = jurisdictions.astype("string").rename(columns=JURISDICTION_COLUMNS)
+    keys = list(JURISDICTION_COLUMNS.values())
+    missing = [key for key in records(jurisdictions.drop_duplicates()) if key not in jurisdiction_ids]
+
+    if missing:
+        insert_rows(cur, "jurisdictions", keys, missing, suffix="ON CONFLICT DO NOTHING")
+
+        placeholders, params = values_sql(missing)
+        cur.execute(f"""
+            SELECT j.court_name, j.jurisdiction_type, j.jurisdiction_name, j.jurisdiction_id
+            FROM jurisdictions j
+            JOIN (VALUES {placeholders}) AS v(court_name, jurisdiction_type, jurisdiction_name)
+              ON j.court_name = v.court_name
+             AND j.jurisdiction_type = v.jurisdiction_type
+             AND j.jurisdiction_name = v.jurisdiction_name
+        """, params)
+
+        for court_name, jurisdiction_type, jurisdiction_name, jurisdiction_id in cur.fetchall():
+            jurisdiction_ids[(court_name, jurisdiction_type, jurisdiction_name)] = jurisdiction_id
+
+    lookup = pd.DataFrame(
+        [key + (jurisdiction_id,) for key, jurisdiction_id in jurisdiction_ids.items()],
+        columns=keys + ["jurisdiction_id"],
+    ).astype({key: "string" for key in keys})
+    matched = jurisdictions.merge(lookup, how="left", on=keys)
+    return matched["jurisdiction_id"].astype("Int64").to_numpy()
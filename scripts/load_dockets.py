@@ -5,43 +5,56 @@ Loads docket information and associates each docket
 with its corresponding case using foreign key relationships.
 """
 
-import pandas as pd
-from db import get_connection
-from utils import clean_df
-
-def load_dockets(record_map):
+from scripts.db import connection_scope
+from scripts.utils import CHUNK_SIZE, LoadReport, estimate_rows, insert_rows, iter_frames, records
+
+COLUMNS = {
+    "Case_Number": "Int64",
+    "court": "category",
+    "number": "string",
+    "link": "string",
+}
+
+
+def load_dockets(
+    record_map,
+    path="data/docket_table.xlsx",
+    sheet_name="Docket_Table",
+    conn=None,
+    report=None,
+    chunk_size=CHUNK_SIZE,
+):
     """
     Insert docket records linked to existing cases.
 
+    Rows are streamed from the file and inserted ``chunk_size`` at a
+    time, so memory use does not grow with the size of the file.
+
     Args:
         record_map (dict): Mapping of record_number to case_id.
+        path (str): Source ``.xlsx`` or ``.csv`` file.
+        sheet_name (str, optional): Worksheet to read.
+        conn: Open connection whose transaction the caller owns;
+            a new connection is opened and committed if omitted.
+        report (LoadReport, optional): Collects row counts and rejects.
+        chunk_size (int): Rows read and inserted per batch.
     """
 
-    df = clean_df(
-        pd.read_excel(
-            "data/docket_table.xlsx",
-            sheet_name="Docket_Table"
-        )
-    )
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    for _, row in df.iterrows():
-        case_id = record_map.get(row.get("Case_Number"))
-        if case_id:
-            cur.execute("""
-                INSERT INTO dockets (case_id, court, docket_number, link)
-                VALUES (%s,%s,%s,%s)
-            """, (
-                case_id,
-                row.get("court"),
-                row.get("number"),
-                row.get("link")
-            ))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    report = report or LoadReport()
+    report.start(estimate_rows(path, sheet_name))
+
+    with connection_scope(conn) as conn:
+        cur = conn.cursor()
+
+        for frame in iter_frames(path, sheet_name, chunk_size, COLUMNS):
+            frame["case_id"] = frame["Case_Number"].map(record_map).astype("Int64")
+            report.reject_many(frame.index[frame["case_id"].isna()], "unknown Case_Number")
+            frame = frame[frame["case_id"].notna()]
+
+            insert_rows(cur, "dockets", ["case_id", "court", "docket_number", "link"], records(frame[["case_id", "court", "number", "link"]]))
+            report.accept(len(frame))
+
+        cur.close()
 
+    report.finish()
     print("Dockets loaded")
\ No newline at end of file
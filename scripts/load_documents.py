@@ -6,51 +6,90 @@ their respective dockets to maintain hierarchical
 legal record structure.
 """
 
-import pandas as pd
-from db import get_connection
-from utils import clean_df
+from scripts.db import connection_scope
+from scripts.utils import CHUNK_SIZE, LoadReport, estimate_rows, insert_rows, iter_frames, records
 
-def load_documents(record_map):
+COLUMNS = {
+    "Case_Number": "Int64",
+    "document": "category",
+    "date": "date",
+    "link": "string",
+    "cite_or_reference": "string",
+}
+
+
+def load_documents(
+    record_map,
+    path="data/document_table.xlsx",
+    sheet_name="Document_Table",
+    conn=None,
+    report=None,
+    chunk_size=CHUNK_SIZE,
+):
     """
     Insert document records associated with dockets.
 
     Documents are linked via the first available docket
     for each case.
 
+    Rows are streamed from the file and inserted ``chunk_size`` at a
+    time, so memory use does not grow with the size of the file.
+
     Args:
         record_map (dict): Mapping of record_number to case_id.
+        path (str): Source ``.xlsx`` or ``.csv`` file.
+        sheet_name (str, optional): Worksheet to read.
+        conn: Open connection whose transaction the caller owns;
+            a new connection is opened and committed if omitted.
+        report (LoadReport, optional): Collects row counts and rejects.
+        chunk_size (int): Rows read and inserted per batch.
+    """
+
+    report = report or LoadReport()
+    report.start(estimate_rows(path, sheet_name))
+
+    with connection_scope(conn) as conn:
+        cur = conn.cursor()
+        first_docket = {}
+
+        for frame in iter_frames(path, sheet_name, chunk_size, COLUMNS):
+            frame["case_id"] = frame["Case_Number"].map(record_map).astype("Int64")
+            report.reject_many(frame.index[frame["case_id"].isna()], "unknown Case_Number")
+            frame = frame[frame["case_id"].notna()]
+
+            _fetch_first_dockets(cur, frame["case_id"].unique(), first_docket)
+            frame["docket_id"] = frame["case_id"].map(first_docket).astype("Int64")
+            report.reject_many(frame.index[frame["docket_id"].isna()], "case has no docket")
+            frame = frame[frame["docket_id"].notna()]
+
+            insert_rows(
+                cur,
+                "documents",
+                ["docket_id", "document_type", "filing_date", "link", "citation"],
+                records(frame[["docket_id", "document", "date", "link", "cite_or_reference"]]),
+            )
+            report.accept(len(frame))
+
+        cur.close()
+
+    report.finish()
+    print("Documents loaded")
+
+
+def _fetch_first_dockets(cur, case_ids, first_docket):
+    """
+    Add the first docket of each case in ``case_ids`` to ``first_docket``
+    with one query per chunk. Cases without a docket are cached as None.
     """
 
-    df = clean_df(
-        pd.read_excel(
-            "data/document_table.xlsx",
-            sheet_name="Document_Table"
-        )
-    )
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    for _, row in df.iterrows():
-        case_id = record_map.get(row.get("Case_Number"))
-        if case_id:
-            cur.execute("SELECT docket_id FROM dockets WHERE case_id = %s LIMIT 1", (case_id,))
-            result = cur.fetchone()
-            if result:
-                docket_id = result[0]
-                cur.execute("""
-                    INSERT INTO documents (docket_id, document_type, filing_date, link, citation)
-                    VALUES (%s,%s,%s,%s,%s)
-                """, (
-                    docket_id,
-                    row.get("document"),
-                    row.get("date"),
-                    row.get("link"),
-                    row.get("cite_or_reference")
-                ))
-
-    conn.commit()
-    cur.close()
-    conn.close()
-
-    print("Documents loaded")
\ No newline at end of file
+    case_ids = [int(case_id) for case_id in case_ids if case_id not in first_docket]
+    if not case_ids:
+        return
+    cur.execute("""
+        SELECT DISTINCT ON (case_id) case_id, docket_id
+        FROM dockets
+        WHERE case_id = ANY(%s)
+        ORDER BY case_id, docket_id
+    """, (case_ids,))
+    found = dict(cur.fetchall())
+    first_docket.update({case_id: found.get(case_id) for case_id in case_ids})
\ No newline at end of file
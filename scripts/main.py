@@ -8,10 +8,10 @@ in proper dependency order.
 Ensures foreign key integrity across the dataset.
 """
 
-from load_cases import load_cases
-from load_dockets import load_dockets
-from load_documents import load_documents
-from load_secondary import load_secondary
+from scripts.load_cases import load_cases
+from scripts.load_dockets import load_dockets
+from scripts.load_documents import load_documents
+from scripts.load_secondary import load_secondary
 
 def main():
     """
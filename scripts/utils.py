@@ -6,51 +6,284 @@ to normalize raw dataset inputs before inserting them
 into the relational database.
 """
 
+import os
+
 import pandas as pd
-import numpy as np
+from openpyxl import load_workbook
+
+
+CHUNK_SIZE = 1000
+
+
+def _is_csv(path):
+    return os.path.splitext(path)[1].lower() == ".csv"
 
-def clean_df(df):
+
+def estimate_rows(path, sheet_name=None):
+    """
+    Estimate the number of data rows without reading the table.
+
+    Uses the worksheet dimension recorded in the workbook, which may
+    include trailing blank rows. Returns None for CSV files.
+    """
+
+    if _is_csv(path):
+        return None
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+        return max((sheet.max_row or 1) - 1, 0)
+    finally:
+        workbook.close()
+
+
+def iter_frames(path, sheet_name=None, chunk_size=CHUNK_SIZE, dtypes=None):
+    """
+    Stream a source table as cleaned DataFrame chunks.
+
+    Workbooks are read with openpyxl in read-only mode and CSV files
+    with pandas in ``chunksize`` pieces, so memory use is bounded by
+    ``chunk_size`` rather than by the size of the file. Fully blank
+    rows are skipped. Each chunk is indexed by its 1-based spreadsheet
+    row number (counting the header) and cleaned with ``clean_df``.
+
+    Args:
+        path (str): Path to a ``.xlsx`` or ``.csv`` file.
+        sheet_name (str, optional): Worksheet to read; defaults to
+            the first sheet. Ignored for CSV files.
+        chunk_size (int): Rows per yielded chunk.
+        dtypes (dict, optional): Column name to dtype, see ``clean_df``.
+
+    Yields:
+        pandas.DataFrame: Cleaned chunk.
+    """
+
+    if _is_csv(path):
+        frames = _iter_csv_frames(path, chunk_size)
+    else:
+        frames = _iter_xlsx_frames(path, sheet_name, chunk_size)
+    for frame in frames:
+        yield clean_df(frame, dtypes)
+
+
+def _iter_xlsx_frames(path, sheet_name, chunk_size):
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name is not None else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = ["" if name is None else str(name) for name in header]
+        row_numbers, values = [], []
+        for row_number, row in enumerate(rows, start=2):
+            if all(value is None for value in row):
+                continue
+            row_numbers.append(row_number)
+            values.append(row)
+            if len(values) >= chunk_size:
+                yield pd.DataFrame.from_records(values, columns=columns, index=row_numbers)
+                row_numbers, values = [], []
+        if values:
+            yield pd.DataFrame.from_records(values, columns=columns, index=row_numbers)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_frames(path, chunk_size):
+    # Read as text so values are converted by clean_df, not guessed per chunk.
+    for frame in pd.read_csv(path, chunksize=chunk_size, dtype=str):
+        frame = frame.dropna(how="all")
+        if len(frame):
+            # read_csv keeps a running index across chunks, so it maps to file rows.
+            frame.index = frame.index + 2
+            yield frame
+
+
+def values_sql(rows):
+    """
+    Build a ``VALUES`` list for many rows.
+
+    Returns:
+        tuple[str, list]: Placeholder SQL such as ``(%s,%s),(%s,%s)``
+        and the flattened parameters.
+    """
+
+    placeholder = "(" + ",".join(["%s"] * len(rows[0])) + ")"
+    return ",".join([placeholder] * len(rows)), [value for row in rows for value in row]
+
+
+def insert_rows(cur, table, columns, rows, suffix=""):
+    """
+    Insert many rows with a single multi-row ``INSERT ... VALUES``.
+
+    Args:
+        cur: DB-API cursor.
+        table (str): Target table.
+        columns (list[str]): Column names.
+        rows (list[tuple]): Row values, in ``columns`` order.
+        suffix (str): Trailing SQL such as ``ON CONFLICT DO NOTHING``.
+    """
+
+    if not rows:
+        return
+    placeholders, params = values_sql(rows)
+    cur.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders} {suffix}",
+        params,
+    )
+
+
+class LoadReport:
+    """
+    Row-level bookkeeping for one loader run.
+
+    Loaders call ``accept`` or ``reject`` for every source row. When a
+    ``progress`` callback is given it receives the report roughly every
+    ``every`` rows and once more when the loader finishes.
+    """
+
+    def __init__(self, progress=None, every=500, max_rejected=1000):
+        self.progress = progress
+        self.every = every
+        self.max_rejected = max_rejected
+        self.total = 0
+        self.processed = 0
+        self.loaded = 0
+        self.rejected = 0
+        self.rejected_rows = []
+
+    def start(self, total=None):
+        """Begin a run; ``total`` is an estimate and may be None when unknown."""
+        self.total = total or 0
+        self._notify()
+
+    def accept(self, count=1):
+        self.loaded += count
+        self._advance(count)
+
+    def reject(self, row_number, reason):
+        """
+        Record a skipped row. ``row_number`` is the 1-based spreadsheet
+        row, counting the header. Only the first ``max_rejected`` rows
+        are kept; the count covers all of them.
+        """
+        self.rejected += 1
+        if len(self.rejected_rows) < self.max_rejected:
+            self.rejected_rows.append({"row": row_number, "reason": reason})
+        self._advance(1)
+
+    def reject_many(self, row_numbers, reason):
+        """Record the same reason for several skipped rows."""
+        for row_number in row_numbers:
+            self.reject(int(row_number), reason)
+
+    def finish(self):
+        self.total = self.processed
+        self._notify()
+
+    def _advance(self, count):
+        before = self.processed
+        self.processed += count
+        if self.processed // self.every > before // self.every:
+            self._notify()
+
+    def _notify(self):
+        if self.progress is not None:
+            self.progress(self)
+
+
+def _to_string(series):
+    return series.astype("string")
+
+
+def _to_category(series):
+    return series.astype("string").astype("category")
+
+
+def _to_date(series):
+    return pd.to_datetime(series, errors="coerce", format="mixed")
+
+
+def _to_int(series):
+    numbers = pd.to_numeric(series, errors="coerce")
+    return numbers.where(numbers == numbers.round()).astype("Int64")
+
+
+def _to_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype("boolean")
+    return pd.to_numeric(series, errors="coerce").astype("Float64").ne(0)
+
+
+CASTS = {
+    "string": _to_string,
+    "category": _to_category,
+    "date": _to_date,
+    "Int64": _to_int,
+    "boolean": _to_bool,
+}
+
+
+def clean_df(df, dtypes=None):
     """
     Clean a pandas DataFrame prior to database insertion.
 
     Operations performed:
     - Strip whitespace from column names
-    - Replace NaN values with None
-    - Replace NaT timestamps with None
+    - Keep only the columns named in ``dtypes``, adding missing ones as all-NA
+    - Convert each column with a vectorized cast to a native dtype:
+      ``string``, ``category`` (repeated labels), ``date``, nullable
+      ``Int64`` or nullable ``boolean``; unparseable values become NA
+
+    Missing values stay as NA/NaT; ``records`` turns them into None
+    at the database boundary.
 
     Args:
         df (pandas.DataFrame): Raw input DataFrame.
+        dtypes (dict, optional): Column name to one of ``CASTS``.
 
     Returns:
         pandas.DataFrame: Cleaned DataFrame.
     """
-        
+
     df.columns = df.columns.str.strip()
-    df = df.replace({np.nan: None})
-    df = df.replace({pd.NaT: None})
-    return df
+    if dtypes is None:
+        return df
+    df = df.reindex(columns=list(dtypes))
+    return df.assign(**{column: CASTS[dtype](df[column]) for column, dtype in dtypes.items()})
 
 
-def parse_list(value):
+def explode_lists(df, columns):
     """
-    Parse a multi-value text field into a normalized list.
+    Split multi-value text columns into one long-format frame.
 
-    Handles:
-    - Removal of single quotes
-    - Splitting on commas
-    - Whitespace trimming
-    - Title-case normalization
-    - Duplicate removal
+    All ``columns`` are melted and split together: single quotes are
+    removed, values are split on commas, trimmed and title-cased, and
+    empty or duplicate values per source row are dropped.
 
     Args:
-        value (str): Raw multi-value string.
+        df (pandas.DataFrame): Cleaned chunk.
+        columns (list[str]): Comma-separated multi-value columns.
 
     Returns:
-        list[str]: Cleaned and deduplicated list of values.
-    """
-    
-    if not value:
-        return []
-    cleaned = str(value).replace("'", "")
-    items = [x.strip() for x in cleaned.split(",")]
-    return list(set([x.title() for x in items if x]))
\ No newline at end of file
+        pandas.DataFrame: Columns ``row`` (index label in ``df``),
+        ``column`` and ``value``.
+    """
+
+    long = df[columns].melt(ignore_index=False, var_name="column", value_name="value")
+    long = long[long["value"].notna()]
+    long["value"] = long["value"].astype("string").str.replace("'", "", regex=False).str.split(",")
+    long = long.explode("value")
+    long["value"] = long["value"].astype("string").str.strip().str.title()
+    long = long[long["value"].notna() & (long["value"] != "")]
+    return long.rename_axis("row").reset_index().drop_duplicates()
+
+
+def records(df):
+    """
+    Convert a frame to row tuples of plain Python values for the
+    database adapter, with NA, NaN and NaT as None.
+    """
+
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
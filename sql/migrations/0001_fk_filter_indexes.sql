@@ -0,0 +1,15 @@
+-- migrate:no-transaction
+-- Indexes on foreign keys and common filter columns. Built CONCURRENTLY so
+-- that existing tables stay writable while the indexes are created.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_jurisdiction_id ON cases (jurisdiction_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_filing_date ON cases (filing_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dockets_case_id ON dockets (case_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_docket_id ON documents (docket_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_filing_date ON documents (filing_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_secondary_sources_case_id ON secondary_sources (case_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_case_areas_area_id ON case_areas (area_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_case_issues_issue_id ON case_issues (issue_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_case_causes_cause_id ON case_causes (cause_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_case_algorithms_algorithm_id ON case_algorithms (algorithm_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_case_organizations_organization_id ON case_organizations (organization_id);
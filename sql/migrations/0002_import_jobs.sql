@@ -0,0 +1,18 @@
+-- Progress and results of spreadsheet imports submitted through POST /imports.
+
+CREATE TABLE IF NOT EXISTS import_jobs (
+    job_id SERIAL PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    filename TEXT,
+    sheet_name TEXT,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    rows_total INT NOT NULL DEFAULT 0,
+    rows_processed INT NOT NULL DEFAULT 0,
+    rows_loaded INT NOT NULL DEFAULT 0,
+    rows_rejected INT NOT NULL DEFAULT 0,
+    rejected JSONB NOT NULL DEFAULT '[]',
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
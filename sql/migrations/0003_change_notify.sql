@@ -0,0 +1,78 @@
+-- Publish row changes on the schemaforge_changes channel so every API worker
+-- can evict exactly the cache entries a write affects, including writes made
+-- outside the API (scripts/, psql). Payload:
+--   {"table": ..., "op": "INSERT|UPDATE|DELETE|TRUNCATE", "pk": ..., "case_ids": [...]}
+-- case_ids holds the old and new owning case, so moving a docket to another
+-- case evicts both. Documents resolve theirs through dockets.
+
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    old_row jsonb;
+    new_row jsonb;
+    case_ids jsonb;
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('schemaforge_changes', jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP)::text);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP <> 'INSERT' THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_TABLE_NAME = 'documents' THEN
+        SELECT jsonb_agg(DISTINCT d.case_id) INTO case_ids
+        FROM dockets d
+        WHERE d.docket_id IN ((old_row ->> 'docket_id')::int, (new_row ->> 'docket_id')::int)
+          AND d.case_id IS NOT NULL;
+    ELSE
+        SELECT jsonb_agg(DISTINCT v.case_id) INTO case_ids
+        FROM (VALUES (old_row -> 'case_id'), (new_row -> 'case_id')) AS v(case_id)
+        WHERE v.case_id IS NOT NULL AND v.case_id <> 'null'::jsonb;
+    END IF;
+
+    PERFORM pg_notify('schemaforge_changes', jsonb_build_object(
+        'table', TG_TABLE_NAME,
+        'op', TG_OP,
+        'pk', COALESCE(new_row, old_row) -> TG_ARGV[0],
+        'case_ids', COALESCE(case_ids, '[]'::jsonb)
+    )::text);
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('cases', 'case_id'),
+        ('dockets', 'docket_id'),
+        ('documents', 'document_id'),
+        ('secondary_sources', 'source_id'),
+        ('jurisdictions', 'jurisdiction_id'),
+        ('areas_of_application', 'area_id'),
+        ('issues', 'issue_id'),
+        ('causes_of_action', 'cause_id'),
+        ('algorithms', 'algorithm_id'),
+        ('organizations', 'organization_id'),
+        ('case_areas', 'case_id'),
+        ('case_issues', 'case_id'),
+        ('case_causes', 'case_id'),
+        ('case_algorithms', 'case_id'),
+        ('case_organizations', 'case_id')
+    ) AS v(table_name, pk_column)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS notify_change ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER notify_change AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION notify_change(' || quote_literal(t.pk_column) || ')';
+        EXECUTE 'DROP TRIGGER IF EXISTS notify_truncate ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER notify_truncate AFTER TRUNCATE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH STATEMENT EXECUTE FUNCTION notify_change()';
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,89 @@
+-- Pre-aggregated litigation trends for /analytics.
+--
+-- case_rollup_members holds one row per case and chart bucket it falls in
+-- (e.g. area "Employment" in filing year 2021); case_rollups holds the
+-- bucket counts. Triggers record changed cases in analytics_dirty, and
+-- app.services.analytics.refresh recounts only the buckets those cases
+-- left or entered. Unknown years are stored as 0 and unknown keys as ''.
+
+CREATE TABLE IF NOT EXISTS analytics_dirty (
+    case_id INT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS case_rollup_members (
+    case_id INT NOT NULL,
+    dimension VARCHAR(32) NOT NULL,
+    year INT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (case_id, dimension, year, key)
+);
+CREATE INDEX IF NOT EXISTS ix_case_rollup_members_bucket ON case_rollup_members (dimension, year, key);
+
+CREATE TABLE IF NOT EXISTS case_rollups (
+    dimension VARCHAR(32) NOT NULL,
+    year INT NOT NULL,
+    key TEXT NOT NULL,
+    cases INT NOT NULL,
+    PRIMARY KEY (dimension, year, key)
+);
+
+-- On cases and junction tables: mark the old and new case.
+-- On jurisdictions and taxonomy terms (renames): TG_ARGV names the table
+-- linking them to cases and the shared column, and every linked case is marked.
+CREATE OR REPLACE FUNCTION mark_analytics_dirty() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_NARGS = 2 THEN
+        EXECUTE 'INSERT INTO analytics_dirty (case_id) SELECT case_id FROM ' || quote_ident(TG_ARGV[0])
+            || ' WHERE ' || quote_ident(TG_ARGV[1]) || ' = $1 ON CONFLICT DO NOTHING'
+        USING (to_jsonb(NEW) ->> TG_ARGV[1])::int;
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        INSERT INTO analytics_dirty (case_id) VALUES (OLD.case_id) ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO analytics_dirty (case_id) VALUES (NEW.case_id) ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS mark_analytics_dirty ON cases;
+CREATE TRIGGER mark_analytics_dirty
+    AFTER INSERT OR DELETE OR UPDATE OF filing_date, date_added, jurisdiction_id, status_disposition ON cases
+    FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty();
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('case_areas'), ('case_issues'), ('case_causes'), ('case_algorithms'), ('case_organizations')
+    ) AS v(table_name)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS mark_analytics_dirty ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER mark_analytics_dirty AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty()';
+    END LOOP;
+
+    FOR t IN SELECT * FROM (VALUES
+        ('jurisdictions', 'jurisdiction_type', 'cases', 'jurisdiction_id'),
+        ('areas_of_application', 'name', 'case_areas', 'area_id'),
+        ('issues', 'name', 'case_issues', 'issue_id'),
+        ('causes_of_action', 'name', 'case_causes', 'cause_id'),
+        ('algorithms', 'name', 'case_algorithms', 'algorithm_id'),
+        ('organizations', 'name', 'case_organizations', 'organization_id')
+    ) AS v(table_name, label_column, link_table, link_column)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS mark_analytics_dirty ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER mark_analytics_dirty AFTER UPDATE OF ' || quote_ident(t.label_column)
+            || ' ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty('
+            || quote_literal(t.link_table) || ', ' || quote_literal(t.link_column) || ')';
+    END LOOP;
+END;
+$$;
+
+-- Existing cases are counted by the first refresh.
+INSERT INTO analytics_dirty (case_id) SELECT case_id FROM cases ON CONFLICT DO NOTHING;
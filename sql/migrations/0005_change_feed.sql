@@ -0,0 +1,99 @@
+-- Change feed for incremental sync (GET /changes).
+--
+-- Every synced table gets server-maintained change_seq (global sequence),
+-- change_xid (writing transaction) and updated_at columns, stamped by a
+-- BEFORE trigger on insert and on any update that changes the row. Deletes
+-- leave a tombstone. Changes to taxonomy links restamp the owning case.
+--
+-- The feed is ordered by (change_xid, change_seq) and only returns rows whose
+-- transaction is older than every transaction still running, so a row can
+-- never become visible behind a token a client has already been given.
+
+CREATE SEQUENCE IF NOT EXISTS change_seq;
+
+CREATE TABLE IF NOT EXISTS change_tombstones (
+    change_seq BIGINT PRIMARY KEY DEFAULT nextval('change_seq'),
+    change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    table_name VARCHAR(64) NOT NULL,
+    pk BIGINT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_change_tombstones_change ON change_tombstones (change_xid, change_seq);
+
+CREATE OR REPLACE FUNCTION stamp_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW IS NOT DISTINCT FROM OLD THEN
+        RETURN NEW;
+    END IF;
+    NEW.change_seq := nextval('change_seq');
+    NEW.change_xid := pg_current_xact_id();
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO change_tombstones (table_name, pk) VALUES (TG_TABLE_NAME, (to_jsonb(OLD) ->> TG_ARGV[0])::bigint);
+    RETURN NULL;
+END;
+$$;
+
+-- Setting updated_at to now() is a no-op for a case already stamped in this
+-- transaction, so loading many links for one case restamps it only once.
+CREATE OR REPLACE FUNCTION stamp_link_owner() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE cases SET updated_at = now() WHERE case_id = OLD.case_id AND updated_at IS DISTINCT FROM now();
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        UPDATE cases SET updated_at = now() WHERE case_id = NEW.case_id AND updated_at IS DISTINCT FROM now();
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('cases', 'case_id'),
+        ('dockets', 'docket_id'),
+        ('documents', 'document_id'),
+        ('secondary_sources', 'source_id'),
+        ('jurisdictions', 'jurisdiction_id'),
+        ('areas_of_application', 'area_id'),
+        ('issues', 'issue_id'),
+        ('causes_of_action', 'cause_id'),
+        ('algorithms', 'algorithm_id'),
+        ('organizations', 'organization_id')
+    ) AS v(table_name, pk_column)
+    LOOP
+        EXECUTE 'ALTER TABLE ' || quote_ident(t.table_name)
+            || ' ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval(''change_seq''),'
+            || ' ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),'
+            || ' ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS ' || quote_ident('ix_' || t.table_name || '_change')
+            || ' ON ' || quote_ident(t.table_name) || ' (change_xid, change_seq)';
+        EXECUTE 'DROP TRIGGER IF EXISTS stamp_change ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION stamp_change()';
+        EXECUTE 'DROP TRIGGER IF EXISTS record_tombstone ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER record_tombstone AFTER DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION record_tombstone(' || quote_literal(t.pk_column) || ')';
+    END LOOP;
+
+    FOR t IN SELECT * FROM (VALUES
+        ('case_areas'), ('case_issues'), ('case_causes'), ('case_algorithms'), ('case_organizations')
+    ) AS v(table_name)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS stamp_link_owner ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER stamp_link_owner AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION stamp_link_owner()';
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,23 @@
+-- migrate:no-transaction
+-- Composite indexes for date-range search with sort= (GET /cases/search/,
+-- GET /documents/search/). Results sort undated rows last and break ties on
+-- the primary key, so each sort order has an index whose order matches it
+-- exactly; a range filter plus LIMIT becomes an index range scan that stops
+-- after one page. The (date, pk) indexes also serve plain date filters, so
+-- the single-column filing_date indexes from 0001 are dropped once they exist.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_filing_date_case_id
+    ON cases (filing_date, case_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_filing_date_desc
+    ON cases (filing_date DESC NULLS LAST, case_id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_activity_date_case_id
+    ON cases (most_recent_activity_date, case_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cases_activity_date_desc
+    ON cases (most_recent_activity_date DESC NULLS LAST, case_id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_filing_date_document_id
+    ON documents (filing_date, document_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_filing_date_desc
+    ON documents (filing_date DESC NULLS LAST, document_id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_cases_filing_date;
+DROP INDEX CONCURRENTLY IF EXISTS ix_documents_filing_date;
@@ -0,0 +1,161 @@
+-- Range-partition documents by filing_date year.
+--
+-- documents becomes a partitioned table with one partition per filing year
+-- (documents_2024 holds 2024-01-01 up to 2025-01-01) and documents_default
+-- for undated rows and years without a partition yet. Date-filtered searches
+-- only scan the matching years, vacuum and index maintenance work per year,
+-- and old years are archived by detaching their partition instead of a mass
+-- DELETE (python -m app.cli archive-documents).
+--
+-- A unique constraint on a partitioned table must include the partition key,
+-- and filing_date is nullable, so there is no table-wide primary key: every
+-- partition has PRIMARY KEY (document_id), and ids come from the sequence.
+--
+-- Existing rows are copied into the new table inside this transaction, which
+-- holds an exclusive lock on documents until it commits; run it in a quiet
+-- period on large databases. Row triggers are created after the copy, so the
+-- copy keeps each row's change feed position and sends no notifications.
+-- Requires PostgreSQL 13 or later (BEFORE row triggers on partitioned tables).
+
+-- Triggers on a partitioned table fire with the partition's TG_TABLE_NAME;
+-- change notifications and tombstones report the parent instead.
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    table_name text := COALESCE(pg_partition_root(TG_RELID)::text, TG_TABLE_NAME);
+    old_row jsonb;
+    new_row jsonb;
+    case_ids jsonb;
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('schemaforge_changes', jsonb_build_object('table', table_name, 'op', TG_OP)::text);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP <> 'INSERT' THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF table_name = 'documents' THEN
+        SELECT jsonb_agg(DISTINCT d.case_id) INTO case_ids
+        FROM dockets d
+        WHERE d.docket_id IN ((old_row ->> 'docket_id')::int, (new_row ->> 'docket_id')::int)
+          AND d.case_id IS NOT NULL;
+    ELSE
+        SELECT jsonb_agg(DISTINCT v.case_id) INTO case_ids
+        FROM (VALUES (old_row -> 'case_id'), (new_row -> 'case_id')) AS v(case_id)
+        WHERE v.case_id IS NOT NULL AND v.case_id <> 'null'::jsonb;
+    END IF;
+
+    PERFORM pg_notify('schemaforge_changes', jsonb_build_object(
+        'table', table_name,
+        'op', TG_OP,
+        'pk', COALESCE(new_row, old_row) -> TG_ARGV[0],
+        'case_ids', COALESCE(case_ids, '[]'::jsonb)
+    )::text);
+    RETURN NULL;
+END;
+$$;
+
+-- An UPDATE that changes the partition key moves the row: it is deleted from
+-- the old partition and inserted into the new one. That delete is not a
+-- tombstone, so a row that is still in the table is skipped.
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    root regclass := pg_partition_root(TG_RELID);
+    pk bigint := (to_jsonb(OLD) ->> TG_ARGV[0])::bigint;
+    moved boolean := false;
+BEGIN
+    IF root IS NOT NULL THEN
+        EXECUTE 'SELECT EXISTS (SELECT 1 FROM ' || root::text || ' WHERE ' || quote_ident(TG_ARGV[0]) || ' = $1)'
+        INTO moved USING pk;
+        IF moved THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    INSERT INTO change_tombstones (table_name, pk) VALUES (COALESCE(root::text, TG_TABLE_NAME), pk);
+    RETURN NULL;
+END;
+$$;
+
+-- Create the partition for one filing year unless it exists. Rows of that
+-- year already in documents_default are moved into it before it is attached,
+-- keeping their change feed position. Returns whether it was created.
+CREATE OR REPLACE FUNCTION create_document_partition(filing_year INT) RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name text := 'documents_' || filing_year;
+    lower_bound date := make_date(filing_year, 1, 1);
+    upper_bound date := make_date(filing_year + 1, 1, 1);
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name) || ' (LIKE documents INCLUDING DEFAULTS)';
+    EXECUTE 'ALTER TABLE ' || quote_ident(partition_name) || ' ADD PRIMARY KEY (document_id)';
+    EXECUTE 'WITH moved AS (DELETE FROM documents_default WHERE filing_date >= $1 AND filing_date < $2 RETURNING *) '
+        || 'INSERT INTO ' || quote_ident(partition_name) || ' SELECT * FROM moved'
+    USING lower_bound, upper_bound;
+    -- The moved rows were not deleted; drop the tombstones their move wrote.
+    EXECUTE 'DELETE FROM change_tombstones WHERE change_xid = pg_current_xact_id() AND table_name = ''documents'''
+        || ' AND pk IN (SELECT document_id FROM ' || quote_ident(partition_name) || ')';
+    EXECUTE 'ALTER TABLE documents ATTACH PARTITION ' || quote_ident(partition_name)
+        || ' FOR VALUES FROM (' || quote_literal(lower_bound) || ') TO (' || quote_literal(upper_bound) || ')';
+    RETURN true;
+END;
+$$;
+
+DO $$
+DECLARE
+    sequence_name text;
+    filing_year int;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'documents'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE documents RENAME TO documents_unpartitioned;
+    CREATE TABLE documents (LIKE documents_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (filing_date);
+    sequence_name := pg_get_serial_sequence('documents_unpartitioned', 'document_id');
+    IF sequence_name IS NOT NULL THEN
+        EXECUTE 'ALTER SEQUENCE ' || sequence_name || ' OWNED BY documents.document_id';
+    END IF;
+    ALTER TABLE documents ADD CONSTRAINT documents_docket_id_fkey
+        FOREIGN KEY (docket_id) REFERENCES dockets (docket_id) ON DELETE CASCADE;
+
+    CREATE TABLE documents_default PARTITION OF documents DEFAULT;
+    ALTER TABLE documents_default ADD PRIMARY KEY (document_id);
+    FOR filing_year IN
+        SELECT DISTINCT extract(year FROM filing_date)::int FROM documents_unpartitioned WHERE filing_date IS NOT NULL
+        UNION
+        SELECT generate_series(extract(year FROM current_date)::int, extract(year FROM current_date)::int + 2)
+    LOOP
+        PERFORM create_document_partition(filing_year);
+    END LOOP;
+
+    INSERT INTO documents SELECT * FROM documents_unpartitioned;
+    DROP TABLE documents_unpartitioned;
+
+    -- Indexes on the parent are created on every partition, present and future.
+    CREATE INDEX ix_documents_docket_id ON documents (docket_id);
+    CREATE INDEX ix_documents_filing_date_document_id ON documents (filing_date, document_id);
+    CREATE INDEX ix_documents_filing_date_desc ON documents (filing_date DESC NULLS LAST, document_id DESC);
+    CREATE INDEX ix_documents_change ON documents (change_xid, change_seq);
+
+    CREATE TRIGGER notify_change AFTER INSERT OR UPDATE OR DELETE ON documents
+        FOR EACH ROW EXECUTE FUNCTION notify_change('document_id');
+    CREATE TRIGGER notify_truncate AFTER TRUNCATE ON documents
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_change();
+    CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON documents
+        FOR EACH ROW EXECUTE FUNCTION stamp_change();
+    CREATE TRIGGER record_tombstone AFTER DELETE ON documents
+        FOR EACH ROW EXECUTE FUNCTION record_tombstone('document_id');
+END;
+$$;
+
+-- Autovacuum analyzes the partitions but never the partitioned parent.
+ANALYZE documents;
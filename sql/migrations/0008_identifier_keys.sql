@@ -0,0 +1,139 @@
+-- Format-insensitive lookup keys for docket numbers and citations
+-- (GET /dockets/by-number/, GET /documents/by-citation/).
+--
+-- normalize_docket_number() and normalize_citation() canonicalise pasted
+-- identifiers: "1:23-cv-00456", "23 CV 456" and "Case No. 23-cv-456-ABC" all
+-- become 23-cv-456, and "484 F.Supp.3d 561 (N.D. Ill. 2019)" becomes
+-- 484 fsupp3d 561. dockets.docket_number_key and documents.citation_key are
+-- stored generated columns over them, so every write path (API, ETL, psql)
+-- fills them, and the lookups are equality probes on a btree index. The
+-- endpoints normalise the query with the same functions.
+--
+-- Adding a stored generated column rewrites the table under an exclusive
+-- lock. A schema created from the models already has plain key columns;
+-- they are replaced.
+
+CREATE OR REPLACE FUNCTION normalize_docket_number(value TEXT) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    tokens text[];
+    joined text;
+    federal text[];
+BEGIN
+    -- Letter and digit runs, lower-cased, numbers without leading zeros.
+    tokens := ARRAY(
+        SELECT regexp_replace(m.token[1], '^0+(?=[0-9])', '')
+        FROM regexp_matches(lower(value), '[a-z]+|[0-9]+', 'g') WITH ORDINALITY AS m(token, n)
+        ORDER BY m.n
+    );
+    -- Labels: "Case No.", "Civ. No.", "Docket #", "MDL No."
+    tokens := array_remove(array_remove(array_remove(tokens, 'no'), 'nos'), 'number');
+    WHILE cardinality(tokens) > 1
+        AND tokens[1] IN ('case', 'docket', 'dkt', 'civ', 'civil', 'action', 'index', 'cause', 'ucn')
+    LOOP
+        tokens := tokens[2:];
+    END LOOP;
+    joined := array_to_string(tokens, '-');
+    IF joined = '' THEN
+        RETURN NULL;
+    END IF;
+    -- Federal: [office:]yy-type-number[-judge...], e.g. 1:23-cv-00456-ABC, 23 CV 456, 3:2023cv03440.
+    federal := regexp_match(joined,
+        '^(?:[0-9]-)?(?:(?:19|20)([0-9]{2})|([0-9]{2}))-(cv|cr|mc|md|mj|bk|ap|po|sw|gj|dp|vv)-([0-9]+)(?:-[a-z]+)*$');
+    IF federal IS NOT NULL THEN
+        RETURN COALESCE(federal[1], federal[2]) || '-' || federal[3] || '-' || federal[4];
+    END IF;
+    RETURN joined;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION normalize_citation(value TEXT) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    parts text[];
+    reporter text;
+BEGIN
+    -- The first "volume reporter page" citation: 123 F.4th 45, 484 F. Supp. 3d 561, 2023 WL 5333236.
+    -- Reporter words start with a letter (F., Supp., N.W.2d) or are a series (2d, 3d, 4th).
+    parts := regexp_match(regexp_replace(value, '[][(),;]', ' ', 'g'),
+        '(?:^|\s)([0-9]+)\s+([A-Za-z][A-Za-z.'']*(?:[0-9]+(?:d|th|st|nd|rd))?\.?'
+        '(?:\s*(?:[A-Za-z][A-Za-z.'']*|[0-9]+(?:d|th|st|nd|rd))(?:[0-9]+(?:d|th|st|nd|rd))?\.?)*)'
+        '\s*([0-9]+)(?![A-Za-z0-9])');
+    IF parts IS NULL THEN
+        RETURN NULL;
+    END IF;
+    reporter := regexp_replace(lower(parts[2]), '[^a-z0-9]', '', 'g');
+    IF reporter = 'fappx' THEN
+        reporter := 'fedappx';
+    END IF;
+    RETURN ltrim(parts[1], '0') || ' ' || reporter || ' ' || ltrim(parts[3], '0');
+END;
+$$;
+
+-- Generated columns are not computed yet in BEFORE triggers (NEW holds NULL),
+-- so a no-op UPDATE would look like a change. The trigger's arguments name the
+-- generated columns to leave out of the comparison.
+CREATE OR REPLACE FUNCTION stamp_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        CASE WHEN TG_NARGS = 0 THEN NEW IS NOT DISTINCT FROM OLD
+        ELSE to_jsonb(NEW) - TG_ARGV = to_jsonb(OLD) - TG_ARGV END
+    ) THEN
+        RETURN NEW;
+    END IF;
+    NEW.change_seq := nextval('change_seq');
+    NEW.change_xid := pg_current_xact_id();
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+-- Partitions are created with LIKE documents, which copies generated
+-- expressions only when asked; ATTACH requires them to match the parent.
+CREATE OR REPLACE FUNCTION create_document_partition(filing_year INT) RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name text := 'documents_' || filing_year;
+    lower_bound date := make_date(filing_year, 1, 1);
+    upper_bound date := make_date(filing_year + 1, 1, 1);
+    stored_columns text;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name) || ' (LIKE documents INCLUDING DEFAULTS INCLUDING GENERATED)';
+    EXECUTE 'ALTER TABLE ' || quote_ident(partition_name) || ' ADD PRIMARY KEY (document_id)';
+    -- Generated columns cannot be written; they are recomputed on insert.
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO stored_columns
+    FROM pg_attribute
+    WHERE attrelid = 'documents'::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+    EXECUTE 'WITH moved AS (DELETE FROM documents_default WHERE filing_date >= $1 AND filing_date < $2 '
+        || 'RETURNING ' || stored_columns || ') '
+        || 'INSERT INTO ' || quote_ident(partition_name) || ' (' || stored_columns || ') SELECT * FROM moved'
+    USING lower_bound, upper_bound;
+    -- The moved rows were not deleted; drop the tombstones their move wrote.
+    EXECUTE 'DELETE FROM change_tombstones WHERE change_xid = pg_current_xact_id() AND table_name = ''documents'''
+        || ' AND pk IN (SELECT document_id FROM ' || quote_ident(partition_name) || ')';
+    EXECUTE 'ALTER TABLE documents ATTACH PARTITION ' || quote_ident(partition_name)
+        || ' FOR VALUES FROM (' || quote_literal(lower_bound) || ') TO (' || quote_literal(upper_bound) || ')';
+    RETURN true;
+END;
+$$;
+
+ALTER TABLE dockets DROP COLUMN IF EXISTS docket_number_key;
+ALTER TABLE dockets ADD COLUMN docket_number_key TEXT
+    GENERATED ALWAYS AS (normalize_docket_number(docket_number)) STORED;
+CREATE INDEX ix_dockets_docket_number_key ON dockets (docket_number_key);
+
+ALTER TABLE documents DROP COLUMN IF EXISTS citation_key;
+ALTER TABLE documents ADD COLUMN citation_key TEXT
+    GENERATED ALWAYS AS (normalize_citation(citation)) STORED;
+CREATE INDEX ix_documents_citation_key ON documents (citation_key);
+
+DROP TRIGGER IF EXISTS stamp_change ON dockets;
+CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON dockets
+    FOR EACH ROW EXECUTE FUNCTION stamp_change('docket_number_key');
+DROP TRIGGER IF EXISTS stamp_change ON documents;
+CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON documents
+    FOR EACH ROW EXECUTE FUNCTION stamp_change('citation_key');
@@ -0,0 +1,92 @@
+-- Table-wide uniqueness of documents.document_id.
+--
+-- Since 0007_partition_documents every yearly partition has its own
+-- PRIMARY KEY (document_id), but nothing stops an explicit id already used
+-- in another year. document_ids holds every id in documents, and row
+-- triggers keep it in step: an insert whose id is taken anywhere fails with
+-- a unique violation on document_ids_pkey, like a primary key would. A row
+-- that moves partitions (its filing_date changes year) is deleted and then
+-- inserted, which releases and re-reserves its id.
+--
+-- Archived partitions (python -m app.cli archive-documents) are detached
+-- without deleting rows, so their ids stay reserved. TRUNCATE documents
+-- releases every id.
+
+CREATE TABLE IF NOT EXISTS document_ids (
+    document_id INTEGER PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION reserve_document_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        DELETE FROM document_ids;
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM document_ids WHERE document_id = OLD.document_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO document_ids (document_id) VALUES (NEW.document_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- The moved rows bypass the triggers on their way into the new partition,
+-- so their ids are reserved again after the move released them.
+CREATE OR REPLACE FUNCTION create_document_partition(filing_year INT) RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name text := 'documents_' || filing_year;
+    lower_bound date := make_date(filing_year, 1, 1);
+    upper_bound date := make_date(filing_year + 1, 1, 1);
+    stored_columns text;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name) || ' (LIKE documents INCLUDING DEFAULTS INCLUDING GENERATED)';
+    EXECUTE 'ALTER TABLE ' || quote_ident(partition_name) || ' ADD PRIMARY KEY (document_id)';
+    -- Generated columns cannot be written; they are recomputed on insert.
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO stored_columns
+    FROM pg_attribute
+    WHERE attrelid = 'documents'::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+    EXECUTE 'WITH moved AS (DELETE FROM documents_default WHERE filing_date >= $1 AND filing_date < $2 '
+        || 'RETURNING ' || stored_columns || ') '
+        || 'INSERT INTO ' || quote_ident(partition_name) || ' (' || stored_columns || ') SELECT * FROM moved'
+    USING lower_bound, upper_bound;
+    -- The moved rows were not deleted; drop the tombstones their move wrote.
+    EXECUTE 'DELETE FROM change_tombstones WHERE change_xid = pg_current_xact_id() AND table_name = ''documents'''
+        || ' AND pk IN (SELECT document_id FROM ' || quote_ident(partition_name) || ')';
+    EXECUTE 'INSERT INTO document_ids (document_id) SELECT document_id FROM ' || quote_ident(partition_name);
+    EXECUTE 'ALTER TABLE documents ATTACH PARTITION ' || quote_ident(partition_name)
+        || ' FOR VALUES FROM (' || quote_literal(lower_bound) || ') TO (' || quote_literal(upper_bound) || ')';
+    RETURN true;
+END;
+$$;
+
+-- Fails, and leaves the migration unapplied, if ids are already duplicated.
+LOCK TABLE documents IN SHARE MODE;
+TRUNCATE document_ids;
+INSERT INTO document_ids (document_id) SELECT document_id FROM documents;
+
+DO $$
+DECLARE
+    archived regclass;
+BEGIN
+    FOR archived IN
+        SELECT c.oid::regclass FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'archive' AND c.relname ~ '^documents_[0-9]{4}$' AND c.relkind = 'r'
+    LOOP
+        EXECUTE 'INSERT INTO document_ids (document_id) SELECT document_id FROM ' || archived::text;
+    END LOOP;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS reserve_document_id ON documents;
+CREATE TRIGGER reserve_document_id AFTER INSERT OR DELETE OR UPDATE OF document_id ON documents
+    FOR EACH ROW EXECUTE FUNCTION reserve_document_id();
+DROP TRIGGER IF EXISTS release_document_ids ON documents;
+CREATE TRIGGER release_document_ids AFTER TRUNCATE ON documents
+    FOR EACH STATEMENT EXECUTE FUNCTION reserve_document_id();
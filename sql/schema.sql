@@ -13,6 +13,14 @@ DROP TABLE IF EXISTS documents CASCADE;
 DROP TABLE IF EXISTS dockets CASCADE;
 DROP TABLE IF EXISTS cases CASCADE;
 DROP TABLE IF EXISTS jurisdictions CASCADE;
+DROP TABLE IF EXISTS import_jobs CASCADE;
+DROP TABLE IF EXISTS analytics_dirty CASCADE;
+DROP TABLE IF EXISTS case_rollup_members CASCADE;
+DROP TABLE IF EXISTS case_rollups CASCADE;
+DROP TABLE IF EXISTS change_tombstones CASCADE;
+DROP TABLE IF EXISTS document_ids CASCADE;
+DROP SEQUENCE IF EXISTS change_seq CASCADE;
+DROP TABLE IF EXISTS schema_migrations;
 
 CREATE TABLE jurisdictions (
     jurisdiction_id SERIAL PRIMARY KEY,
@@ -54,15 +62,21 @@ CREATE TABLE dockets (
     link TEXT
 );
 
+-- Range-partitioned by filing_date year (kept in sync with sql/migrations/0007_partition_documents.sql).
+-- Each partition has PRIMARY KEY (document_id); yearly partitions are created
+-- by create_document_partition() at the end of this file.
 CREATE TABLE documents (
-    document_id SERIAL PRIMARY KEY,
+    document_id SERIAL,
     docket_id INT REFERENCES dockets(docket_id)
         ON DELETE CASCADE,
     document_type TEXT,
     filing_date DATE,
     link TEXT,
     citation TEXT
-);
+) PARTITION BY RANGE (filing_date);
+
+CREATE TABLE documents_default PARTITION OF documents DEFAULT;
+ALTER TABLE documents_default ADD PRIMARY KEY (document_id);
 
 CREATE TABLE secondary_sources (
     source_id SERIAL PRIMARY KEY,
@@ -125,4 +139,468 @@ CREATE TABLE case_organizations (
     case_id INT REFERENCES cases(case_id) ON DELETE CASCADE,
     organization_id INT REFERENCES organizations(organization_id) ON DELETE CASCADE,
     PRIMARY KEY (case_id, organization_id)
-);
\ No newline at end of file
+);
+
+-- Foreign-key and filter-column indexes (kept in sync with sql/migrations)
+CREATE INDEX ix_cases_jurisdiction_id ON cases (jurisdiction_id);
+CREATE INDEX ix_dockets_case_id ON dockets (case_id);
+CREATE INDEX ix_documents_docket_id ON documents (docket_id);
+CREATE INDEX ix_secondary_sources_case_id ON secondary_sources (case_id);
+CREATE INDEX ix_case_areas_area_id ON case_areas (area_id);
+CREATE INDEX ix_case_issues_issue_id ON case_issues (issue_id);
+CREATE INDEX ix_case_causes_cause_id ON case_causes (cause_id);
+CREATE INDEX ix_case_algorithms_algorithm_id ON case_algorithms (algorithm_id);
+CREATE INDEX ix_case_organizations_organization_id ON case_organizations (organization_id);
+
+-- Date-range and sort indexes (kept in sync with sql/migrations/0006_date_order_indexes.sql)
+CREATE INDEX ix_cases_filing_date_case_id ON cases (filing_date, case_id);
+CREATE INDEX ix_cases_filing_date_desc ON cases (filing_date DESC NULLS LAST, case_id DESC);
+CREATE INDEX ix_cases_activity_date_case_id ON cases (most_recent_activity_date, case_id);
+CREATE INDEX ix_cases_activity_date_desc ON cases (most_recent_activity_date DESC NULLS LAST, case_id DESC);
+CREATE INDEX ix_documents_filing_date_document_id ON documents (filing_date, document_id);
+CREATE INDEX ix_documents_filing_date_desc ON documents (filing_date DESC NULLS LAST, document_id DESC);
+
+CREATE TABLE import_jobs (
+    job_id SERIAL PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    filename TEXT,
+    sheet_name TEXT,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    rows_total INT NOT NULL DEFAULT 0,
+    rows_processed INT NOT NULL DEFAULT 0,
+    rows_loaded INT NOT NULL DEFAULT 0,
+    rows_rejected INT NOT NULL DEFAULT 0,
+    rejected JSONB NOT NULL DEFAULT '[]',
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+-- Change notifications for cache invalidation (kept in sync with sql/migrations/0003_change_notify.sql and 0007)
+-- Triggers on a partitioned table fire with the partition's TG_TABLE_NAME;
+-- change notifications and tombstones report the parent instead.
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    table_name text := COALESCE(pg_partition_root(TG_RELID)::text, TG_TABLE_NAME);
+    old_row jsonb;
+    new_row jsonb;
+    case_ids jsonb;
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('schemaforge_changes', jsonb_build_object('table', table_name, 'op', TG_OP)::text);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP <> 'INSERT' THEN
+        old_row := to_jsonb(OLD);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_row := to_jsonb(NEW);
+    END IF;
+
+    IF table_name = 'documents' THEN
+        SELECT jsonb_agg(DISTINCT d.case_id) INTO case_ids
+        FROM dockets d
+        WHERE d.docket_id IN ((old_row ->> 'docket_id')::int, (new_row ->> 'docket_id')::int)
+          AND d.case_id IS NOT NULL;
+    ELSE
+        SELECT jsonb_agg(DISTINCT v.case_id) INTO case_ids
+        FROM (VALUES (old_row -> 'case_id'), (new_row -> 'case_id')) AS v(case_id)
+        WHERE v.case_id IS NOT NULL AND v.case_id <> 'null'::jsonb;
+    END IF;
+
+    PERFORM pg_notify('schemaforge_changes', jsonb_build_object(
+        'table', table_name,
+        'op', TG_OP,
+        'pk', COALESCE(new_row, old_row) -> TG_ARGV[0],
+        'case_ids', COALESCE(case_ids, '[]'::jsonb)
+    )::text);
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('cases', 'case_id'),
+        ('dockets', 'docket_id'),
+        ('documents', 'document_id'),
+        ('secondary_sources', 'source_id'),
+        ('jurisdictions', 'jurisdiction_id'),
+        ('areas_of_application', 'area_id'),
+        ('issues', 'issue_id'),
+        ('causes_of_action', 'cause_id'),
+        ('algorithms', 'algorithm_id'),
+        ('organizations', 'organization_id'),
+        ('case_areas', 'case_id'),
+        ('case_issues', 'case_id'),
+        ('case_causes', 'case_id'),
+        ('case_algorithms', 'case_id'),
+        ('case_organizations', 'case_id')
+    ) AS v(table_name, pk_column)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS notify_change ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER notify_change AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION notify_change(' || quote_literal(t.pk_column) || ')';
+        EXECUTE 'DROP TRIGGER IF EXISTS notify_truncate ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER notify_truncate AFTER TRUNCATE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH STATEMENT EXECUTE FUNCTION notify_change()';
+    END LOOP;
+END;
+$$;
+
+-- Analytics rollups (kept in sync with sql/migrations/0004_analytics.sql)
+CREATE TABLE IF NOT EXISTS analytics_dirty (
+    case_id INT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS case_rollup_members (
+    case_id INT NOT NULL,
+    dimension VARCHAR(32) NOT NULL,
+    year INT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (case_id, dimension, year, key)
+);
+CREATE INDEX IF NOT EXISTS ix_case_rollup_members_bucket ON case_rollup_members (dimension, year, key);
+
+CREATE TABLE IF NOT EXISTS case_rollups (
+    dimension VARCHAR(32) NOT NULL,
+    year INT NOT NULL,
+    key TEXT NOT NULL,
+    cases INT NOT NULL,
+    PRIMARY KEY (dimension, year, key)
+);
+
+-- On cases and junction tables: mark the old and new case.
+-- On jurisdictions and taxonomy terms (renames): TG_ARGV names the table
+-- linking them to cases and the shared column, and every linked case is marked.
+CREATE OR REPLACE FUNCTION mark_analytics_dirty() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_NARGS = 2 THEN
+        EXECUTE 'INSERT INTO analytics_dirty (case_id) SELECT case_id FROM ' || quote_ident(TG_ARGV[0])
+            || ' WHERE ' || quote_ident(TG_ARGV[1]) || ' = $1 ON CONFLICT DO NOTHING'
+        USING (to_jsonb(NEW) ->> TG_ARGV[1])::int;
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        INSERT INTO analytics_dirty (case_id) VALUES (OLD.case_id) ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO analytics_dirty (case_id) VALUES (NEW.case_id) ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS mark_analytics_dirty ON cases;
+CREATE TRIGGER mark_analytics_dirty
+    AFTER INSERT OR DELETE OR UPDATE OF filing_date, date_added, jurisdiction_id, status_disposition ON cases
+    FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty();
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('case_areas'), ('case_issues'), ('case_causes'), ('case_algorithms'), ('case_organizations')
+    ) AS v(table_name)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS mark_analytics_dirty ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER mark_analytics_dirty AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty()';
+    END LOOP;
+
+    FOR t IN SELECT * FROM (VALUES
+        ('jurisdictions', 'jurisdiction_type', 'cases', 'jurisdiction_id'),
+        ('areas_of_application', 'name', 'case_areas', 'area_id'),
+        ('issues', 'name', 'case_issues', 'issue_id'),
+        ('causes_of_action', 'name', 'case_causes', 'cause_id'),
+        ('algorithms', 'name', 'case_algorithms', 'algorithm_id'),
+        ('organizations', 'name', 'case_organizations', 'organization_id')
+    ) AS v(table_name, label_column, link_table, link_column)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS mark_analytics_dirty ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER mark_analytics_dirty AFTER UPDATE OF ' || quote_ident(t.label_column)
+            || ' ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION mark_analytics_dirty('
+            || quote_literal(t.link_table) || ', ' || quote_literal(t.link_column) || ')';
+    END LOOP;
+END;
+$$;
+
+
+-- Change feed columns, tombstones and triggers (kept in sync with sql/migrations/0005_change_feed.sql and 0007)
+CREATE SEQUENCE IF NOT EXISTS change_seq;
+
+CREATE TABLE IF NOT EXISTS change_tombstones (
+    change_seq BIGINT PRIMARY KEY DEFAULT nextval('change_seq'),
+    change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    table_name VARCHAR(64) NOT NULL,
+    pk BIGINT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_change_tombstones_change ON change_tombstones (change_xid, change_seq);
+
+-- Generated columns are not computed yet in BEFORE triggers (NEW holds NULL),
+-- so a no-op UPDATE would look like a change. The trigger's arguments name the
+-- generated columns to leave out of the comparison.
+CREATE OR REPLACE FUNCTION stamp_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (
+        CASE WHEN TG_NARGS = 0 THEN NEW IS NOT DISTINCT FROM OLD
+        ELSE to_jsonb(NEW) - TG_ARGV = to_jsonb(OLD) - TG_ARGV END
+    ) THEN
+        RETURN NEW;
+    END IF;
+    NEW.change_seq := nextval('change_seq');
+    NEW.change_xid := pg_current_xact_id();
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+-- An UPDATE that changes the partition key moves the row: it is deleted from
+-- the old partition and inserted into the new one. That delete is not a
+-- tombstone, so a row that is still in the table is skipped.
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    root regclass := pg_partition_root(TG_RELID);
+    pk bigint := (to_jsonb(OLD) ->> TG_ARGV[0])::bigint;
+    moved boolean := false;
+BEGIN
+    IF root IS NOT NULL THEN
+        EXECUTE 'SELECT EXISTS (SELECT 1 FROM ' || root::text || ' WHERE ' || quote_ident(TG_ARGV[0]) || ' = $1)'
+        INTO moved USING pk;
+        IF moved THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    INSERT INTO change_tombstones (table_name, pk) VALUES (COALESCE(root::text, TG_TABLE_NAME), pk);
+    RETURN NULL;
+END;
+$$;
+
+-- Setting updated_at to now() is a no-op for a case already stamped in this
+-- transaction, so loading many links for one case restamps it only once.
+CREATE OR REPLACE FUNCTION stamp_link_owner() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE cases SET updated_at = now() WHERE case_id = OLD.case_id AND updated_at IS DISTINCT FROM now();
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        UPDATE cases SET updated_at = now() WHERE case_id = NEW.case_id AND updated_at IS DISTINCT FROM now();
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+    t record;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('cases', 'case_id'),
+        ('dockets', 'docket_id'),
+        ('documents', 'document_id'),
+        ('secondary_sources', 'source_id'),
+        ('jurisdictions', 'jurisdiction_id'),
+        ('areas_of_application', 'area_id'),
+        ('issues', 'issue_id'),
+        ('causes_of_action', 'cause_id'),
+        ('algorithms', 'algorithm_id'),
+        ('organizations', 'organization_id')
+    ) AS v(table_name, pk_column)
+    LOOP
+        EXECUTE 'ALTER TABLE ' || quote_ident(t.table_name)
+            || ' ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval(''change_seq''),'
+            || ' ADD COLUMN IF NOT EXISTS change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),'
+            || ' ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS ' || quote_ident('ix_' || t.table_name || '_change')
+            || ' ON ' || quote_ident(t.table_name) || ' (change_xid, change_seq)';
+        EXECUTE 'DROP TRIGGER IF EXISTS stamp_change ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION stamp_change()';
+        EXECUTE 'DROP TRIGGER IF EXISTS record_tombstone ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER record_tombstone AFTER DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION record_tombstone(' || quote_literal(t.pk_column) || ')';
+    END LOOP;
+
+    FOR t IN SELECT * FROM (VALUES
+        ('case_areas'), ('case_issues'), ('case_causes'), ('case_algorithms'), ('case_organizations')
+    ) AS v(table_name)
+    LOOP
+        EXECUTE 'DROP TRIGGER IF EXISTS stamp_link_owner ON ' || quote_ident(t.table_name);
+        EXECUTE 'CREATE TRIGGER stamp_link_owner AFTER INSERT OR UPDATE OR DELETE ON ' || quote_ident(t.table_name)
+            || ' FOR EACH ROW EXECUTE FUNCTION stamp_link_owner()';
+    END LOOP;
+END;
+$$;
+
+-- Table-wide document_id uniqueness (kept in sync with sql/migrations/0009_document_ids.sql)
+-- Each partition's primary key only covers its own year; document_ids holds
+-- every id in documents, so an id taken in another year is rejected.
+CREATE TABLE document_ids (
+    document_id INTEGER PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION reserve_document_id() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        DELETE FROM document_ids;
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM document_ids WHERE document_id = OLD.document_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO document_ids (document_id) VALUES (NEW.document_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER reserve_document_id AFTER INSERT OR DELETE OR UPDATE OF document_id ON documents
+    FOR EACH ROW EXECUTE FUNCTION reserve_document_id();
+CREATE TRIGGER release_document_ids AFTER TRUNCATE ON documents
+    FOR EACH STATEMENT EXECUTE FUNCTION reserve_document_id();
+
+-- Yearly documents partitions (kept in sync with sql/migrations/0007_partition_documents.sql and 0009)
+-- Create the partition for one filing year unless it exists. Rows of that
+-- year already in documents_default are moved into it before it is attached,
+-- keeping their change feed position. Returns whether it was created.
+CREATE OR REPLACE FUNCTION create_document_partition(filing_year INT) RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name text := 'documents_' || filing_year;
+    lower_bound date := make_date(filing_year, 1, 1);
+    upper_bound date := make_date(filing_year + 1, 1, 1);
+    stored_columns text;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE 'CREATE TABLE ' || quote_ident(partition_name) || ' (LIKE documents INCLUDING DEFAULTS INCLUDING GENERATED)';
+    EXECUTE 'ALTER TABLE ' || quote_ident(partition_name) || ' ADD PRIMARY KEY (document_id)';
+    -- Generated columns cannot be written; they are recomputed on insert.
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO stored_columns
+    FROM pg_attribute
+    WHERE attrelid = 'documents'::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = '';
+    EXECUTE 'WITH moved AS (DELETE FROM documents_default WHERE filing_date >= $1 AND filing_date < $2 '
+        || 'RETURNING ' || stored_columns || ') '
+        || 'INSERT INTO ' || quote_ident(partition_name) || ' (' || stored_columns || ') SELECT * FROM moved'
+    USING lower_bound, upper_bound;
+    -- The moved rows were not deleted; drop the tombstones their move wrote.
+    EXECUTE 'DELETE FROM change_tombstones WHERE change_xid = pg_current_xact_id() AND table_name = ''documents'''
+        || ' AND pk IN (SELECT document_id FROM ' || quote_ident(partition_name) || ')';
+    -- The moved rows bypassed the triggers; reserve their ids again.
+    EXECUTE 'INSERT INTO document_ids (document_id) SELECT document_id FROM ' || quote_ident(partition_name);
+    EXECUTE 'ALTER TABLE documents ATTACH PARTITION ' || quote_ident(partition_name)
+        || ' FOR VALUES FROM (' || quote_literal(lower_bound) || ') TO (' || quote_literal(upper_bound) || ')';
+    RETURN true;
+END;
+$$;
+
+SELECT create_document_partition(filing_year)
+FROM generate_series(extract(year FROM current_date)::int, extract(year FROM current_date)::int + 2) AS filing_year;
+
+-- Identifier lookup keys (kept in sync with sql/migrations/0008_identifier_keys.sql)
+CREATE OR REPLACE FUNCTION normalize_docket_number(value TEXT) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    tokens text[];
+    joined text;
+    federal text[];
+BEGIN
+    -- Letter and digit runs, lower-cased, numbers without leading zeros.
+    tokens := ARRAY(
+        SELECT regexp_replace(m.token[1], '^0+(?=[0-9])', '')
+        FROM regexp_matches(lower(value), '[a-z]+|[0-9]+', 'g') WITH ORDINALITY AS m(token, n)
+        ORDER BY m.n
+    );
+    -- Labels: "Case No.", "Civ. No.", "Docket #", "MDL No."
+    tokens := array_remove(array_remove(array_remove(tokens, 'no'), 'nos'), 'number');
+    WHILE cardinality(tokens) > 1
+        AND tokens[1] IN ('case', 'docket', 'dkt', 'civ', 'civil', 'action', 'index', 'cause', 'ucn')
+    LOOP
+        tokens := tokens[2:];
+    END LOOP;
+    joined := array_to_string(tokens, '-');
+    IF joined = '' THEN
+        RETURN NULL;
+    END IF;
+    -- Federal: [office:]yy-type-number[-judge...], e.g. 1:23-cv-00456-ABC, 23 CV 456, 3:2023cv03440.
+    federal := regexp_match(joined,
+        '^(?:[0-9]-)?(?:(?:19|20)([0-9]{2})|([0-9]{2}))-(cv|cr|mc|md|mj|bk|ap|po|sw|gj|dp|vv)-([0-9]+)(?:-[a-z]+)*$');
+    IF federal IS NOT NULL THEN
+        RETURN COALESCE(federal[1], federal[2]) || '-' || federal[3] || '-' || federal[4];
+    END IF;
+    RETURN joined;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION normalize_citation(value TEXT) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    parts text[];
+    reporter text;
+BEGIN
+    -- The first "volume reporter page" citation: 123 F.4th 45, 484 F. Supp. 3d 561, 2023 WL 5333236.
+    -- Reporter words start with a letter (F., Supp., N.W.2d) or are a series (2d, 3d, 4th).
+    parts := regexp_match(regexp_replace(value, '[][(),;]', ' ', 'g'),
+        '(?:^|\s)([0-9]+)\s+([A-Za-z][A-Za-z.'']*(?:[0-9]+(?:d|th|st|nd|rd))?\.?'
+        '(?:\s*(?:[A-Za-z][A-Za-z.'']*|[0-9]+(?:d|th|st|nd|rd))(?:[0-9]+(?:d|th|st|nd|rd))?\.?)*)'
+        '\s*([0-9]+)(?![A-Za-z0-9])');
+    IF parts IS NULL THEN
+        RETURN NULL;
+    END IF;
+    reporter := regexp_replace(lower(parts[2]), '[^a-z0-9]', '', 'g');
+    IF reporter = 'fappx' THEN
+        reporter := 'fedappx';
+    END IF;
+    RETURN ltrim(parts[1], '0') || ' ' || reporter || ' ' || ltrim(parts[3], '0');
+END;
+$$;
+
+ALTER TABLE dockets ADD COLUMN docket_number_key TEXT
+    GENERATED ALWAYS AS (normalize_docket_number(docket_number)) STORED;
+CREATE INDEX ix_dockets_docket_number_key ON dockets (docket_number_key);
+
+ALTER TABLE documents ADD COLUMN citation_key TEXT
+    GENERATED ALWAYS AS (normalize_citation(citation)) STORED;
+CREATE INDEX ix_documents_citation_key ON documents (citation_key);
+
+DROP TRIGGER IF EXISTS stamp_change ON dockets;
+CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON dockets
+    FOR EACH ROW EXECUTE FUNCTION stamp_change('docket_number_key');
+DROP TRIGGER IF EXISTS stamp_change ON documents;
+CREATE TRIGGER stamp_change BEFORE INSERT OR UPDATE ON documents
+    FOR EACH ROW EXECUTE FUNCTION stamp_change('citation_key');
+
+-- This file already includes every migration in sql/migrations. Record them as
+-- applied so `python -m app.cli migrate` does not replay them: 0001 and 0006
+-- use CREATE INDEX CONCURRENTLY, which fails on the partitioned documents
+-- table. Add a row here with each new migration.
+CREATE TABLE schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO schema_migrations (version, name) VALUES
+    ('0001', 'fk_filter_indexes'),
+    ('0002', 'import_jobs'),
+    ('0003', 'change_notify'),
+    ('0004', 'analytics'),
+    ('0005', 'change_feed'),
+    ('0006', 'date_order_indexes'),
+    ('0007', 'partition_documents'),
+    ('0008', 'identifier_keys'),
+    ('0009', 'document_ids');